@@ -0,0 +1,27 @@
+"""
+Column decoding of COMP-3 and binary fields: one to_python call per value
+against decode_many converting the whole column at once.
+"""
+from decimal import Decimal
+
+from common import best_of, fields, report
+
+ROWS = 10000
+
+
+def main():
+    packed = fields.PackedDecimalField(length=5, decimals=2)
+    binary = fields.BinaryIntegerField(length=4)
+    packed_values = [packed.to_record(Decimal(i) / 7) for i in range(ROWS)]
+    binary_values = [binary.to_record(i - ROWS // 2) for i in range(ROWS)]
+
+    print("{} values per column".format(ROWS))
+    for name, field, values in (('PackedDecimalField', packed, packed_values),
+                                ('BinaryIntegerField', binary, binary_values)):
+        old = best_of(lambda: [field.to_python(v) for v in values], 5)
+        report("  {} to_python".format(name), old)
+        report("  {} decode_many".format(name), best_of(lambda: field.decode_many(values), 5), old)
+
+
+if __name__ == '__main__':
+    main()
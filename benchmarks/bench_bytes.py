@@ -0,0 +1,40 @@
+"""
+Reading an EBCDIC file: transcoding it to text in a separate pass first,
+against handing the bytes to a Record class with ``encoding = 'cp037'``.
+"""
+import io
+
+from common import best_of, fields, fixedwidth, report
+
+ROWS = 2000
+
+
+def main():
+    # Only string fields, so the cost of decoding isn't hidden behind dates
+    attrs = dict(('field_{}'.format(i), fields.StringField(length=10)) for i in range(20))
+    cls = type(str('Ebcdic20'), (fixedwidth.Record,), dict(attrs, encoding='cp037'))
+    record = cls(**dict((name, 'VALUE') for name in attrs))
+    data = record.to_bytes() * ROWS
+    length = len(cls)
+
+    def transcode_first():
+        text = data.decode('cp037')
+        return [cls.from_record(text[i:i + length]) for i in range(0, len(text), length)]
+
+    def from_bytes():
+        view = memoryview(data)
+        return [cls.from_record(view[i:i + length]) for i in range(0, len(data), length)]
+
+    print("{} rows of {} bytes".format(ROWS, length))
+    old = best_of(transcode_first, 3)
+    report("  decode file + from_record", old)
+    report("  from_record(memoryview)", best_of(from_bytes, 3), old)
+    report("  iter_records(BytesIO)", best_of(lambda: list(cls.iter_records(io.BytesIO(data), newline='')), 3), old)
+
+    old = best_of(lambda: [record.to_record().encode('cp037') for _ in range(ROWS)], 3)
+    report("  to_record().encode", old)
+    report("  to_bytes", best_of(lambda: [record.to_bytes() for _ in range(ROWS)], 3), old)
+
+
+if __name__ == '__main__':
+    main()
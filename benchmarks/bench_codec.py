@@ -0,0 +1,44 @@
+"""
+Compares Record.from_record/to_record against the field-by-field path
+they used before each Record class got a precompiled RecordCodec.
+"""
+from common import best_of, legacy_new, make_wide_record, report, sample_values
+from djcopybook.fixedwidth import get_field_length
+
+
+def legacy_from_record(cls, line):
+    if len(line) != len(cls):
+        raise ValueError("bad length")
+    record = legacy_new(cls)
+    pos = 0
+    for attname, field in cls.base_fields.items():
+        length = get_field_length(field)
+        setattr(record, attname, field.to_python(line[pos:pos + length]))
+        pos += length
+    return record
+
+
+def legacy_to_record(record):
+    return ''.join(record.get_record_value(name) for name in record.fields)
+
+
+def main():
+    for field_count in (10, 50, 200):
+        cls = make_wide_record(field_count)
+        record = cls(**sample_values(cls))
+        line = record.to_record()
+        assert legacy_to_record(record) == line
+        assert legacy_from_record(cls, line).to_record() == line
+
+        print("{} fields, {} chars".format(field_count, len(line)))
+        number = 20000 // field_count
+        old = best_of(lambda: legacy_from_record(cls, line), number)
+        report("  from_record (field by field)", old)
+        report("  from_record (codec)", best_of(lambda: cls.from_record(line), number), old)
+        old = best_of(lambda: legacy_to_record(record), number)
+        report("  to_record (field by field)", old)
+        report("  to_record (codec)", best_of(record.to_record, number), old)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""
+Pivoting a batch of records into columns: from_record per row then
+reading every attribute, against from_records_columnar with lists and,
+when NumPy is installed, arrays.
+"""
+from common import best_of, make_wide_record, report, sample_values
+
+from djcopybook.fixedwidth import columnar
+
+ROWS = 5000
+
+
+def main():
+    cls = make_wide_record(40)
+    lines = [cls(**sample_values(cls)).to_record()] * ROWS
+    names = list(cls.base_fields)
+
+    def pivot_rows():
+        records = [cls.from_record(line) for line in lines]
+        return dict((name, [getattr(r, name) for r in records]) for name in names)
+
+    print("{} rows of {} fields".format(ROWS, len(names)))
+    old = best_of(pivot_rows, 1)
+    report("  from_record + pivot", old)
+    report("  from_records_columnar", best_of(lambda: cls.from_records_columnar(lines), 1), old)
+    if columnar.numpy is not None:
+        seconds = best_of(lambda: cls.from_records_columnar(lines, numpy=True), 1)
+        report("  from_records_columnar(numpy=True)", seconds, old)
+
+
+if __name__ == '__main__':
+    main()
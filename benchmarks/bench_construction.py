@@ -0,0 +1,34 @@
+"""
+Instance construction cost, compared with deep copying base_fields for
+every new record.
+"""
+from common import best_of, legacy_new, make_wide_record, report, sample_values
+from djcopybook import fixedwidth
+from djcopybook.fixedwidth import fields
+
+
+def make_nested_record(field_count):
+    inner = make_wide_record(field_count)
+    return type(str('Nested'), (fixedwidth.Record,), {
+        'header': fields.StringField(length=10),
+        'fragment': fields.FragmentField(record=inner),
+        'items': fields.ListField(record=inner, length=5),
+    })
+
+
+def main():
+    for name, cls in [('50 fields', make_wide_record(50)), ('200 fields', make_wide_record(200)),
+                      ('fragment + 5 x list of 20', make_nested_record(20))]:
+        values = sample_values(cls) if 'fragment' not in cls.base_fields else {}
+        print(name)
+        number = 200
+        old = best_of(lambda: legacy_new(cls, **values), number)
+        report("  deepcopy(base_fields) per instance", old)
+        report("  shared fields", best_of(lambda: cls(**values), number), old)
+        old = best_of(lambda: legacy_new(cls), number)
+        report("  defaults only, deepcopy", old)
+        report("  defaults only, shared fields", best_of(cls, number), old)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Compares the modules compiled by Cython with their pure Python source:
+single converter calls, then the whole benchmark suite run against a
+copy of the package without the extension modules. Build them first:
+
+    python setup.py build_ext --inplace
+    python benchmarks/bench_converters.py -k wide_200
+
+Arguments are passed on to both suite runs.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from importlib.machinery import SourceFileLoader
+from importlib.util import module_from_spec, spec_from_loader
+
+from common import best_of, report
+
+from djcopybook.fixedwidth import converters, fields
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CALLS = [
+    ('str_padding', (10, 'VALUE')),
+    ('int_padding', (7, 1234)),
+    ('implied_decimal_padding', (9, 1234.25, 2)),
+    ('to_integer', ('0001234',)),
+    ('to_implied_decimal', ('000123425', 9, 2)),
+    ('to_overpunch_decimal', (u'00012342E', 'E-2')),
+]
+
+
+def load_pure_converters():
+    path = os.path.join(os.path.dirname(fields.__file__), 'converters.py')
+    loader = SourceFileLoader('pure_converters', path)
+    module = module_from_spec(spec_from_loader('pure_converters', loader))
+    loader.exec_module(module)
+    return module
+
+
+def copy_pure_python(directory):
+    """A copy of the repository with its sources but no extension modules."""
+    pure_root = os.path.join(directory, 'pure')
+    shutil.copytree(ROOT, pure_root, ignore=shutil.ignore_patterns('*.so', '*.pyd', 'build', '.git', '.tox'))
+    return pure_root
+
+
+def run_suite(root, args, quiet=False):
+    suite = os.path.join(root, 'benchmarks', 'suite.py')
+    with open(os.devnull, 'w') as devnull:
+        return subprocess.call([sys.executable, suite] + args, stdout=devnull if quiet else None)
+
+
+def compare_suites(args):
+    """
+    Saves the suite's results for the pure Python copy as a baseline and
+    compares the compiled build with it.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        baseline = os.path.join(directory, 'pure.json')
+        run_suite(copy_pure_python(directory), args + ['--save', baseline], quiet=True)
+        return run_suite(ROOT, args + ['--compare', baseline])
+    finally:
+        shutil.rmtree(directory)
+
+
+def main(args):
+    if not converters.COMPILED:
+        print("The modules aren't compiled; run python setup.py build_ext --inplace first.")
+        return 1
+    pure = load_pure_converters()
+
+    print("single calls")
+    for name, call_args in CALLS:
+        old = best_of(lambda: getattr(pure, name)(*call_args), 20000)
+        report("  {} pure".format(name), old)
+        report("  {} compiled".format(name), best_of(lambda: getattr(converters, name)(*call_args), 20000), old)
+
+    print("suite, compiled vs pure Python")
+    return compare_suites(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,46 @@
+"""
+Compares parsing a copybook with loading its cached layout, the way a
+worker process starting up would.
+"""
+import shutil
+import tempfile
+
+from common import best_of, report
+
+from djcopybook.fixedwidth import copybook
+
+PICTURES = ['PIC X(10)', 'PIC 9(7)', 'PIC S9(7)V99 COMP-3', 'PIC S9(5)V99', 'PIC S9(4) COMP']
+
+
+def make_copybook(groups=20, items=10):
+    lines = ['       01  WIDE-RECORD.']
+    for group in range(groups):
+        lines.append('           05  GROUP-{}{}.'.format(group, ' OCCURS 3 TIMES' if group % 5 == 0 else ''))
+        for item in range(items):
+            lines.append('               10  ITEM-{}-{}  {}.'.format(group, item, PICTURES[item % len(PICTURES)]))
+    return '\n'.join(lines)
+
+
+def main():
+    source = make_copybook()
+    cache_dir = tempfile.mkdtemp()
+    try:
+        copybook.get_layout(source, cache_dir)
+
+        def from_cache():
+            copybook._layouts.clear()
+            return copybook.get_layout(source, cache_dir)
+
+        print("copybook of {} lines".format(len(source.splitlines())))
+        old = best_of(lambda: copybook.parse_copybook(source), 20)
+        report("  parse_copybook", old)
+        report("  get_layout, JSON cache", best_of(from_cache, 20), old)
+        report("  get_layout, parsed already", best_of(lambda: copybook.get_layout(source, cache_dir), 20), old)
+        layout = copybook.get_layout(source)
+        report("  build_records", best_of(lambda: copybook.build_records(layout), 20))
+    finally:
+        shutil.rmtree(cache_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,27 @@
+"""
+DateField.to_python on fixed format dates: strptime, as every value used
+to be parsed, against the slicing parser with and without the cache.
+"""
+import datetime
+
+from common import best_of, fields, report
+
+ROWS = 10000
+
+
+def main():
+    start = datetime.date(2016, 1, 1)
+    for date_format in ("%Y-%m-%d", "%Y%m%d", "%m%d%Y", "%m/%d/%Y"):
+        values = [(start + datetime.timedelta(days=i % 365)).strftime(date_format) for i in range(ROWS)]
+        field = fields.DateField(length=len(values[0]), format=date_format)
+        cached = fields.DateField(length=len(values[0]), format=date_format, cache_size=1024)
+
+        print("{} values as {}".format(ROWS, date_format))
+        old = best_of(lambda: [datetime.datetime.strptime(v, date_format).date() for v in values], 3)
+        report("  strptime", old)
+        report("  to_python", best_of(lambda: [field.to_python(v) for v in values], 3), old)
+        report("  to_python, cache_size=1024", best_of(lambda: [cached.to_python(v) for v in values], 3), old)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Encoding and decoding implied decimals: the old float formatting and
+"{}.{}" parsing against the Decimal scaling in fields.py, with a count of
+how many 18 digit amounts each one gets wrong.
+"""
+import random
+from decimal import Decimal
+
+from common import best_of, fields, report
+
+ROWS = 10000
+
+
+def legacy_padding(length, val, decimals=2):
+    padded = '{0:0>{fill}.{precision}f}'.format(float(val), fill=length + 1, precision=decimals)
+    return padded.replace(".", "")
+
+
+def legacy_to_python(val, length, decimals=2):
+    if val is None or fields.is_blank_string(val):
+        return None
+    elif not isinstance(val, str):
+        return Decimal(str(val))
+    return Decimal("{}.{}".format(val[:length - decimals], val[-decimals:]))
+
+
+def main():
+    rand = random.Random(0)
+    amounts = [Decimal(rand.randint(0, 10 ** 18 - 1)).scaleb(-2) for _ in range(ROWS)]
+    field = fields.ImpliedDecimalField(length=18, decimals=2)
+    records = [field.to_record(amount) for amount in amounts]
+
+    print("{} amounts of 18 digits".format(ROWS))
+    wrong = sum(legacy_to_python(legacy_padding(18, a), 18) != a for a in amounts)
+    print("  float formatting gets {} wrong, Decimal scaling {}".format(
+        wrong, sum(field.to_python(field.to_record(a)) != a for a in amounts)))
+
+    old = best_of(lambda: [legacy_padding(18, a) for a in amounts], 3)
+    report("  float padding", old)
+    report("  implied_decimal_padding", best_of(lambda: [field.to_record(a) for a in amounts], 3), old)
+
+    floats = [float(a) for a in amounts[:1000]] * 10
+    old = best_of(lambda: [legacy_padding(18, f) for f in floats], 3)
+    report("  float padding of floats", old)
+    report("  implied_decimal_padding of floats", best_of(lambda: [field.to_record(f) for f in floats], 3), old)
+
+    old = best_of(lambda: [legacy_to_python(r, 18) for r in records], 3)
+    report("  '{}.{}' decode", old)
+    report("  ImpliedDecimalField.to_python", best_of(lambda: [field.to_python(r) for r in records], 3), old)
+
+
+if __name__ == '__main__':
+    main()
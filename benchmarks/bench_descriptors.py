@@ -0,0 +1,47 @@
+"""
+getattr/setattr throughput on a 100 field record, compared with building
+each field's storage key on every access.
+"""
+from common import best_of, make_wide_record, report
+
+
+def legacy_get(record, fields):
+    for f in fields:
+        try:
+            getattr(record, "{attname}_{creation_counter}".format(**f.__dict__))
+        except AttributeError:
+            f.get_default()
+
+
+def legacy_set(record, fields):
+    for f in fields:
+        setattr(record, "{attname}_{creation_counter}".format(**f.__dict__), f.to_python(None))
+
+
+def get_all(record, names):
+    for name in names:
+        getattr(record, name)
+
+
+def set_all(record, names):
+    for name in names:
+        setattr(record, name, None)
+
+
+def main():
+    cls = make_wide_record(100)
+    record = cls()
+    fields = list(cls.base_fields.values())
+    names = list(cls.base_fields)
+
+    print("100 fields, per pass over every field")
+    old = best_of(lambda: legacy_get(record, fields), 2000)
+    report("  getattr, key formatted per access", old)
+    report("  getattr, cached storage key", best_of(lambda: get_all(record, names), 2000), old)
+    old = best_of(lambda: legacy_set(record, fields), 2000)
+    report("  setattr, key formatted per access", old)
+    report("  setattr, cached storage key", best_of(lambda: set_all(record, names), 2000), old)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Parsing a mixed header/detail/trailer file by trying each Record class in
+turn, compared with RecordDispatcher's type code lookup.
+"""
+import io
+
+from common import best_of, report
+from djcopybook import fixedwidth
+from djcopybook.fixedwidth import fields
+from djcopybook.fixedwidth.dispatch import RecordDispatcher
+
+ROWS = 5000
+
+
+class Header(fixedwidth.Record):
+    record_type = fields.StringField(length=2, default='HD')
+    batch = fields.IntegerField(length=18)
+
+
+class Detail(fixedwidth.Record):
+    record_type = fields.StringField(length=2, default='DT')
+    name = fields.StringField(length=10)
+    amount = fields.IntegerField(length=8)
+
+
+class Trailer(fixedwidth.Record):
+    record_type = fields.StringField(length=2, default='TR')
+    count = fields.IntegerField(length=18)
+
+
+def try_each_class(data):
+    records = []
+    for line in io.StringIO(data):
+        line = line.rstrip('\n')
+        records.append(sniff(line))
+    return records
+
+
+def sniff(line):
+    for cls in (Header, Detail, Trailer):
+        try:
+            record = cls.from_record(line)
+        except ValueError:
+            continue
+        if record.record_type == cls.base_fields['record_type'].default:
+            return record
+
+
+def main():
+    lines = [Header(batch=1).to_record()] + [Detail(name='x', amount=i).to_record() for i in range(ROWS)]
+    data = '\n'.join(lines + [Trailer(count=ROWS).to_record()]) + '\n'
+    dispatcher = RecordDispatcher(0, 2, {'HD': Header, 'DT': Detail, 'TR': Trailer})
+    assert len(list(dispatcher.iter_records(io.StringIO(data)))) == ROWS + 2
+
+    print("{} mixed rows".format(ROWS + 2))
+    old = best_of(lambda: try_each_class(data), 3)
+    report("  try each class", old)
+    report("  RecordDispatcher", best_of(lambda: list(dispatcher.iter_records(io.StringIO(data))), 3), old)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Exporting columns to fixed width: a Record built from every row and
+to_record, against Record.encode_columns formatting a column at a time.
+"""
+import datetime
+from decimal import Decimal
+
+from common import best_of, fields, make_wide_record, report
+
+ROWS = 5000
+
+
+def make_column(field, rows):
+    if isinstance(field, fields.DateField):
+        start = datetime.date(2016, 1, 1)
+        return [start + datetime.timedelta(days=i % 365) for i in range(rows)]
+    if isinstance(field, fields.ImpliedDecimalField):
+        return [Decimal(i) / 100 for i in range(rows)]
+    if isinstance(field, fields.IntegerField):
+        return list(range(rows))
+    return ['NAME{}'.format(i % 100) for i in range(rows)]
+
+
+def main():
+    cls = make_wide_record(40)
+    columns = dict((name, make_column(field, ROWS)) for name, field in cls.base_fields.items())
+    names = list(columns)
+
+    def per_row():
+        return [cls(**dict(zip(names, row))).to_record() for row in zip(*columns.values())]
+
+    assert per_row() == cls.encode_columns(columns)
+    length = len(cls)
+    print("{} rows of {} fields".format(ROWS, len(names)))
+    old = best_of(per_row, 1)
+    report("  Record(**row).to_record()", old)
+    seconds = best_of(lambda: cls.encode_columns(columns), 1)
+    report("  encode_columns", seconds, old)
+    print("  {:.0f} rows/sec, {:.1f} MB/sec".format(ROWS / seconds, ROWS * length / seconds / 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,32 @@
+"""
+Filter-and-route style jobs that read 3 of 120 fields and write the line
+back out, with eager and lazy records.
+"""
+from common import best_of, make_wide_record, report, sample_values
+
+ROWS = 500
+
+
+def route(cls, lines):
+    out = []
+    for line in lines:
+        record = cls.from_record(line)
+        if record.field_1 is not None and record.field_3 and record.field_4:
+            out.append(record.to_record())
+    return out
+
+
+def main():
+    eager = make_wide_record(120)
+    lazy = make_wide_record(120, lazy=True)
+    lines = [eager(**sample_values(eager)).to_record()] * ROWS
+    assert route(eager, lines) == route(lazy, lines)
+
+    print("{} rows, 120 fields, 3 read".format(ROWS))
+    old = best_of(lambda: route(eager, lines), 3)
+    report("  eager records", old)
+    report("  lazy records", best_of(lambda: route(lazy, lines), 3), old)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Decoding a large OCCURS table: slicing off the remaining tail for every
+occurrence, offset based slicing, and lazy decoding of only the first few.
+"""
+from common import best_of, report
+from djcopybook import fixedwidth
+from djcopybook.fixedwidth import fields
+
+
+class Claim(fixedwidth.Record):
+    code = fields.StringField(length=5)
+    amount = fields.IntegerField(length=9)
+    status = fields.StringField(length=2)
+
+
+def legacy_records_from_string(field, val):
+    records = []
+    for _ in range(field.length):
+        records.append(field.record_class.from_record(val[:field.record_length]))
+        val = val[field.record_length:]
+    return records
+
+
+def main():
+    for occurs in (50, 500, 2000):
+        eager = fields.ListField(Claim, length=occurs)
+        lazy = fields.ListField(Claim, length=occurs, lazy=True)
+        raw = Claim(code='A1', amount=100, status='OK').to_record() * occurs
+
+        print("OCCURS {}".format(occurs))
+        old = best_of(lambda: legacy_records_from_string(eager, raw), 20)
+        report("  tail slicing", old)
+        report("  offset slicing", best_of(lambda: eager.to_python(raw), 20), old)
+        report("  lazy, first 3 read", best_of(lambda: lazy.to_python(raw)[:3], 20), old)
+
+
+if __name__ == '__main__':
+    main()
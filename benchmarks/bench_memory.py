@@ -0,0 +1,48 @@
+"""
+Memory held by parsed records, with and without ``compact = True``.
+"""
+import sys
+import tracemalloc
+
+from common import make_wide_record, sample_values
+
+ROWS = 20000
+
+
+def measure(cls, line):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = [cls.from_record(line) for _ in range(ROWS)]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del records
+    return used / float(ROWS)
+
+
+def instance_overhead(cls, line):
+    """Size of the record object itself, leaving out the values it holds."""
+    record = cls.from_record(line)
+    size = sys.getsizeof(record)
+    if hasattr(record, '__dict__'):
+        size += sys.getsizeof(record.__dict__)
+    return size
+
+
+def main():
+    for field_count in (10, 50):
+        regular = make_wide_record(field_count)
+        compact = make_wide_record(field_count, compact=True)
+        line = regular(**sample_values(regular)).to_record()
+
+        print("{} fields, {} chars".format(field_count, len(line)))
+        old = measure(regular, line)
+        new = measure(compact, line)
+        print("  regular  {:>8.0f} bytes/record".format(old))
+        print("  compact  {:>8.0f} bytes/record  ({:.1f}x smaller)".format(new, old / new))
+        old = instance_overhead(regular, line)
+        new = instance_overhead(compact, line)
+        print("  per-instance overhead: regular {} bytes, compact {} bytes".format(old, new))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Compares a file whose OCCURS is padded to its maximum with the same rows
+written with OCCURS DEPENDING ON, where each row is only as long as its
+list: file size, writing it and reading it back.
+"""
+import io
+
+from common import best_of, fixedwidth, make_wide_record, report
+
+from djcopybook.fixedwidth import fields
+
+ROWS = 2000
+MAX_OCCURS = 30
+
+
+def make_records(item_class):
+    class Padded(fixedwidth.Record):
+        policy = fields.StringField(length=10)
+        count = fields.IntegerField(length=2)
+        items = fields.ListField(record=item_class, length=MAX_OCCURS)
+
+    class Depending(fixedwidth.Record):
+        policy = fields.StringField(length=10)
+        count = fields.IntegerField(length=2)
+        items = fields.ListField(record=item_class, length=MAX_OCCURS, depending_on='count')
+
+    return Padded, Depending
+
+
+def write(record_class, rows):
+    f = io.StringIO()
+    record_class.write_many(rows, f)
+    return f.getvalue()
+
+
+def read(record_class, data):
+    for record in record_class.iter_records(io.StringIO(data)):
+        record.items
+
+
+def main():
+    item_class = make_wide_record(4)
+    Padded, Depending = make_records(item_class)
+    # mostly a handful of occurrences, now and then a lot of them
+    counts = [MAX_OCCURS if i % 50 == 0 else i % 5 for i in range(ROWS)]
+    item = item_class(field_0='X', field_1=1)
+    rows = [{'policy': 'P{}'.format(i), 'count': count, 'items': [item] * count} for i, count in enumerate(counts)]
+    padded, depending = write(Padded, rows), write(Depending, rows)
+
+    print("{} rows, up to {} occurrences of {} chars".format(ROWS, MAX_OCCURS, len(item_class)))
+    print("  padded file {} chars, depending file {} chars ({:.1f}x smaller)".format(
+        len(padded), len(depending), len(padded) / float(len(depending))))
+    old = best_of(lambda: write(Padded, rows), 3)
+    report("  write padded", old)
+    report("  write depending", best_of(lambda: write(Depending, rows), 3), old)
+    old = best_of(lambda: read(Padded, padded), 3)
+    report("  read padded", old)
+    report("  read depending", best_of(lambda: read(Depending, depending), 3), old)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""
+Decoding overpunch amounts with OverpunchDecimalField's lookup tables,
+one value at a time and a column at a time, against checking the last
+character with Python branches.
+"""
+from decimal import Decimal
+
+from common import best_of, fields, report
+
+ROWS = 10000
+POSITIVE = '{ABCDEFGHI'
+NEGATIVE = '}JKLMNOPQR'
+
+
+def branching_decode(val, decimals=2):
+    last = val[-1]
+    if last in POSITIVE:
+        sign, digit = '', POSITIVE.index(last)
+    elif last in NEGATIVE:
+        sign, digit = '-', NEGATIVE.index(last)
+    else:
+        sign, digit = '', int(last)
+    digits = val[:-1] + str(digit)
+    return Decimal("{}{}.{}".format(sign, digits[:-decimals], digits[-decimals:]))
+
+
+def main():
+    field = fields.OverpunchDecimalField(length=9, decimals=2)
+    values = [field.to_record(Decimal(i - ROWS // 2) / 3) for i in range(ROWS)]
+    assert [branching_decode(v) for v in values] == [field.to_python(v) for v in values]
+
+    print("{} values".format(ROWS))
+    old = best_of(lambda: [branching_decode(v) for v in values], 5)
+    report("  branching decode", old)
+    report("  OverpunchDecimalField.to_python", best_of(lambda: [field.to_python(v) for v in values], 5), old)
+    report("  OverpunchDecimalField.decode_many", best_of(lambda: field.decode_many(values), 5), old)
+
+
+if __name__ == '__main__':
+    main()
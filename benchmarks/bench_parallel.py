@@ -0,0 +1,49 @@
+"""
+Single process iter_records compared with parse_file_parallel, reducing
+each record to one value inside the workers.
+"""
+import multiprocessing
+import os
+import tempfile
+import time
+
+from common import make_wide_record, sample_values
+
+ROWS = 40000
+Wide40 = make_wide_record(40)
+
+
+def amount(record):
+    return record.field_2
+
+
+def timed(func):
+    start = time.time()
+    result = func()
+    return time.time() - start, result
+
+
+def main():
+    line = Wide40(**sample_values(Wide40)).to_record() + '\n'
+    fd, path = tempfile.mkstemp()
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(line * ROWS)
+
+        def serial():
+            with open(path, 'rb') as f:
+                return [amount(r) for r in Wide40.iter_records(f)]
+
+        print("{} rows of {} bytes".format(ROWS, len(line)))
+        old, expected = timed(serial)
+        print("  iter_records, 1 process          {:>8.2f} s".format(old))
+        for workers in sorted(set([2, multiprocessing.cpu_count()])):
+            new, result = timed(lambda: list(Wide40.parse_file_parallel(path, workers=workers, func=amount)))
+            assert result == expected
+            print("  parse_file_parallel, {:>2} workers  {:>8.2f} s  ({:.1f}x)".format(workers, new, old / new))
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
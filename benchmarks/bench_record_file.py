@@ -0,0 +1,39 @@
+"""
+Looking up one record near the end of a file: a linear parse with
+iter_records compared with RecordFile's computed offset.
+"""
+import itertools
+import os
+import tempfile
+
+from common import best_of, make_wide_record, report, sample_values
+from djcopybook.fixedwidth.streams import RecordFile
+
+ROWS = 20000
+
+
+def main():
+    cls = make_wide_record(20)
+    fd, path = tempfile.mkstemp()
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write((cls(**sample_values(cls)).to_record() + '\n') * ROWS)
+
+        def linear():
+            with open(path, 'rb') as f:
+                return next(itertools.islice(cls.iter_records(f), ROWS - 10, None))
+
+        def mapped():
+            with RecordFile(cls, path) as records:
+                return records[ROWS - 10]
+
+        print("record {} of {}".format(ROWS - 10, ROWS))
+        old = best_of(linear, 1, repeat=3)
+        report("  linear parse", old)
+        report("  RecordFile", best_of(mapped, 100), old)
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
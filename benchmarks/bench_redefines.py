@@ -0,0 +1,57 @@
+"""
+Compares a RedefinesField with decoding the span as a StringField and
+parsing the right variant from it by hand.
+"""
+from common import best_of, fixedwidth, make_wide_record, report
+
+from djcopybook.fixedwidth import fields
+
+ROWS = 2000
+
+
+def make_records(variants):
+    class ByHand(fixedwidth.Record):
+        record_type = fields.StringField(length=1)
+        detail = fields.StringField(length=max(len(v) for v in variants.values()))
+        premium = fields.IntegerField(length=7)
+
+    class Redefined(fixedwidth.Record):
+        record_type = fields.StringField(length=1)
+        detail = fields.RedefinesField(variants, discriminator='record_type')
+        premium = fields.IntegerField(length=7)
+
+    return ByHand, Redefined
+
+
+def by_hand(record_class, variants, lines, read):
+    for line in lines:
+        record = record_class.from_record(line)
+        if read:
+            variant = variants[record.record_type]
+            variant.from_record(line[1:1 + len(variant)])
+
+
+def redefined(record_class, lines, read):
+    for line in lines:
+        record = record_class.from_record(line)
+        if read:
+            record.detail
+
+
+def main():
+    auto = make_wide_record(20)
+    variants = {'A': auto, 'H': make_wide_record(12)}
+    ByHand, Redefined = make_records(variants)
+    lines = [Redefined(record_type='A', detail=auto(), premium=i).to_record() for i in range(ROWS)]
+
+    print("{} rows of {} chars".format(ROWS, len(Redefined)))
+    old = best_of(lambda: by_hand(ByHand, variants, lines, False), 3)
+    report("  StringField, span not read", old)
+    report("  RedefinesField, span not read", best_of(lambda: redefined(Redefined, lines, False), 3), old)
+    old = best_of(lambda: by_hand(ByHand, variants, lines, True), 3)
+    report("  StringField + from_record", old)
+    report("  RedefinesField, variant read", best_of(lambda: redefined(Redefined, lines, True), 3), old)
+
+
+if __name__ == '__main__':
+    main()
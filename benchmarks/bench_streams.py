@@ -0,0 +1,36 @@
+"""
+Compares Record.iter_records/write_many with the line-at-a-time loops
+callers used to write by hand.
+"""
+import io
+
+from common import best_of, make_wide_record, report, sample_values
+
+ROWS = 2000
+
+
+def main():
+    cls = make_wide_record(20)
+    records = [cls(**sample_values(cls))] * ROWS
+    data = ''.join(r.to_record() + '\n' for r in records)
+
+    def write_each():
+        f = io.StringIO()
+        for r in records:
+            f.write(r.to_record())
+            f.write('\n')
+
+    def read_lines():
+        return [cls.from_record(line.rstrip('\n')) for line in io.StringIO(data).readlines()]
+
+    print("{} rows of {} chars".format(ROWS, len(cls)))
+    old = best_of(write_each, 3)
+    report("  write() per record", old)
+    report("  write_many", best_of(lambda: cls.write_many(iter(records), io.StringIO()), 3), old)
+    old = best_of(read_lines, 3)
+    report("  readlines + from_record", old)
+    report("  iter_records", best_of(lambda: list(cls.iter_records(io.StringIO(data))), 3), old)
+
+
+if __name__ == '__main__':
+    main()
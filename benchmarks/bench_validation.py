@@ -0,0 +1,41 @@
+"""
+Compares iter_records and write_many with and without a ValidationReport,
+on clean data and on data with a few bad rows.
+"""
+import io
+
+from common import best_of, make_wide_record, report, sample_values
+
+from djcopybook.fixedwidth.validation import ValidationReport
+
+ROWS = 5000
+BAD_ROWS = 3
+
+
+def main():
+    cls = make_wide_record(20)
+    records = [cls(**sample_values(cls))] * ROWS
+    lines = [r.to_record() for r in records]
+    clean = ''.join(line + '\n' for line in lines)
+    for i in range(BAD_ROWS):
+        row = (i + 1) * ROWS // (BAD_ROWS + 1)
+        lines[row] = lines[row][:15] + 'x' + lines[row][16:] if i % 2 else lines[row][:-4]
+    dirty = ''.join(line + '\n' for line in lines)
+
+    def validated(data):
+        errors = ValidationReport()
+        return list(cls.iter_records(io.StringIO(data), errors=errors)), errors
+
+    print("{} rows of {} chars, {} bad".format(ROWS, len(cls), len(validated(dirty)[1])))
+    old = best_of(lambda: list(cls.iter_records(io.StringIO(clean))), 3)
+    report("  iter_records", old)
+    report("  iter_records, errors, clean", best_of(lambda: validated(clean), 3), old)
+    report("  iter_records, errors, bad rows", best_of(lambda: validated(dirty), 3), old)
+    old = best_of(lambda: cls.write_many(records, io.StringIO()), 3)
+    report("  write_many", old)
+    checked = best_of(lambda: cls.write_many(records, io.StringIO(), errors=ValidationReport()), 3)
+    report("  write_many, errors", checked, old)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+Shared helpers for the benchmark scripts in this directory.
+
+Run any script from the repository root, e.g.::
+
+    python benchmarks/bench_codec.py
+
+The bench_* scripts each compare one change with what it replaced;
+suite.py times the whole library and keeps baselines to compare with.
+"""
+import datetime
+import os
+import string
+import sys
+import timeit
+from copy import deepcopy
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from djcopybook import fixedwidth  # noqa E402
+from djcopybook.fixedwidth import fields  # noqa E402
+
+
+def make_wide_record(field_count=50, **options):
+    """
+    Builds a Record class with a mix of string, integer, decimal and date
+    fields, roughly shaped like a policy detail line.
+    """
+    attrs = dict(options)
+    for i in range(field_count):
+        kind = i % 4
+        if kind == 0:
+            attrs['field_{}'.format(i)] = fields.StringField(length=10)
+        elif kind == 1:
+            attrs['field_{}'.format(i)] = fields.IntegerField(length=7)
+        elif kind == 2:
+            attrs['field_{}'.format(i)] = fields.ImpliedDecimalField(length=9, decimals=2)
+        else:
+            attrs['field_{}'.format(i)] = fields.DateField(length=10, format="%Y-%m-%d")
+    return type(str('Wide{}'.format(field_count)), (fixedwidth.Record,), attrs)
+
+
+def make_deep_record(depth=6, field_count=8):
+    """
+    Builds a Record class nesting ``depth`` levels of FragmentFields, each
+    level with its own ``field_count`` fields, like groups inside groups.
+    """
+    record_class = make_wide_record(field_count)
+    for level in range(depth):
+        attrs = dict((name, deepcopy(field)) for name, field in make_wide_record(field_count).base_fields.items())
+        attrs['child'] = fields.FragmentField(record=record_class)
+        record_class = type(str('Level{}'.format(level)), (fixedwidth.Record,), attrs)
+    return record_class
+
+
+def make_occurs_record(occurs=200, field_count=5, depending=False):
+    """
+    Builds a Record class with a header and a ListField of ``occurs``
+    wide records, whose count is held by a field when ``depending``.
+    """
+    return type(str('Occurs{}'.format(occurs)), (fixedwidth.Record,), {
+        'policy': fields.StringField(length=10),
+        'count': fields.IntegerField(length=len(str(occurs))),
+        'items': fields.ListField(record=make_wide_record(field_count), length=occurs,
+                                  depending_on='count' if depending else None),
+    })
+
+
+def random_values(record_class, rand):
+    """
+    Field values for ``record_class`` drawn from ``rand``, a seeded
+    random.Random, so the same seed always gives the same records.
+    Nested records are built too, and lists with a count field get a
+    random number of occurrences.
+    """
+    return dict((name, _random_value(field, rand)) for name, field in record_class.base_fields.items())
+
+
+def _random_value(field, rand):
+    for field_type, make_value in RANDOM_VALUES:
+        if isinstance(field, field_type):
+            return make_value(field, rand)
+    return ''.join(rand.choice(string.ascii_uppercase) for _ in range(rand.randint(0, field.length)))
+
+
+def _random_list(field, rand):
+    count = rand.randint(0, field.length) if field.depending_on else field.length
+    return [field.record_class(**random_values(field.record_class, rand)) for _ in range(count)]
+
+
+RANDOM_VALUES = [
+    (fields.ListField, _random_list),
+    (fields.FragmentField, lambda field, rand: field.record_class(**random_values(field.record_class, rand))),
+    (fields.DateField, lambda field, rand: datetime.date(rand.randint(1990, 2030), rand.randint(1, 12),
+                                                         rand.randint(1, 28))),
+    (fields.DecimalField, lambda field, rand: Decimal(
+        rand.randint(0, 10 ** (field.length - field.decimals - 1) - 1)).scaleb(-field.decimals)),
+    (fields.IntegerField, lambda field, rand: rand.randint(0, 10 ** field.length - 1)),
+]
+
+
+def sample_values(record_class):
+    values = {}
+    for i, name in enumerate(record_class.base_fields):
+        kind = i % 4
+        if kind == 0:
+            values[name] = 'VALUE{}'.format(i)
+        elif kind == 1:
+            values[name] = i * 31
+        elif kind == 2:
+            values[name] = Decimal('{}.25'.format(i))
+        else:
+            values[name] = '2016-03-{:02d}'.format(i % 28 + 1)
+    return values
+
+
+def legacy_new(cls, **kwargs):
+    """
+    Builds a record the way BaseRecord.__init__ used to, deep copying
+    base_fields for every instance.
+    """
+    record = cls.__new__(cls)
+    record.__dict__['_fields'] = deepcopy(cls.base_fields)
+    for field in record.__dict__['_fields'].values():
+        setattr(record, field.attname, kwargs.pop(field.attname, field.get_default()))
+    return record
+
+
+def best_of(func, number, repeat=5):
+    """Best wall clock time, in seconds, for a single call to func."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def report(name, seconds, baseline=None):
+    line = "{:<40} {:>10.2f} us/call".format(name, seconds * 1e6)
+    if baseline:
+        line += "  ({:.1f}x)".format(baseline / seconds)
+    print(line)
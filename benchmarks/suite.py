@@ -0,0 +1,166 @@
+"""
+The benchmark suite: parsing, encoding, constructing and streaming
+records of synthetic layouts shaped like real copybooks, reported as rows
+and bytes per second.
+
+    python benchmarks/suite.py                          # every case
+    python benchmarks/suite.py -k wide                  # cases with 'wide' in their name
+    python benchmarks/suite.py --save baseline.json     # keep the results
+    python benchmarks/suite.py --compare baseline.json  # flag cases that got slower
+
+Rows come from a fixed random seed, so every run times the same data.
+Each case reports its best of ``--repeat`` runs. Comparing exits with
+status 1 when a case is more than ``--tolerance`` slower than the
+baseline, so a baseline saved at a release can be checked against later.
+Baselines only mean something on the machine and Python they were saved
+with, which are stored with them.
+"""
+import argparse
+import datetime
+import io
+import json
+import platform
+import random
+import sys
+import timeit
+
+from common import make_deep_record, make_occurs_record, make_wide_record, random_values
+
+SEED = 0
+FORMAT_VERSION = 1
+
+# name, Record class factory, rows
+LAYOUTS = [
+    ('wide_200', lambda: make_wide_record(200), 1000),
+    ('deep_fragments', lambda: make_deep_record(depth=6, field_count=8), 2000),
+    ('large_occurs', lambda: make_occurs_record(occurs=200), 100),
+    ('occurs_depending', lambda: make_occurs_record(occurs=200, depending=True), 200),
+]
+
+
+class Case(object):
+    """
+    One operation timed over the rows of one layout.
+    """
+
+    def __init__(self, name, func, rows, size):
+        self.name = name
+        self.func = func
+        self.rows = rows
+        self.size = size
+
+    def run(self, repeat):
+        seconds = min(timeit.repeat(self.func, number=1, repeat=repeat))
+        return {
+            'rows': self.rows,
+            'bytes': self.size,
+            'seconds': seconds,
+            'rows_per_sec': self.rows / seconds,
+            'bytes_per_sec': self.size / seconds,
+        }
+
+
+def get_cases(layout_name, record_class, rows):
+    rand = random.Random(SEED)
+    values = [random_values(record_class, rand) for _ in range(rows)]
+    records = [record_class(**row) for row in values]
+    lines = [record.to_record() for record in records]
+    data = u'\n'.join(lines) + u'\n'
+    size = sum(len(line) for line in lines)
+
+    def stream():
+        for _ in record_class.iter_records(io.StringIO(data)):
+            pass
+
+    return [
+        Case(layout_name + '.parse', lambda: [record_class.from_record(line) for line in lines], rows, size),
+        Case(layout_name + '.encode', lambda: [record.to_record() for record in records], rows, size),
+        Case(layout_name + '.construct', lambda: [record_class(**row) for row in values], rows, size),
+        Case(layout_name + '.stream', stream, rows, len(data)),
+    ]
+
+
+def run_suite(keyword, repeat):
+    for layout_name, make_record, rows in LAYOUTS:
+        for case in get_cases(layout_name, make_record(), rows):
+            if keyword in case.name:
+                yield case.name, case.run(repeat)
+
+
+def get_environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+    }
+
+
+def save_results(path, results):
+    with open(path, 'w') as f:
+        json.dump({
+            'format_version': FORMAT_VERSION,
+            'created': datetime.datetime.now().isoformat(),
+            'environment': get_environment(),
+            'seed': SEED,
+            'results': results,
+        }, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        baseline = json.load(f)
+    if baseline.get('environment') != get_environment():
+        print("Warning: the baseline was saved on {}; timings may not compare.".format(baseline.get('environment')))
+    return baseline['results']
+
+
+def format_result(name, result, baseline):
+    line = "{:<30} {:>12,.0f} {:>10.2f}".format(name, result['rows_per_sec'], result['bytes_per_sec'] / 1e6)
+    if name in baseline:
+        line += "  {:>6.2f}x".format(result['rows_per_sec'] / baseline[name]['rows_per_sec'])
+    return line
+
+
+def find_regressions(results, baseline, tolerance):
+    """
+    The cases that run at less than 1 - ``tolerance`` of their baseline rows/sec.
+    """
+    return sorted(
+        name for name, result in results.items()
+        if name in baseline and result['rows_per_sec'] < baseline[name]['rows_per_sec'] * (1 - tolerance)
+    )
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-k', dest='keyword', default='', help="only run cases with this in their name")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per case, of which the best counts")
+    parser.add_argument('--save', metavar='PATH', help="write the results to this JSON file")
+    parser.add_argument('--compare', metavar='PATH', help="compare with the results saved in this JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="fraction slower than the baseline a case may run before it's a regression")
+    return parser
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    baseline = load_baseline(args.compare) if args.compare else {}
+
+    print("{:<30} {:>12} {:>10}{}".format('case', 'rows/sec', 'MB/sec', '  vs base' if baseline else ''))
+    results = {}
+    for name, result in run_suite(args.keyword, args.repeat):
+        results[name] = result
+        print(format_result(name, result, baseline))
+
+    if args.save:
+        save_results(args.save, results)
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print("Slower than the baseline by more than {:.0%}: {}".format(args.tolerance, ', '.join(regressions)))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,21 @@
+import warnings
 from collections import OrderedDict
-from copy import deepcopy
+from djcopybook.fixedwidth import columnar
 from djcopybook.fixedwidth import fields
+from djcopybook.fixedwidth import parallel
+from djcopybook.fixedwidth import streams
+from djcopybook.fixedwidth import validation
+from djcopybook.fixedwidth.codec import RecordCodec
+from djcopybook.fixedwidth.layout import build_layout, flatten_layout, get_field_length  # noqa F401
 import six
 
+# Class level options, which fields can't be named after.
+RECORD_OPTIONS = ('auto_truncate', 'compact', 'lazy', 'encoding')
+
+# BaseRecord methods the codec's fast paths skip, so classes overriding
+# them take slower paths that still call them.
+RECORD_HOOKS = ('__init__', 'get_default_value', 'get_record_value')
+
 
 def get_declared_fields(bases, attrs):
     """
@@ -21,55 +34,146 @@ def get_declared_fields(bases, attrs):
     return OrderedDict(fw_fields)
 
 
+def get_record_option(name, bases, attrs):
+    """
+    Looks up a class level option like 'compact' before the class exists.
+    """
+    if name in attrs:
+        return attrs[name]
+    return any(getattr(base, name, False) for base in bases)
+
+
+def get_field_slots(bases, attrs):
+    """
+    Slot names for the values of the fields declared directly in 'attrs'.
+    Fields inherited from a compact base already have slots there. Lazy
+    records also need somewhere to keep their raw string.
+    """
+    declared = [obj for obj in attrs.values() if isinstance(obj, fields.FixedWidthField)]
+    slots = tuple(attrs.get('__slots__', ())) + tuple(f.storage_key for f in declared)
+    inherited = set(slot for base in bases for klass in base.__mro__ for slot in getattr(klass, '__slots__', ()))
+    if get_record_option('lazy', bases, attrs) and '_raw' not in inherited:
+        slots += ('_raw',)
+    return slots
+
+
+def check_field_names(name, base_fields):
+    """
+    Raises a ValueError for fields that would hide one of the class's options.
+    """
+    for field_name in base_fields:
+        if field_name in RECORD_OPTIONS:
+            raise ValueError("{} can't have a field named '{}', which is a record option.".format(name, field_name))
+
+
+def get_overridden_hooks(record_class):
+    """
+    The RECORD_HOOKS that record_class, or a base between it and
+    BaseRecord, defines for itself.
+    """
+    mro = record_class.__mro__
+    own = mro[:mro.index(BaseRecord)]
+    return frozenset(name for name in RECORD_HOOKS if any(name in vars(klass) for klass in own))
+
+
 class DeclarativeFieldsMetaclass(type):
     """
     Metaclass that converts Field attributes to a dictionary called
     'base_fields', taking into account parent class 'base_fields' as well.
+
+    Each class also gets a layout table with the offset and length of
+    every field, worked out once here rather than for every row. It's kept
+    as '_layout' so that it can't clash with a field called 'layout'.
+
+    Records with ``compact = True`` get ``__slots__`` for their field values
+    instead of an instance ``__dict__``.
     """
 
     def __new__(cls, name, bases, attrs):
         attrs['base_fields'] = get_declared_fields(bases, attrs)
-        new_class = super(DeclarativeFieldsMetaclass, cls).__new__(cls, name, bases, attrs)
+        check_field_names(name, attrs['base_fields'])
 
         # useful to let each FixedWidthField field know its attribute name
-        for field_name, field in new_class.base_fields.items():
-            setattr(field, 'attname', field_name)
+        for field_name, field in attrs['base_fields'].items():
+            field.set_attname(field_name)
 
+        if get_record_option('compact', bases, attrs):
+            attrs['__slots__'] = get_field_slots(bases, attrs)
+        new_class = super(DeclarativeFieldsMetaclass, cls).__new__(cls, name, bases, attrs)
+
+        new_class._layout = build_layout(new_class.base_fields)
+        new_class._length = sum(entry.length for entry in new_class._layout)
+        new_class._codec = RecordCodec(new_class, new_class._layout)
+        new_class._hooks = get_overridden_hooks(new_class)
+        if 'get_default_value' in new_class._hooks:
+            warnings.warn("{}.get_default_value is deprecated; override __init__ instead.".format(name),
+                          DeprecationWarning, stacklevel=2)
         return new_class
 
     def __len__(cls):
         """
         Total length this record will be in a fixed width format.
         """
-        return sum(get_field_length(f) for f in cls.base_fields.values())
+        return cls._length
 
 
 class BaseRecord(object):
+    __slots__ = ()
     auto_truncate = False
+    compact = False
+    lazy = False
+    encoding = 'latin-1'
 
     def __init__(self, **kwargs):
-        self.fields = deepcopy(self.base_fields)
-        fields_iter = iter(self.fields.values())
-        for field in fields_iter:
-            field.auto_truncate = self.auto_truncate
-            val = self.get_default_value(field, kwargs)
-            setattr(self, field.attname, val)
+        if 'get_default_value' in self._hooks:
+            kwargs = dict((name, self.get_default_value(field, kwargs)) for name, field in self.base_fields.items())
+        self._codec.initialize(self, kwargs)
 
     def get_default_value(self, field, kwargs):
-        if kwargs:
-            try:
-                return kwargs.pop(field.attname)
-            except KeyError:
-                return field.get_default()
-        else:
-            return field.get_default()
+        """
+        Deprecated. The value ``field`` starts with, taken out of the
+        keyword arguments the record was created with. Only called for
+        classes that override it.
+        """
+        if field.attname in kwargs:
+            return kwargs.pop(field.attname)
+        return field.get_default()
+
+    @property
+    def fields(self):
+        """
+        Fields are shared by every instance of the record class. Anything
+        specific to an instance, like auto_truncate, lives on the record.
+        """
+        return self.base_fields
 
     def __len__(self):
         """
-        Total length this record will be in a fixed width format.
+        Total length this record will be in a fixed width format. Records
+        with OCCURS DEPENDING ON lists are only as long as their lists; the
+        length of their class is the longest they can be.
         """
+        if self._codec.variable:
+            return len(self.to_record())
         return len(self.__class__)
 
+    @classmethod
+    def get_layout(cls):
+        """
+        The name, offset, length and field of every field in this record,
+        in order. Fragments and lists are one entry each.
+        """
+        return list(cls._layout)
+
+    @classmethod
+    def flat_layout(cls):
+        """
+        Every value holding field in this record, with absolute offsets,
+        including those inside fragments and each occurrence of a list.
+        Handy for generating column specs for other fixed width readers.
+        """
+        return list(flatten_layout(cls._layout))
+
     def __str__(self):
         return self.to_record()
 
@@ -77,34 +181,124 @@ class BaseRecord(object):
         """
         Allows you to obtain the fixedwidth value for a particular fieldname
         """
-        field_class = self.fields[fieldname]
-        return field_class.get_record_value(getattr(self, fieldname))
+        field_class = self.base_fields[fieldname]
+        return field_class.get_record_value(getattr(self, fieldname), self.auto_truncate)
 
     def to_record(self):
         """
-        Strings together all fields as one combined record value.
+        Strings together all fields as one combined record value. Classes
+        overriding get_record_value have it called for every field.
         """
-        return ''.join(self.get_record_value(fn) for fn in self.fields)
+        if 'get_record_value' in self._hooks:
+            return ''.join(self.get_record_value(fieldname) for fieldname in self.base_fields)
+        return self._codec.encode(self)
+
+    def to_bytes(self):
+        """
+        The combined record value encoded with the record's codepage.
+        """
+        return self.to_record().encode(self.encoding)
 
     @classmethod
     def from_record(cls, record):
         """
         Takes an existing fixed width record and breaks it into it's
-        python Record object.
+        python Record object. On records with ``lazy = True`` fields are
+        only decoded the first time they're read.
+
+        ``record`` may also be bytes, a bytearray or a memoryview, which are
+        decoded with the class's ``encoding`` (latin-1 unless overridden,
+        e.g. ``encoding = 'cp037'`` for EBCDIC files).
+
+        Records are built without calling ``__init__``, unless the class
+        overrides it; then it's called with no arguments before each field
+        is set, as in earlier versions.
         """
-        if len(record) != len(cls):
-            raise ValueError("Fixed width record length is {} but should be {}.".format(len(record), len(cls)))
+        if '__init__' in cls._hooks:
+            return cls._from_record_with_init(record)
+        return cls._codec.decode(record)
 
+    @classmethod
+    def _from_record_with_init(cls, record):
+        decoded = cls._codec.decode(record)
         new_record = cls()
+        for attname in cls.base_fields:
+            setattr(new_record, attname, getattr(decoded, attname))
+        return new_record
 
-        pos = 0
-        for attrname, field_class in cls.base_fields.items():
-            field_length = get_field_length(field_class)
-            field_value = field_class.to_python(record[pos:pos + field_length])
-            setattr(new_record, attrname, field_value)
+    @classmethod
+    def from_records_columnar(cls, lines, numpy=False, newline=None):
+        """
+        Decodes a batch of fixed width records, or one buffer holding them,
+        into an OrderedDict of columns keyed like flat_layout, without
+        building a Record for every row. With ``numpy`` numeric and date
+        columns are NumPy arrays parsed in bulk.
+        """
+        return columnar.decode_columns(cls, lines, numpy, newline)
 
-            pos += field_length
-        return new_record
+    @classmethod
+    def encode_columns(cls, columns):
+        """
+        Builds one fixed width string per row from a mapping of column
+        names to lists, arrays or Series of values, formatting a column at
+        a time instead of building a Record for every row. The output is
+        the same as to_record.
+        """
+        return columnar.encode_columns(cls, columns)
+
+    @classmethod
+    def iter_records(cls, fileobj, newline=None, chunk_size=streams.DEFAULT_CHUNK_SIZE, encoding=None, errors=None):
+        """
+        Lazily reads records from a text or binary file object in chunks,
+        so memory use stays flat no matter how large the file is.
+
+        ``newline`` is the line break written after each record, or '' for
+        records packed back to back. By default it is detected from the
+        data following the first record. Binary files are decoded with the
+        class's ``encoding`` unless another one is given.
+
+        Pass a ValidationReport as ``errors`` to skip bad rows, recording
+        what's wrong with each one, instead of raising on the first.
+        """
+        return streams.iter_records(cls, fileobj, newline, chunk_size, encoding, errors)
+
+    @classmethod
+    def write_many(cls, records, fileobj, newline=None, encoding=None, batch_size=streams.DEFAULT_BATCH_SIZE,
+                   errors=None):
+        """
+        Writes an iterable of records, or dicts of field values, to a text
+        or binary file object in batches. ``records`` can be a generator so
+        large exports never need to be held in memory. Records that can't
+        be encoded are left out and added to ``errors`` when it's given.
+        Records end in a newline unless ``newline`` says otherwise or the
+        layout already ends in a NewLineField.
+        """
+        return streams.write_many(cls, records, fileobj, newline, encoding, batch_size, errors)
+
+    @classmethod
+    def validate(cls, fileobj, newline=None, encoding=None, max_errors=validation.DEFAULT_MAX_ERRORS):
+        """
+        Reads every record in a file object and returns a ValidationReport
+        of the rows that couldn't be decoded, keeping up to ``max_errors``
+        of their errors.
+        """
+        report = validation.ValidationReport(max_errors)
+        for _ in streams.iter_records(cls, fileobj, newline, encoding=encoding, errors=report):
+            pass
+        return report
+
+    @classmethod
+    def parse_file_parallel(cls, path, workers=None, func=None, ordered=True, newline=None, encoding=None):
+        """
+        Parses the file at ``path`` with a pool of ``workers`` processes
+        (one per CPU by default), each reading aligned ranges of records
+        from a memory map of the file.
+
+        ``func`` runs on every record inside the workers so only its results
+        come back; results of None are left out. Yields results in file
+        order, or as they're ready when ``ordered`` is False.
+        """
+        return parallel.parse_file_parallel(cls, path, workers, func, ordered, newline, encoding)
 
 
 class Record(six.with_metaclass(DeclarativeFieldsMetaclass, BaseRecord)):
@@ -114,14 +308,4 @@ class Record(six.with_metaclass(DeclarativeFieldsMetaclass, BaseRecord)):
     # fancy metaclass stuff purely for the semantic sugar -- it allows one
     # to define a fixedwidth using declarative syntax.
     # BaseCopybook itself has no way of designating self.fields.
-
-
-def get_field_length(f):
-    """
-    Normally field length is the length attribute of a FixedWidthField
-    class. However, on ListField classes the length attribute represents
-    how many times the record is repeated, so we need the total.
-    """
-    if isinstance(f, fields.ListField):
-        return f.length * len(f.record_class)
-    return f.length
+    __slots__ = ()
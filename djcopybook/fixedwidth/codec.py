@@ -0,0 +1,398 @@
+import datetime
+from collections import OrderedDict
+from decimal import Decimal
+
+import six
+
+from djcopybook.fixedwidth import fields
+from djcopybook.fixedwidth.layout import flatten_layout
+
+# Converted default values of these types can safely be shared by every
+# instance of a record class.
+IMMUTABLE_TYPES = six.string_types + six.integer_types + (type(None), float, Decimal, datetime.date)
+
+# Raw records in any of these types are decoded with the record's codepage.
+BINARY_TYPES = (six.binary_type, bytearray, memoryview)
+
+
+def _is_unchanged(value, raw, to_python):
+    """
+    Whether value is still what raw decodes to. Mutable values could have
+    been changed in place, so they always count as changed.
+    """
+    if not isinstance(value, IMMUTABLE_TYPES):
+        return False
+    try:
+        return value == to_python(raw)
+    except Exception:
+        return False
+
+
+def decode_bytes(raw, encoding):
+    """
+    Text from bytes, a bytearray or a memoryview. Python 2 can only decode
+    real bytes, so the others are copied to bytes first.
+    """
+    if isinstance(raw, memoryview):
+        raw = raw.tobytes()
+    return bytes(raw).decode(encoding)
+
+
+class RecordCodec(object):
+    """
+    Precomputed decode/encode plan for one Record class.
+
+    DeclarativeFieldsMetaclass builds one of these per class from its
+    layout so that from_record and to_record don't have to work out field
+    offsets, lengths and converters again for every row. It also works
+    out which default values can be set up front for every new instance.
+
+    For records with ``lazy = True`` decoding only keeps the raw string;
+    each field is decoded from it the first time it's read.
+
+    Records with OCCURS DEPENDING ON lists vary in length. Their field
+    offsets are worked out for each row from the count fields instead.
+
+    RedefinesFields are written from the value they store, so a span that
+    was never read is copied back as it was instead of being decoded.
+
+    Bytes are decoded with the record's ``encoding`` once for the whole
+    record, then sliced into fields like any other string. Binary fields
+    get their slice encoded back to bytes, which is exact for single byte
+    codepages, and their bytes are decoded the same way on the way out.
+    """
+
+    def __init__(self, record_class, layout):
+        self.record_class = record_class
+        self.length = sum(entry.length for entry in layout)
+        self.lazy = record_class.lazy
+        self.encoding = record_class.encoding
+        self.offsets = {}
+        self.converters = {}
+        self.decoders = []
+        self.encoders = []
+        self.setters = {}
+        self.static_defaults = {}
+        self.dynamic_defaults = []
+        self.store = _store_in_dict if _uses_instance_dict(record_class) else _store_in_slots
+        self.layout = layout
+        self._checks = None
+        # dicts given to these fields only become a variant when read
+        self.redefines = []
+        # each list whose length depends on another field, and that field
+        self.counts = OrderedDict()
+
+        for attname, offset, length, field in layout:
+            self._add_depending(attname, field)
+            key = field.storage_key
+            to_python, to_record = self._get_converters(field)
+            self.converters[attname] = to_python
+            self.decoders.append((key, offset, offset + length, to_python))
+            encoded_name = self._get_encoded_name(attname, field)
+            self.encoders.append((encoded_name, to_record, length, field._check_record_length))
+            self.setters[attname] = (key, field.to_python)
+            self.offsets[attname] = (offset, offset + length)
+            self._add_default(attname, key, field)
+
+        self.variable = bool(self.counts)
+        self.count_fields = set(self.counts.values())
+        if self.variable and self.lazy:
+            raise ValueError("{} can't be lazy with lists whose length depends on another field.".format(
+                record_class.__name__
+            ))
+
+    def _add_depending(self, attname, field):
+        nested = getattr(field, 'record_class', None)
+        if nested is not None and nested._codec.variable:
+            raise ValueError("'{}' can't hold {}, whose length varies.".format(attname, nested.__name__))
+        depending_on = getattr(field, 'depending_on', None)
+        if depending_on and depending_on not in self.converters:
+            raise ValueError("'{}' depends on '{}', which isn't a field before it.".format(attname, depending_on))
+        if depending_on:
+            self.counts[attname] = depending_on
+
+    def _get_encoded_name(self, attname, field):
+        if not isinstance(field, fields.RedefinesField):
+            return attname
+        self.redefines.append(field)
+        return field.storage_key
+
+    def _get_converters(self, field):
+        if not field.binary:
+            return field.to_python, field.to_record
+        encoding = self.encoding
+
+        def to_python(val):
+            return field.to_python(val.encode(encoding))
+
+        def to_record(val):
+            return field.to_record(val).decode(encoding)
+        return to_python, to_record
+
+    def _add_default(self, attname, key, field):
+        if not (field.has_default() and callable(field.default)):
+            value = field.to_python(field.get_default())
+            if isinstance(value, IMMUTABLE_TYPES):
+                self.static_defaults[key] = value
+                return
+        self.dynamic_defaults.append((attname, key, field))
+
+    def initialize(self, instance, kwargs):
+        """
+        Fills a new instance with the values in kwargs, using each field's
+        default for anything not given. Unknown names are ignored.
+        """
+        self.store(instance, self.static_defaults)
+        if self.dynamic_defaults:
+            self.store(instance, [
+                (key, field.to_python(field.get_default()))
+                for attname, key, field in self.dynamic_defaults if attname not in kwargs
+            ])
+        if kwargs:
+            setters = self.setters
+            self.store(instance, [
+                (setters[attname][0], setters[attname][1](val))
+                for attname, val in kwargs.items() if attname in setters
+            ])
+
+    def decode(self, record):
+        """
+        Builds a record instance straight from a fixed width string, or
+        bytes in the record's codepage. Values are converted once and
+        stored without going back through each field's descriptor.
+        """
+        if isinstance(record, BINARY_TYPES):
+            record = decode_bytes(record, self.encoding)
+        if self.variable:
+            return self._decode_variable(record)
+        if len(record) != self.length:
+            raise ValueError("Fixed width record length is {} but should be {}.".format(len(record), self.length))
+
+        instance = self.record_class.__new__(self.record_class)
+        if self.lazy:
+            self.store(instance, [('_raw', record)])
+        else:
+            self.store(instance, [(key, to_python(record[start:end])) for key, start, end, to_python in self.decoders])
+        return instance
+
+    def _decode_variable(self, record):
+        spans = self._get_spans(record)
+        _check_length(record, spans[-1][1])
+        instance = self.record_class.__new__(self.record_class)
+        self.store(instance, [
+            (key, to_python(record[start:end])) for (key, _, _, to_python), (start, end) in zip(self.decoders, spans)
+        ])
+        return instance
+
+    def measure(self, record, pos=0, encoding=None):
+        """
+        The length of the record starting at ``pos`` of a string or bytes,
+        which for records with OCCURS DEPENDING ON lists is read from their
+        count fields. Bytes are decoded with ``encoding``, defaulting to
+        the record class's own.
+        """
+        if not self.variable:
+            return self.length
+        return self._get_spans(record, pos, encoding)[-1][1] - pos
+
+    def _get_spans(self, record, pos=0, encoding=None):
+        """
+        Where each field starts and ends in a variable length record. Lists
+        only take up as many occurrences as their count field says.
+        """
+        spans = []
+        counts = {}
+        for attname, _, length, field in self.layout:
+            if attname in self.counts:
+                length = field.record_length * _check_count(field, counts[self.counts[attname]])
+            spans.append((pos, pos + length))
+            if attname in self.count_fields:
+                counts[attname] = self._read_count(attname, record[pos:pos + length], encoding)
+            pos += length
+        return spans
+
+    def _read_count(self, attname, raw, encoding):
+        if not isinstance(raw, six.text_type):
+            raw = decode_bytes(raw, encoding or self.encoding)
+        return self.converters[attname](raw)
+
+    def find_errors(self, record):
+        """
+        Works out why a raw record won't decode, field by field. Returns a
+        list of (field name, raw value, exception), which is empty when
+        every field converts. Fields inside fragments and lists are named
+        like flat_layout, e.g. 'phones[1].area_code'.
+        """
+        try:
+            checks = self._get_record_checks(record)
+        except Exception as e:
+            return [(None, record, e)]
+        return _run_checks(record, checks)
+
+    def _get_checks(self):
+        """
+        The converter of every value holding field, with absolute offsets,
+        worked out the first time a record needs checking.
+        """
+        if self._checks is None:
+            layout = flatten_layout(self.layout)
+            self._checks = [(e.name, e.offset, e.end, self._get_converters(e.field)[0]) for e in layout]
+        return self._checks
+
+    def _get_record_checks(self, record):
+        """
+        The checks for one record, after making sure it's the right length.
+        A variable length record is checked field by field at the offsets
+        its count fields give.
+        """
+        if not self.variable:
+            _check_length(record, self.length)
+            return self._get_checks()
+        spans = self._get_spans(record)
+        _check_length(record, spans[-1][1])
+        return [(e.name, start, end, self.converters[e.name]) for e, (start, end) in zip(self.layout, spans)]
+
+    def find_encode_errors(self, values):
+        """
+        Like find_errors for a record instance, or dict of field values,
+        that won't encode. Only the fields that fail are returned.
+        """
+        items, truncate = self._get_encode_values(values)
+        errors = []
+        for entry, (_, to_record, length, check_length) in zip(self.layout, self.encoders):
+            attname = entry.name
+            if attname not in items:
+                continue
+            try:
+                record_val = to_record(self.setters[attname][1](items[attname]))
+                check_length(record_val[:length] if truncate else record_val)
+            except Exception as e:
+                errors.append((attname, items[attname], e))
+        return errors
+
+    def _get_encode_values(self, values):
+        if isinstance(values, dict):
+            return values, self.record_class.auto_truncate
+        # encoders read redefines fields from their stored value, without decoding them
+        items = dict((entry.name, getattr(values, encoded[0])) for entry, encoded in zip(self.layout, self.encoders))
+        return items, values.auto_truncate
+
+    def decode_field(self, instance, field):
+        """
+        Decodes one field of a lazy record from its raw string and keeps
+        the value so it is only decoded once.
+        """
+        start, end = self.offsets[field.attname]
+        value = self.converters[field.attname](instance._raw[start:end])
+        setattr(instance, field.storage_key, value)
+        return value
+
+    def encode(self, instance):
+        """
+        Strings together the fixed width value of every field on instance.
+        """
+        for field in self.redefines:
+            if isinstance(getattr(instance, field.storage_key, None), dict):
+                getattr(instance, field.attname)
+        raw = getattr(instance, '_raw', None)
+        if raw is not None:
+            return self._encode_lazy(instance, raw)
+        if self.variable:
+            return self._encode_variable(instance)
+        return self._encode_fields(instance)
+
+    def _encode_variable(self, instance):
+        """
+        Count fields are written from the length of the lists they count.
+        """
+        counts = self._get_counts(instance)
+
+        def get_value(instance, attname):
+            return counts[attname] if attname in counts else getattr(instance, attname)
+        return self._encode_fields(instance, get_value)
+
+    def _encode_fields(self, instance, get_value=getattr):
+        truncate = instance.auto_truncate
+        record_vals = []
+        for attname, to_record, length, check_length in self.encoders:
+            record_val = to_record(get_value(instance, attname))
+            if truncate:
+                record_val = record_val[:length]
+            if len(record_val) > length:
+                check_length(record_val)
+            record_vals.append(record_val)
+        return ''.join(record_vals)
+
+    def _get_counts(self, instance):
+        counts = {}
+        for list_attname, count_attname in self.counts.items():
+            count = len(getattr(instance, list_attname))
+            if counts.setdefault(count_attname, count) != count:
+                raise ValueError("Lists counted by '{}' have different lengths.".format(count_attname))
+        return counts
+
+    def _encode_lazy(self, instance, raw):
+        """
+        Fields that were never set are copied straight from the raw string
+        they were parsed from. A field that was only read still holds what
+        its slice decodes to, so it's copied too; reading mustn't change
+        how the record is written.
+        """
+        record_vals = []
+        for encoder, (key, start, end, to_python) in zip(self.encoders, self.decoders):
+            raw_val = raw[start:end]
+            if hasattr(instance, key) and not _is_unchanged(getattr(instance, key), raw_val, to_python):
+                record_vals.append(self._encode_field(instance, *encoder))
+            else:
+                record_vals.append(raw_val)
+        return ''.join(record_vals)
+
+    @staticmethod
+    def _encode_field(instance, attname, to_record, length, check_length):
+        record_val = to_record(getattr(instance, attname))
+        if instance.auto_truncate:
+            record_val = record_val[:length]
+        if len(record_val) > length:
+            check_length(record_val)
+        return record_val
+
+
+def _run_checks(record, checks):
+    errors = []
+    for name, start, end, to_python in checks:
+        try:
+            to_python(record[start:end])
+        except Exception as e:
+            errors.append((name, record[start:end], e))
+    return errors
+
+
+def _check_length(record, length):
+    if len(record) != length:
+        raise ValueError("Fixed width record length is {} but should be {}.".format(len(record), length))
+
+
+def _check_count(field, count):
+    if count is None or count % 1 or not 0 <= count <= field.length:
+        raise ValueError("'{}' occurs {!r} times but can only occur 0 to {} times.".format(
+            field.attname, count, field.length
+        ))
+    return int(count)
+
+
+def _uses_instance_dict(record_class):
+    if any(getattr(klass, '__slots__', None) for klass in record_class.__mro__):
+        return False
+    return hasattr(record_class.__new__(record_class), '__dict__')
+
+
+def _store_in_dict(instance, values):
+    instance.__dict__.update(values)
+
+
+def _store_in_slots(instance, values):
+    # setattr also reaches the __dict__ of a regular subclass of a compact record
+    if isinstance(values, dict):
+        values = values.items()
+    for key, value in values:
+        setattr(instance, key, value)
@@ -0,0 +1,261 @@
+import io
+from collections import OrderedDict
+
+import six
+
+from djcopybook.fixedwidth import fields
+from djcopybook.fixedwidth import streams
+from djcopybook.fixedwidth.codec import BINARY_TYPES, decode_bytes
+
+try:
+    import numpy
+except ImportError:  # numpy is optional
+    numpy = None
+
+SPACE = ord(' ')
+NUMERIC_FIELDS = (fields.IntegerField, fields.DecimalField, fields.PackedDecimalField, fields.BinaryIntegerField)
+
+
+def decode_columns(record_class, lines, as_arrays=False, newline=None):
+    """
+    Decodes many fixed width records straight into one column per field,
+    without building a record instance for each row.
+
+    ``lines`` is a sequence of records as text or bytes, or one string or
+    bytes buffer holding them all (split like iter_records). Columns are
+    named like flat_layout, so fields inside fragments and lists get their
+    own columns, e.g. 'phones[1].area_code'.
+
+    Each column is a list of the values to_python would give. With
+    ``as_arrays`` numeric and date columns become NumPy arrays instead,
+    parsed straight from the fixed offsets of the whole batch. Blank
+    values are NaN or NaT in those arrays. Integers too big for int64 make
+    an object array of Python ints.
+    """
+    streams.check_fixed_length(record_class, 'decode_columns')
+    if as_arrays and numpy is None:
+        raise ImportError("NumPy is required for columnar arrays.")
+    lines = _get_text_lines(record_class, lines, newline)
+    matrix = _get_matrix(record_class, lines) if as_arrays else None
+
+    columns = OrderedDict()
+    for entry in record_class.flat_layout():
+        if not isinstance(entry.field, fields.NewLineField):
+            columns[entry.name] = _decode_column(record_class, entry, lines, as_arrays, matrix)
+    return columns
+
+
+def _decode_column(record_class, entry, lines, as_arrays, matrix):
+    if matrix is not None:
+        column = _decode_array(entry, matrix[:, entry.offset:entry.end])
+        if column is not None:
+            return column
+    column = _decode_list(record_class, entry, lines)
+    return _list_to_array(entry.field, column) if as_arrays else column
+
+
+def _get_text_lines(record_class, lines, newline):
+    encoding = record_class.encoding
+    if isinstance(lines, six.text_type):
+        lines = streams.split_records(io.StringIO(lines), len(record_class), newline)
+    elif isinstance(lines, BINARY_TYPES):
+        lines = streams.split_records(io.BytesIO(bytes(lines)), len(record_class), newline, encoding=encoding)
+
+    lines = [line if isinstance(line, six.text_type) else decode_bytes(line, encoding) for line in lines]
+    length = len(record_class)
+    for row, line in enumerate(lines):
+        if len(line) != length:
+            raise ValueError("Fixed width record {} length is {} but should be {}.".format(row, len(line), length))
+    return lines
+
+
+def _get_matrix(record_class, lines):
+    """
+    Every record as a row of latin-1 bytes. Text decoded from EBCDIC
+    codepages like cp037 is all in latin-1, so digits come out as ASCII.
+    Returns None for text that isn't.
+    """
+    try:
+        data = u''.join(lines).encode('latin-1')
+    except UnicodeEncodeError:
+        return None
+    return numpy.frombuffer(data, dtype=numpy.uint8).reshape(len(lines), len(record_class))
+
+
+def _decode_list(record_class, entry, lines):
+    start, end, field = entry.offset, entry.end, entry.field
+    values = [line[start:end] for line in lines]
+    if field.binary:
+        encoding = record_class.encoding
+        values = [value.encode(encoding) for value in values]
+    return field.decode_many(values)
+
+
+def _decode_array(entry, block):
+    """
+    Vectorized parsing of a column's block of bytes for the field types
+    NumPy can read directly. Returns None for anything else, or when the
+    block holds something NumPy can't parse, like unpadded dates.
+    """
+    try:
+        return _parse_block(entry.field, block)
+    except (ValueError, OverflowError):
+        return None
+
+
+def _parse_block(field, block):
+    if type(field) is fields.IntegerField:
+        return _parse_numbers(block, numpy.int64)
+    if type(field) is fields.DecimalField:
+        return _parse_numbers(block, numpy.float64)
+    if type(field) is fields.ImpliedDecimalField:
+        return _parse_numbers(block, numpy.int64) / 10 ** field.decimals
+    if type(field) is fields.DateField:
+        return _parse_dates(block, field.format)
+    return None
+
+
+def _parse_numbers(block, dtype):
+    strings = _as_strings(block)
+    blank = (block == SPACE).all(axis=1)
+    if not blank.any():
+        return strings.astype(dtype)
+    values = numpy.full(len(strings), numpy.nan)
+    values[~blank] = strings[~blank].astype(numpy.float64)
+    return values
+
+
+def _parse_dates(block, date_format):
+    indexes = _get_iso_date_indexes(date_format, block.shape[1])
+    if indexes is None:
+        return None
+    # one extra column of dashes to pick the ISO separators from
+    dashes = numpy.full((block.shape[0], 1), ord('-'), dtype=numpy.uint8)
+    iso = _as_strings(numpy.hstack([block, dashes])[:, indexes])
+    iso[(block == SPACE).all(axis=1)] = b'NaT'
+    return iso.astype('datetime64[D]')
+
+
+def _get_iso_date_indexes(date_format, width):
+    """
+    Which bytes of a date written in ``date_format`` make up the same date
+    as YYYY-MM-DD, with ``width`` standing for a dash. None unless the
+    format is only %Y, %m, %d and single character separators.
+    """
+    layout = fields.get_date_format_layout(date_format)
+    if layout is None or layout[2] != width or sorted(layout[0]) != ['%Y', '%d', '%m']:
+        return None
+    year, month, day = (list(range(*layout[0][directive])) for directive in ('%Y', '%m', '%d'))
+    return year + [width] + month + [width] + day
+
+
+def _as_strings(block):
+    width = block.shape[1]
+    return numpy.ascontiguousarray(block).view('S{}'.format(width)).ravel()
+
+
+def _list_to_array(field, values):
+    if isinstance(field, fields.DateTimeField):
+        return numpy.array(values, dtype='datetime64[D]' if isinstance(field, fields.DateField) else 'datetime64[us]')
+    if isinstance(field, NUMERIC_FIELDS):
+        return _numbers_to_array(values, getattr(field, 'decimals', 0))
+    return values
+
+
+def _numbers_to_array(values, decimals):
+    if None not in values and not decimals:
+        try:
+            return numpy.array(values, dtype=numpy.int64)
+        except OverflowError:
+            # kept exact as Python ints rather than rounded to floats
+            return numpy.array(values, dtype=object)
+    return numpy.array([numpy.nan if value is None else value for value in values], dtype=numpy.float64)
+
+
+def encode_columns(record_class, columns):
+    """
+    Builds fixed width records from a mapping of column names to
+    sequences of values, such as lists, NumPy arrays or pandas Series,
+    without building a Record for every row. Returns one string per row,
+    exactly as to_record would write it.
+
+    Columns are named like the keyword arguments of the record class.
+    Fields inside fragments and lists can also be given one column each
+    with the names from_records_columnar uses, e.g. 'phones[1].area_code'.
+    Missing columns use each field's default, and NaN or NaT in an array
+    counts as None. Unknown names are ignored.
+    """
+    streams.check_fixed_length(record_class, 'encode_columns')
+    columns = dict((name, _as_list(values)) for name, values in columns.items())
+    lengths = set(len(values) for values in columns.values())
+    if len(lengths) > 1:
+        raise ValueError("Columns must all be the same length, not {}.".format(sorted(lengths)))
+    rows = lengths.pop() if lengths else 0
+
+    encoded = list(_encode_layout(record_class, columns, rows))
+    if not encoded:
+        return [''] * rows
+    return [''.join(parts) for parts in zip(*encoded)]
+
+
+def _as_list(values):
+    kind = getattr(getattr(values, 'dtype', None), 'kind', None)
+    if kind == 'f':
+        return [None if value != value else value for value in values.tolist()]
+    if kind == 'M':
+        # datetime64[ns] lists as ints; in microseconds it lists as datetimes, with NaT as None
+        return numpy.asarray(values, dtype='datetime64[us]').tolist()
+    if hasattr(values, 'tolist'):
+        return values.tolist()
+    return list(values)
+
+
+def _encode_layout(record_class, columns, rows, prefix=''):
+    """
+    Yields the encoded column for each field in order. Fragments and lists
+    without a column of their own are encoded field by field from the
+    columns of what's inside them.
+    """
+    for entry in record_class._layout:
+        name = prefix + entry.name
+        field = entry.field
+        if name in columns or not isinstance(field, (fields.FragmentField, fields.ListField)):
+            yield _encode_column(record_class, entry, columns.get(name), rows)
+            continue
+        for nested_prefix in _get_nested_prefixes(name, field):
+            for column in _encode_layout(field.record_class, columns, rows, nested_prefix):
+                yield column
+
+
+def _get_nested_prefixes(name, field):
+    if isinstance(field, fields.ListField):
+        return ['{}[{}].'.format(name, i) for i in range(field.length)]
+    return [name + '.']
+
+
+def _encode_column(record_class, entry, values, rows):
+    field = entry.field
+    encoded = field.encode_many(values) if values is not None else _encode_defaults(field, rows)
+    if field.binary:
+        encoding = record_class.encoding
+        encoded = [value.decode(encoding) for value in encoded]
+    return _fit_column(record_class, entry, encoded)
+
+
+def _encode_defaults(field, rows):
+    if field.has_default() and callable(field.default):
+        return field.encode_many([field.get_default() for _ in range(rows)])
+    return field.encode_many([field.get_default()]) * rows
+
+
+def _fit_column(record_class, entry, encoded):
+    """
+    Truncates values for auto_truncate records, or raises FieldLengthError
+    for the first value that's too long, just like to_record.
+    """
+    if record_class.auto_truncate:
+        encoded = [value[:entry.length] for value in encoded]
+    if encoded and max(map(len, encoded)) > entry.length:
+        for value in encoded:
+            entry.field._check_record_length(value)
+    return encoded
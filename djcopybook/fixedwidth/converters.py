@@ -0,0 +1,151 @@
+"""
+The small conversions fields make for every value they read or write.
+
+This module is plain Python, and is what runs unless it has been
+compiled. When Cython is installed setup.py compiles this same file into
+an extension module, which Python imports in place of it. Keep it to
+functions of builtins and Decimal so it compiles unchanged, and any
+change here is tested against both.
+"""
+from decimal import Decimal, ROUND_HALF_EVEN
+
+import six
+
+# True when this is the extension module setup.py compiled.
+COMPILED = not __file__.endswith(('.py', '.pyc'))
+
+# Zoned decimal overpunch: the last digit and the sign share one character.
+OVERPUNCH_POSITIVE = u'{ABCDEFGHI'
+OVERPUNCH_NEGATIVE = u'}JKLMNOPQR'
+OVERPUNCH_DIGITS = dict((ord(c), six.text_type(i % 10)) for i, c in enumerate(OVERPUNCH_POSITIVE + OVERPUNCH_NEGATIVE))
+OVERPUNCH_LAST_DIGITS = dict(
+    [(c, ('', six.text_type(i))) for i, c in enumerate(OVERPUNCH_POSITIVE)] +
+    [(c, ('-', six.text_type(i))) for i, c in enumerate(OVERPUNCH_NEGATIVE)] +
+    [(six.text_type(i), ('', six.text_type(i))) for i in range(10)]
+)
+OVERPUNCH_SIGNS = (
+    dict((str(i), c) for i, c in enumerate(OVERPUNCH_POSITIVE)),
+    dict((str(i), c) for i, c in enumerate(OVERPUNCH_NEGATIVE)),
+)
+
+
+def str_padding(length, val):
+    """Formats value giving it a right space padding up to a total length of 'length'"""
+    if isinstance(val, six.text_type):
+        # formatting text into a Python 2 str template would encode it as ascii
+        return val.ljust(length)
+    return '{0:<{fill}}'.format(val, fill=length)
+
+
+def int_padding(length, val, direction=">"):
+    """Formats value giving it left zeros padding up to a total length of 'length'"""
+    return '{0:0{direction}{fill}}'.format(val, direction=direction, fill=length)
+
+
+def to_scaled_integer(val, decimals):
+    """
+    The value as a whole number of 10 ** -decimals units, rounded half to
+    even. Floats are taken at their shortest repr, so 0.1 scales to exactly
+    10 with 2 decimals, and Decimals keep every digit.
+    """
+    if isinstance(val, six.integer_types):
+        return val * 10 ** decimals
+    if isinstance(val, float):
+        val = repr(val)
+    return int(Decimal(val).scaleb(decimals).to_integral_value(ROUND_HALF_EVEN))
+
+
+def float_padding(length, val, decimals=2):
+    """Pads zeros to left and right to assure proper length and precision"""
+    scaled = to_scaled_integer(val, decimals)
+    digits = str(abs(scaled)).rjust(decimals + 1, '0')
+    if decimals:
+        digits = digits[:-decimals] + '.' + digits[-decimals:]
+    return ('-' + digits if scaled < 0 else digits).rjust(length, '0')
+
+
+def implied_decimal_padding(length, val, decimals=2):
+    """
+    Pads zeros to left and right to assure proper length and precision,
+    leaving out the decimal point.
+    """
+    scaled = to_scaled_integer(val, decimals)
+    digits = str(abs(scaled)).rjust(decimals + 1, '0')
+    return ('-' + digits if scaled < 0 else digits).rjust(length, '0')
+
+
+def is_blank_string(val):
+    return isinstance(val, six.string_types) and val.strip() == ''
+
+
+def to_string(val):
+    if val is None:
+        return val
+    if isinstance(val, six.text_type):
+        return val.rstrip()
+    return str(val).rstrip()
+
+
+def to_integer(val):
+    if val is None or is_blank_string(val):
+        return None
+    return int(val)
+
+
+def to_float(val):
+    if val is None or is_blank_string(val):
+        return None
+    return float(val)
+
+
+def to_implied_decimal(val, length, decimals):
+    """
+    Strings are the digits of a number with ``decimals`` implied places.
+    """
+    if val is None or isinstance(val, Decimal):
+        return val
+    elif not isinstance(val, six.string_types):
+        return Decimal(str(val))
+    elif is_blank_string(val):
+        return None
+    return Decimal(int(val[:length])).scaleb(-decimals)
+
+
+def to_signed_implied_decimal(val, length, decimals):
+    """
+    Like to_implied_decimal, with a trailing + or - sign.
+    """
+    if val is None or is_blank_string(val) or is_blank_string(str(val).rstrip("+")):
+        return None
+    elif not isinstance(val, six.string_types):
+        return Decimal(str(val))
+
+    value = Decimal(int(val[:length - 1])).scaleb(-decimals)
+    return -value if val[-1] == '-' else value
+
+
+def to_overpunch_decimal(val, exponent):
+    """
+    Reads a zoned decimal whose sign is punched over its last digit.
+    ``exponent`` is like 'E-2' for two implied decimal places.
+    """
+    if not isinstance(val, six.text_type):
+        if not isinstance(val, six.string_types):
+            return None if val is None else Decimal(str(val))
+        val = six.text_type(val)
+
+    # an unknown last character leaves a non digit behind so the check below fails
+    sign, last = OVERPUNCH_LAST_DIGITS.get(val[-1:], ('', 'x'))
+    digits = val[:-1] + last
+    if not digits.isdigit():
+        return _to_padded_overpunch_decimal(val, exponent)
+    return Decimal(sign + digits + exponent)
+
+
+def _to_padded_overpunch_decimal(val, exponent):
+    stripped = val.strip()
+    if not stripped:
+        return None
+    if stripped == val:
+        raise ValueError("'{}' is not a valid overpunch number.".format(val))
+    return to_overpunch_decimal(stripped, exponent)
@@ -0,0 +1,523 @@
+"""
+Builds Record classes from COBOL copybooks.
+
+    from djcopybook.fixedwidth import copybook
+
+    records = copybook.read_copybook('POLICY.cpy', cache_dir='/var/cache/copybooks', encoding='cp037')
+    Policy = records['PolicyRecord']
+
+Each 01 level group becomes a Record class. Groups below it become
+FragmentFields of their own Record class, and OCCURS become ListFields.
+PIC clauses and USAGE map onto fields like this:
+
+    PIC X(n), A(n) and edited pictures      StringField
+    PIC 9(n)                                 IntegerField
+    PIC 9(n)V9(m)                            ImpliedDecimalField
+    PIC S9(n)V9(m)                           OverpunchDecimalField
+    PIC S9(n) SIGN TRAILING SEPARATE         SignedImpliedDecimalField
+    COMP, COMP-4, COMP-5, BINARY             BinaryIntegerField
+    COMP-3, PACKED-DECIMAL                   PackedDecimalField
+
+Below the 01 level, an item and the items that REDEFINE it become one
+RedefinesField with a variant for each, keyed by attribute name, whether
+they're groups or elementary items. It uses the first definition until
+the field is given a ``discriminator`` or ``selector``. OCCURS DEPENDING
+ON becomes a ListField whose length comes from the count item, which has
+to be an earlier item of the same group.
+
+Parsing gives a layout of plain lists and dicts, which is cached as JSON
+under ``cache_dir`` keyed on a hash of the copybook source, so processes
+starting up later only have to build the classes.
+"""
+import hashlib
+import io
+import json
+import keyword
+import os
+import re
+import tempfile
+from collections import OrderedDict
+
+from djcopybook.fixedwidth import Record
+from djcopybook.fixedwidth import fields
+
+# Bump whenever parse_copybook's output changes so old cache files are ignored.
+CACHE_VERSION = 4
+DEFAULT_RECORD_NAME = 'RECORD'
+
+TOKEN_RE = re.compile(r"""'[^']*'|"[^"]*"|[^\s'"]+""")
+REPEAT_RE = re.compile(r'(.)\((\d+)\)')
+NUMERIC_PICTURE_RE = re.compile(r'^(S?)(9*)(?:V(9*))?$')
+
+USAGES = {
+    'DISPLAY': 'display',
+    'COMP': 'binary',
+    'COMPUTATIONAL': 'binary',
+    'COMP-4': 'binary',
+    'COMPUTATIONAL-4': 'binary',
+    'COMP-5': 'binary',
+    'COMPUTATIONAL-5': 'binary',
+    'BINARY': 'binary',
+    'COMP-3': 'packed',
+    'COMPUTATIONAL-3': 'packed',
+    'PACKED-DECIMAL': 'packed',
+    'COMP-1': 'float',
+    'COMPUTATIONAL-1': 'float',
+    'COMP-2': 'float',
+    'COMPUTATIONAL-2': 'float',
+}
+
+# Only these fields are ever built from a layout, even one read from disk.
+FIELD_TYPES = (
+    'StringField', 'IntegerField', 'ImpliedDecimalField', 'SignedImpliedDecimalField', 'OverpunchDecimalField',
+    'PackedDecimalField', 'BinaryIntegerField',
+)
+
+RESERVED_NAMES = set(dir(Record)) | {'base_fields', '_layout', '_codec', '_length', '_hooks'}
+
+# Layouts already parsed or read from the cache by this process.
+_layouts = {}
+
+
+class CopybookError(ValueError):
+    pass
+
+
+def read_copybook(path, cache_dir=None, name=None, module=None, **options):
+    """
+    Like load_copybook, reading the copybook from ``path``. Items that
+    aren't inside an 01 level are gathered into a record named after the
+    file.
+    """
+    with io.open(path, encoding='latin-1') as f:
+        source = f.read()
+    name = name or os.path.splitext(os.path.basename(path))[0].upper()
+    return load_copybook(source, cache_dir, name, module, **options)
+
+
+def load_copybook(source, cache_dir=None, name=DEFAULT_RECORD_NAME, module=None, **options):
+    """
+    Builds a Record class for each record in the copybook ``source``,
+    returned in an OrderedDict keyed by class name.
+
+    The parsed layout is kept for the life of the process and, with a
+    ``cache_dir``, written there as JSON for the next one. Any other
+    keyword arguments, like ``encoding='cp037'`` or ``compact=True``, are
+    set as options on every class built.
+    """
+    return build_records(get_layout(source, cache_dir, name), module, **options)
+
+
+def get_layout(source, cache_dir=None, name=DEFAULT_RECORD_NAME):
+    """
+    parse_copybook, skipped when the same source has been parsed before by
+    this process or has a file in ``cache_dir``.
+    """
+    key = hashlib.sha1(u'{}\n{}\n{}'.format(CACHE_VERSION, name, source).encode('utf-8')).hexdigest()
+    if key not in _layouts:
+        path = os.path.join(cache_dir, key + '.json') if cache_dir else None
+        layout = _read_cache(path) if path else None
+        if layout is None:
+            layout = parse_copybook(source, name)
+            if path:
+                _write_cache(path, layout)
+        _layouts[key] = layout
+    return _layouts[key]
+
+
+def _read_cache(path):
+    try:
+        with io.open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def _write_cache(path, layout):
+    """
+    Writes to a temporary file renamed into place, so other processes
+    never read half a layout.
+    """
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    with tempfile.NamedTemporaryFile('w', dir=directory, suffix='.tmp', delete=False) as f:
+        json.dump(layout, f)
+    os.rename(f.name, path)
+
+
+def parse_copybook(source, name=DEFAULT_RECORD_NAME):
+    """
+    Parses copybook text into a layout: a list with one node per record.
+    A node is a dict with the item's COBOL ``name`` and either ``fields``,
+    the nodes inside a group, or the ``field`` class name and ``args`` to
+    build it with. Nodes that repeat have ``occurs``, and ``depending_on``
+    when the number of occurrences is held by another item.
+
+    Copybooks without 01 levels are treated as one record called ``name``.
+    """
+    roots = _build_tree(_parse_entry(tokens) for tokens in _split_entries(_strip_source(source)))
+    if not roots:
+        raise CopybookError("The copybook doesn't declare any items.")
+    if not all(root['children'] for root in roots):
+        roots = [{'name': name, 'children': roots}]
+    return [_layout_node(root, 'display') for root in roots]
+
+
+def _strip_source(source):
+    lines = source.splitlines()
+    if _is_fixed_format(lines):
+        lines = [line[7:72] for line in lines if line[6:7] not in ('*', '/')]
+    return '\n'.join(line.split('*>')[0] for line in lines if not line.lstrip().startswith('*'))
+
+
+def _is_fixed_format(lines):
+    """
+    Fixed format source keeps sequence numbers in columns 1-6 and an
+    indicator in column 7, with the code itself from column 8 on.
+    """
+    lines = [line for line in lines if line.strip()]
+    return bool(lines) and all(line[:6].strip(' 0123456789') == '' and line[6:7] in ' *-/' for line in lines)
+
+
+def _split_entries(text):
+    """
+    Yields the words of each period terminated entry. Quoted literals are
+    kept whole, whatever they contain.
+    """
+    entry = []
+    for token in TOKEN_RE.findall(text):
+        ends = token[0] not in '\'"' and token.endswith('.')
+        entry.append(token[:-1] if ends else token)
+        if ends:
+            entry = [word for word in entry if word]
+            if entry:
+                yield entry
+            entry = []
+    if entry:
+        raise CopybookError("Entry '{}' isn't ended by a period.".format(' '.join(entry)))
+
+
+def _parse_entry(tokens):
+    if not tokens[0].isdigit():
+        raise CopybookError("Entry '{}' doesn't start with a level number.".format(' '.join(tokens)))
+    words = [token.upper() for token in tokens[1:]]
+    named = words and words[0] not in CLAUSES and words[0] not in USAGES
+    entry = {'level': int(tokens[0]), 'name': words[0] if named else 'FILLER'}
+
+    pos = 1 if named else 0
+    while pos < len(words):
+        parse_clause = CLAUSES.get(words[pos], _parse_usage if words[pos] in USAGES else None)
+        pos = parse_clause(entry, words, pos) if parse_clause else pos + 1
+    return entry
+
+
+def _next_word(words, pos, *optional):
+    """
+    The word after ``pos``, skipping any of the ``optional`` noise words
+    like IS or ON. Returns the word and the position after it.
+    """
+    pos += 1
+    while pos < len(words) and words[pos] in optional:
+        pos += 1
+    if pos >= len(words):
+        raise CopybookError("'{}' is missing its value.".format(' '.join(words)))
+    return words[pos], pos + 1
+
+
+def _parse_picture(entry, words, pos):
+    entry['pic'], pos = _next_word(words, pos, 'IS')
+    return pos
+
+
+def _parse_usage(entry, words, pos):
+    if words[pos] == 'USAGE':
+        usage, pos = _next_word(words, pos, 'IS')
+    else:
+        usage, pos = words[pos], pos + 1
+    if usage not in USAGES:
+        raise CopybookError("{} has an unknown USAGE {}.".format(entry['name'], usage))
+    entry['usage'] = USAGES[usage]
+    return pos
+
+
+def _parse_occurs(entry, words, pos):
+    count, pos = _next_word(words, pos)
+    if pos < len(words) and words[pos] == 'TO':
+        count, pos = _next_word(words, pos)
+    if not count.isdigit():
+        raise CopybookError("{} OCCURS {} isn't a number of times.".format(entry['name'], count))
+    entry['occurs'] = int(count)
+    return pos
+
+
+def _parse_depending(entry, words, pos):
+    entry['depending_on'], pos = _next_word(words, pos, 'ON')
+    return pos
+
+
+def _parse_redefines(entry, words, pos):
+    entry['redefines'], pos = _next_word(words, pos)
+    return pos
+
+
+def _parse_sign(entry, words, pos):
+    entry['sign'] = words[pos]
+    return pos + 1
+
+
+def _parse_separate(entry, words, pos):
+    entry['separate'] = True
+    return pos + 1
+
+
+CLAUSES = {
+    'PIC': _parse_picture,
+    'PICTURE': _parse_picture,
+    'USAGE': _parse_usage,
+    'OCCURS': _parse_occurs,
+    'DEPENDING': _parse_depending,
+    'REDEFINES': _parse_redefines,
+    'LEADING': _parse_sign,
+    'TRAILING': _parse_sign,
+    'SEPARATE': _parse_separate,
+}
+
+
+def _build_tree(entries):
+    """
+    Nests entries under the group before them with a lower level number.
+    Condition names (88) and RENAMES (66) don't take up any space and are
+    dropped. Returns the top level items.
+    """
+    root = {'level': 0, 'children': []}
+    stack = [root]
+    for entry in entries:
+        if entry['level'] in (66, 88):
+            continue
+        if entry['level'] == 77:
+            entry['level'] = 1
+        while stack[-1]['level'] >= entry['level']:
+            stack.pop()
+        entry['children'] = []
+        stack[-1]['children'].append(entry)
+        stack.append(entry)
+    return root['children']
+
+
+def _layout_node(entry, usage):
+    """
+    The layout node for an item. USAGE given on a group applies to all the
+    items inside it.
+    """
+    usage = entry.get('usage', usage)
+    node = {'name': entry['name']}
+    if entry.get('occurs'):
+        node['occurs'] = entry['occurs']
+    if entry.get('depending_on'):
+        node['depending_on'] = entry['depending_on']
+    if entry['children']:
+        node['fields'] = _layout_children(entry['children'], usage)
+    elif 'pic' in entry:
+        node['field'], node['args'] = _picture_field(entry, usage)
+    else:
+        raise CopybookError("{} has neither a PIC clause nor any items inside it.".format(entry['name']))
+    return node
+
+
+def _layout_children(children, usage):
+    """
+    Layout nodes for the items of a group. Items that REDEFINE an earlier
+    one become ``variants`` of a single node with the earlier one's name.
+    """
+    nodes = []
+    for child in children:
+        node = _layout_node(child, usage)
+        if 'redefines' in child:
+            _add_variant(nodes, child['redefines'], node)
+        else:
+            nodes.append(node)
+    return nodes
+
+
+def _add_variant(nodes, name, variant):
+    pos = _find_node(nodes, name)
+    if 'variants' not in nodes[pos]:
+        nodes[pos] = {'name': nodes[pos]['name'], 'variants': [nodes[pos]]}
+    nodes[pos]['variants'].append(variant)
+
+
+def _find_node(nodes, name):
+    for pos in range(len(nodes) - 1, -1, -1):
+        if name in [nodes[pos]['name']] + [variant['name'] for variant in nodes[pos].get('variants', ())]:
+            return pos
+    raise CopybookError("{} is REDEFINED before it's declared in the same group.".format(name))
+
+
+def _expand_picture(picture):
+    return REPEAT_RE.sub(lambda match: match.group(1) * int(match.group(2)), picture)
+
+
+def _picture_field(entry, usage):
+    symbols = _expand_picture(entry['pic'])
+    numeric = NUMERIC_PICTURE_RE.match(symbols)
+    if usage == 'float' or set(symbols) & set('PNG'):
+        raise CopybookError("{} PIC {} {} isn't supported.".format(entry['name'], entry['pic'], usage.upper()))
+    if not (numeric and '9' in symbols):
+        if usage != 'display':
+            raise CopybookError("{} PIC {} can't be {}.".format(entry['name'], entry['pic'], usage.upper()))
+        return 'StringField', {'length': len(symbols.replace('V', ''))}
+
+    signed, integer, fraction = numeric.groups()
+    digits, decimals = len(integer) + len(fraction or ''), len(fraction or '')
+    return NUMERIC_FIELDS[usage](entry, digits, decimals, bool(signed))
+
+
+def _display_field(entry, digits, decimals, signed):
+    if not signed:
+        if decimals:
+            return 'ImpliedDecimalField', {'length': digits, 'decimals': decimals}
+        return 'IntegerField', {'length': digits}
+    if entry.get('sign', 'TRAILING') == 'LEADING':
+        raise CopybookError("{} SIGN LEADING isn't supported.".format(entry['name']))
+    if entry.get('separate'):
+        return 'SignedImpliedDecimalField', {'length': digits + 1, 'decimals': decimals}
+    return 'OverpunchDecimalField', {'length': digits, 'decimals': decimals}
+
+
+def _binary_field(entry, digits, decimals, signed):
+    length = 2 if digits <= 4 else 4 if digits <= 9 else 8
+    return 'BinaryIntegerField', {'length': length, 'decimals': decimals, 'signed': signed}
+
+
+def _packed_field(entry, digits, decimals, signed):
+    return 'PackedDecimalField', {'length': digits // 2 + 1, 'decimals': decimals, 'signed': signed}
+
+
+NUMERIC_FIELDS = {
+    'display': _display_field,
+    'binary': _binary_field,
+    'packed': _packed_field,
+}
+
+
+def build_records(layout, module=None, **options):
+    """
+    Record classes for a layout from parse_copybook, keyed by class name.
+
+    Classes for groups inside a record are attributes of the class they
+    belong to, e.g. PolicyRecord.Insured. Pass the ``module`` the records
+    will live in, and assign them there, for them to pickle:
+
+        globals().update(copybook.load_copybook(source, module=__name__))
+
+    Records with groups only pickle on Python 3; Python 2 ignores
+    __qualname__ and can't find the nested classes.
+    """
+    records = OrderedDict()
+    for node in layout:
+        record_class = _build_record(node, _class_name(_attribute_name(node['name'])), module, options)
+        records[record_class.__name__] = record_class
+    return records
+
+
+def _build_record(node, qualname, module, options):
+    """
+    A Record class with a field for each node in the group ``node``.
+    Classes for the groups and repeated items inside it are kept as
+    attributes of the new class.
+    """
+    attrs = dict(options, __module__=module or __name__)
+    attnames = {}
+    for child in node['fields']:
+        attname = _unique_name(_attribute_name(child['name']), attrs)
+        attrs[attname] = _build_child(child, attname, qualname, attrs, module, options)
+        if 'depending_on' in child:
+            attrs[attname].depending_on = _depending_attname(child, attnames)
+        attnames[child['name']] = attname
+    return _record_class(qualname, attrs)
+
+
+def _build_child(node, attname, qualname, attrs, module, options):
+    if 'variants' in node:
+        return _build_redefines(node, qualname, attrs, module, options)
+    if 'fields' not in node and 'occurs' not in node:
+        return _build_field(node)
+
+    if 'fields' in node:
+        record_class = _build_nested(node, _class_name(attname), qualname, attrs, module, options)
+    else:
+        # each occurrence of a repeated item is a record holding just that item
+        item = dict((key, value) for key, value in node.items() if key not in ('occurs', 'depending_on'))
+        record_class = _build_nested({'fields': [item]}, _class_name(attname), qualname, attrs, module, options)
+    return _repeat(record_class, node)
+
+
+def _depending_attname(node, attnames):
+    try:
+        return attnames[node['depending_on']]
+    except KeyError:
+        raise CopybookError("{} DEPENDING ON {} needs it to be an earlier item of the same group.".format(
+            node['name'], node['depending_on']
+        ))
+
+
+def _build_redefines(node, qualname, attrs, module, options):
+    """
+    A RedefinesField with a variant for each definition, keyed by their
+    attribute names. Variants that aren't a single group are records
+    holding just that item.
+    """
+    variants = OrderedDict()
+    for variant in node['variants']:
+        name = _unique_name(_attribute_name(variant['name']), variants)
+        if 'occurs' in variant or 'fields' not in variant:
+            variant = {'fields': [variant]}
+        variants[name] = _build_nested(variant, _class_name(name), qualname, attrs, module, options)
+    return fields.RedefinesField(variants)
+
+
+def _build_nested(node, class_name, qualname, attrs, module, options):
+    class_name = _unique_name(class_name, attrs)
+    attrs[class_name] = _build_record(node, '{}.{}'.format(qualname, class_name), module, options)
+    return attrs[class_name]
+
+
+def _record_class(qualname, attrs):
+    record_class = type(str(qualname.split('.')[-1]), (Record,), attrs)
+    record_class.__qualname__ = qualname
+    return record_class
+
+
+def _build_field(node):
+    if node['field'] not in FIELD_TYPES:
+        raise CopybookError("{} isn't a field a copybook can build.".format(node['field']))
+    return getattr(fields, node['field'])(**node['args'])
+
+
+def _repeat(record_class, node):
+    if 'occurs' in node:
+        return fields.ListField(record=record_class, length=node['occurs'])
+    return fields.FragmentField(record=record_class)
+
+
+def _attribute_name(cobol_name):
+    name = re.sub(r'[^0-9a-z]+', '_', cobol_name.lower()).strip('_') or 'filler'
+    if name[0].isdigit():
+        name = 'f_' + name
+    return name + '_' if keyword.iskeyword(name) or name in RESERVED_NAMES else name
+
+
+def _unique_name(name, attrs):
+    """
+    Repeated names, like FILLER, get a number on the end.
+    """
+    unique, count = name, 1
+    while unique in attrs:
+        count += 1
+        unique = '{}_{}'.format(name, count)
+    return unique
+
+
+def _class_name(attname):
+    return ''.join(part[:1].upper() + part[1:] for part in attname.split('_')) or 'Record'
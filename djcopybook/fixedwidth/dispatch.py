@@ -0,0 +1,77 @@
+import six
+
+from djcopybook.fixedwidth import streams
+from djcopybook.fixedwidth.codec import decode_bytes
+
+
+class RecordDispatcher(object):
+    """
+    Reads files that mix several record layouts, such as a header, details
+    and a trailer, told apart by a type code at the same position in every
+    layout.
+
+        dispatcher = RecordDispatcher(offset=0, length=2, record_classes={
+            'HD': Header,
+            'DT': Detail,
+            'TR': Trailer,
+        })
+        for record in dispatcher.iter_records(f):
+            ...
+
+    ``default`` is the Record class used for unknown type codes. Without
+    one, an unknown type code raises a ValueError.
+    """
+
+    def __init__(self, offset, length, record_classes, default=None):
+        self.offset = offset
+        self.end = offset + length
+        self.record_classes = dict(record_classes)
+        self.default = default
+        all_classes = list(self.record_classes.values()) + ([default] if default else [])
+        self.max_length = max(len(record_class) for record_class in all_classes)
+        self.encoding = all_classes[0].encoding
+
+    def get_record_class(self, record):
+        """
+        The Record class for a fixed width string, looked up by its type code.
+        The type code of bytes is decoded with the record classes' encoding.
+        """
+        code = record[self.offset:self.end]
+        # Python 2 str type codes already look up the same as text
+        if not isinstance(code, (str, six.text_type)):
+            code = decode_bytes(code, self.encoding)
+        return self.get_class_for_code(code)
+
+    def get_class_for_code(self, code):
+        try:
+            return self.record_classes[code]
+        except KeyError:
+            if self.default is None:
+                raise ValueError("No record class for type code {!r}.".format(code))
+            return self.default
+
+    def from_record(self, record):
+        return self.get_record_class(record).from_record(record)
+
+    def iter_records(self, fileobj, newline=None, chunk_size=streams.DEFAULT_CHUNK_SIZE, encoding=None):
+        """
+        Lazily yields records of whichever class each one's type code maps
+        to. Works like Record.iter_records, except that packed records (no
+        separator) may be of different lengths, as may records of classes
+        with OCCURS DEPENDING ON lists. Binary files are decoded
+        with the ``encoding`` of the record classes unless another one is
+        given.
+        """
+        encoding = encoding or self.encoding
+
+        def measure(buf, pos):
+            code = buf[pos + self.offset:pos + self.end]
+            if not isinstance(code, six.text_type):
+                code = decode_bytes(code, encoding)
+            return self.get_class_for_code(code)._codec.measure(buf, pos, encoding)
+
+        for raw in streams.split_variable_records(fileobj, measure, self.max_length, newline, chunk_size,
+                                                  encoding):
+            if not isinstance(raw, six.text_type):
+                raw = decode_bytes(raw, encoding)
+            yield self.from_record(raw)
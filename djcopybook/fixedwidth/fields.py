@@ -1,7 +1,23 @@
+import binascii
 import datetime
+import operator
+import re
 import six
+import struct
+from collections import OrderedDict
 from decimal import Decimal
 
+try:
+    from collections.abc import MutableSequence
+except ImportError:  # Python 2
+    from collections import MutableSequence
+
+from djcopybook.fixedwidth.converters import (  # noqa F401
+    OVERPUNCH_DIGITS, OVERPUNCH_NEGATIVE, OVERPUNCH_SIGNS, float_padding, implied_decimal_padding, int_padding,
+    is_blank_string, str_padding, to_float, to_implied_decimal, to_integer, to_overpunch_decimal, to_scaled_integer,
+    to_signed_implied_decimal, to_string,
+)
+
 
 class NOT_PROVIDED(object):
     pass
@@ -11,40 +27,109 @@ class FieldLengthError(Exception):
     pass
 
 
-def str_padding(length, val):
-    """Formats value giving it a right space padding up to a total length of 'length'"""
-    return '{0:<{fill}}'.format(val, fill=length)
+# Fixed width date format directives, in datetime argument order
+DATE_DIRECTIVE_WIDTHS = (('%Y', 4), ('%m', 2), ('%d', 2), ('%H', 2), ('%M', 2), ('%S', 2))
+
+
+def get_date_format_layout(date_format):
+    """
+    Where each directive of a date format made only of fixed width
+    directives and single character separators sits in a formatted value.
+    Returns ({directive: (start, end)}, [(position, separator)], width), or
+    None for other formats.
+    """
+    widths = dict(DATE_DIRECTIVE_WIDTHS)
+    slices = {}
+    separators = []
+    pos = 0
+    for token in re.findall(r'%.|[^%]', date_format):
+        if token in widths and token not in slices:
+            slices[token] = (pos, pos + widths[token])
+            pos += widths[token]
+        elif token.startswith('%'):
+            return None
+        else:
+            separators.append((pos, token))
+            pos += 1
+    return slices, separators, pos
+
+
+def compile_date_parser(date_format):
+    """
+    A parser that slices the digits of a date in ``date_format`` straight
+    into a datetime, or None if the format isn't fixed width. The parser
+    returns None for any value that doesn't fit the format exactly, which
+    is left to strptime.
+    """
+    layout = get_date_format_layout(date_format)
+    parts = layout and _get_datetime_parts(layout[0])
+    if not parts:
+        return None
+    _, separators, width = layout
+    get_digits = operator.itemgetter(*[slice(start, end) for start, end in parts])
+    make_datetime = _make_date if len(parts) == 3 else _make_datetime
+    get_separators = operator.itemgetter(*[pos for pos, _ in separators] or [slice(0)])
+    expected = get_separators(_fill_separators(separators, width))
+
+    def parse(val):
+        if len(val) != width or get_separators(val) != expected:
+            return None
+        digits = get_digits(val)
+        if not ''.join(digits).isdigit():
+            return None
+        return make_datetime(digits)
+    return parse
+
+
+def _fill_separators(separators, width):
+    template = [' '] * width
+    for pos, separator in separators:
+        template[pos] = separator
+    return ''.join(template)
 
 
-def int_padding(length, val, direction=">"):
-    """Formats value giving it left zeros padding up to a total length of 'length'"""
-    return '{0:0{direction}{fill}}'.format(val, direction=direction, fill=length)
+def _make_date(digits):
+    year, month, day = digits
+    return datetime.datetime(int(year), int(month), int(day))
 
 
-def float_padding(length, val, decimals=2):
-    """Pads zeros to left and right to assure proper length and precision"""
-    return '{0:0>{fill}.{precision}f}'.format(float(val), fill=length, precision=decimals)
+def _make_datetime(digits):
+    return datetime.datetime(*[int(part) for part in digits])
 
 
-def implied_decimal_padding(length, val, decimals=2):
+def _get_datetime_parts(slices):
     """
-    Pads zeros to left and right to assure proper length and precision
-    If decimals are present, we add 1 to the fill so the length is
-    correct after stripping out the decimal.
+    The slices of the datetime arguments, in order. The directives have to
+    be the leading arguments of datetime and include at least a full date.
     """
-    fill = length + 1 if decimals else length
-    padded_amount = '{0:0>{fill}.{precision}f}'.format(float(val), fill=fill, precision=decimals)
-    return padded_amount.replace(".", "")
+    directives = [directive for directive, _ in DATE_DIRECTIVE_WIDTHS]
+    present = [directive for directive in directives if directive in slices]
+    if len(present) < 3 or present != directives[:len(present)]:
+        return None
+    return [slices[directive] for directive in present]
+
+
+def to_bytes(val):
+    """Text standing in for raw bytes holds one latin-1 character per byte."""
+    if isinstance(val, six.text_type):
+        return val.encode('latin-1')
+    return bytes(val)
 
 
-def is_blank_string(val):
-    return isinstance(val, six.string_types) and val.strip() == ''
+def join_bytes(values):
+    try:
+        return b''.join(values)
+    except TypeError:
+        return b''.join(to_bytes(val) for val in values)
 
 
 class FixedWidthField(object):
     attname = ''
-    auto_truncate = ''
+    storage_key = ''
     creation_counter = 0
+    # Binary fields convert raw bytes. Records hand them their slice encoded
+    # back with the record's codepage, and take bytes back from to_record.
+    binary = False
 
     def __init__(self, length, default=NOT_PROVIDED):
         self.length = length
@@ -56,12 +141,23 @@ class FixedWidthField(object):
 
     def __get__(self, instance, txpe):
         try:
-            return getattr(instance, self._get_instance_field())
+            return getattr(instance, self.storage_key)
         except AttributeError:
-            return self.get_default()
+            if getattr(instance, '_raw', None) is None:
+                return self.get_default()
+            return instance._codec.decode_field(instance, self)
 
     def __set__(self, instance, val):
-        setattr(instance, self._get_instance_field(), self.to_python(val))
+        setattr(instance, self.storage_key, self.to_python(val))
+
+    def set_attname(self, attname):
+        """
+        Called once the field's attribute name on a Record is known. Also
+        works out where record instances keep this field's value, so the
+        descriptor doesn't have to build that name on every access.
+        """
+        self.attname = attname
+        self.storage_key = self._get_instance_field()
 
     def _get_instance_field(self):
         return "{attname}_{creation_counter}".format(**self.__dict__)
@@ -76,18 +172,31 @@ class FixedWidthField(object):
             return self.default
 
     def to_python(self, val):
-        if val is None:
-            return val
-        return str(val).rstrip()
+        return to_string(val)
 
     def to_record(self, val):
         if val is None:
             val = ''
         return str_padding(self.length, val)
 
-    def get_record_value(self, val):
+    def decode_many(self, values):
+        """
+        Converts a whole column of raw values at once. Fields that can do
+        better than one to_python call per value override this.
+        """
+        return [self.to_python(val) for val in values]
+
+    def encode_many(self, values):
+        """
+        The to_record value of a whole column of python values, as if each
+        had been set on a record first.
+        """
+        to_python, to_record = self.to_python, self.to_record
+        return [to_record(to_python(val)) for val in values]
+
+    def get_record_value(self, val, auto_truncate=False):
         record_val = self.to_record(val)
-        if self.auto_truncate:
+        if auto_truncate:
             record_val = record_val[:self.length]
         self._check_record_length(record_val)
         return record_val
@@ -99,7 +208,11 @@ class FixedWidthField(object):
 
 
 class StringField(FixedWidthField):
-    pass
+
+    def encode_many(self, values):
+        pad = '{{0:<{}}}'.format(self.length).format
+        to_python, to_record = self.to_python, self.to_record
+        return [pad(val.rstrip()) if type(val) is str else to_record(to_python(val)) for val in values]
 
 
 class BooleanField(StringField):
@@ -107,6 +220,9 @@ class BooleanField(StringField):
     def __init__(self, default=False):
         super(BooleanField, self).__init__(length=1, default=default)
 
+    def encode_many(self, values):
+        return super(StringField, self).encode_many(values)
+
     def to_python(self, val):
         if val == 'Y':
             return True
@@ -163,6 +279,11 @@ class NewLineField(FixedWidthField):
             return val
         return str(val)
 
+    def to_record(self, val):
+        if val == '\n':
+            return val
+        return super(NewLineField, self).to_record(val)
+
 
 class PostalCodeField(FixedWidthField):
 
@@ -182,15 +303,18 @@ class PostalCodeField(FixedWidthField):
 class IntegerField(FixedWidthField):
 
     def to_python(self, val):
-        if val is None or is_blank_string(val):
-            return None
-        return int(val)
+        return to_integer(val)
 
     def to_record(self, val):
         if val is None:
             val = 0
         return int_padding(self.length, val)
 
+    def encode_many(self, values):
+        pad = '{{0:0>{}}}'.format(self.length).format
+        to_python, to_record = self.to_python, self.to_record
+        return [pad(val) if type(val) is int else to_record(to_python(val)) for val in values]
+
 
 class DecimalField(FixedWidthField):
 
@@ -199,9 +323,7 @@ class DecimalField(FixedWidthField):
         super(DecimalField, self).__init__(length, default)
 
     def to_python(self, val):
-        if val is None or is_blank_string(val):
-            return None
-        return float(val)
+        return to_float(val)
 
     def to_record(self, val):
         if val is None:
@@ -222,14 +344,7 @@ class ImpliedDecimalField(DecimalField):
         super(ImpliedDecimalField, self).__init__(length, default, decimals=decimals)
 
     def to_python(self, val):
-        if val is None or is_blank_string(val):
-            return None
-        elif not isinstance(val, six.string_types):
-            return Decimal(str(val))
-
-        d = val[-self.decimals:] if self.decimals else "0"
-        n = "{}.{}".format(val[:self.length - self.decimals], d)
-        return Decimal(n)
+        return to_implied_decimal(val, self.length, self.decimals)
 
     def to_record(self, val):
         if val is None:
@@ -245,18 +360,7 @@ class SignedImpliedDecimalField(ImpliedDecimalField):
     """
 
     def to_python(self, val):
-        if val is None or is_blank_string(val) or self.is_blank_signed_string(val):
-            return None
-        elif not isinstance(val, six.string_types):
-            return Decimal(str(val))
-
-        sign = val[-1]
-        value = val[:-1]
-        val_length = self.length - self.decimals - 1  # remove decimals and the sign byte
-
-        d = value[-self.decimals:] if self.decimals else "0"
-        n = "{}{}.{}".format(sign, value[:val_length], d)
-        return Decimal(n)
+        return to_signed_implied_decimal(val, self.length, self.decimals)
 
     def is_blank_signed_string(self, val):
         return is_blank_string(str(val).rstrip("+"))
@@ -270,21 +374,202 @@ class SignedImpliedDecimalField(ImpliedDecimalField):
         return padded + sign
 
 
-class DateTimeField(FixedWidthField):
+class OverpunchDecimalField(ImpliedDecimalField):
+    """
+    Signed zoned decimal with implied decimal point, as written by COBOL
+    for PIC S9 DISPLAY. The sign is punched over the last digit: '{' and
+    A-I are +0 to +9, '}' and J-R are -0 to -9. A plain last digit reads
+    as positive. Length is total length of field including decimals.
+    """
 
-    def __init__(self, length, default=NOT_PROVIDED, format="%Y-%m-%d"):
-        self.format = format
-        super(DateTimeField, self).__init__(length, default)
+    def __init__(self, length, default=NOT_PROVIDED, decimals=0):
+        super(OverpunchDecimalField, self).__init__(length, default, decimals=decimals)
+        self._exponent = 'E-{}'.format(decimals)
 
     def to_python(self, val):
-        value_dict = {
+        return to_overpunch_decimal(val, self._exponent)
+
+    def decode_many(self, values):
+        """
+        Resolves the last digits of a whole column with one str.translate
+        call. Columns with blanks or anything else that isn't a plain
+        overpunch number go through to_python one value at a time.
+        """
+        values = list(values)
+        size, exponent = self.length, self._exponent
+        try:
+            digits = u''.join(val[:-1] for val in values)
+            last_digits = u''.join(val[-1:] for val in values).translate(OVERPUNCH_DIGITS)
+        except TypeError:
+            digits = last_digits = u''
+        if not (last_digits.isdigit() and (size == 1 or digits.isdigit()) and all(len(val) == size for val in values)):
+            return super(OverpunchDecimalField, self).decode_many(values)
+        return [
+            Decimal(('-' if val[-1] in OVERPUNCH_NEGATIVE else '') + val[:-1] + last + exponent)
+            for val, last in zip(values, last_digits)
+        ]
+
+    def to_record(self, val):
+        if val is None:
+            val = 0
+        val = Decimal(str(val))
+        padded = implied_decimal_padding(self.length, abs(val), decimals=self.decimals)
+        return padded[:-1] + OVERPUNCH_SIGNS[val < 0][padded[-1]]
+
+
+class PackedDecimalField(FixedWidthField):
+    """
+    COBOL COMP-3 packed decimal. Each byte holds two decimal digits, except
+    the last which holds one digit and the sign (C or F positive, D
+    negative). Length is in bytes, so a field holds length * 2 - 1 digits.
+
+    Fields that are all spaces or all low values decode to None.
+    """
+    binary = True
+
+    def __init__(self, length, default=NOT_PROVIDED, decimals=0, signed=True):
+        self.decimals = decimals
+        self.signed = signed
+        self._exponent = 'E-{}'.format(decimals)
+        super(PackedDecimalField, self).__init__(length, default)
+
+    def to_python(self, val):
+        if val is None or isinstance(val, Decimal):
+            return val
+        if isinstance(val, six.integer_types + (float,)):
+            return Decimal(str(val))
+        return self._unpack(binascii.hexlify(to_bytes(val)).decode('ascii'))
+
+    def _unpack(self, nibbles):
+        sign, digits = nibbles[-1], nibbles[:-1]
+        if sign in 'abcdef' and digits.isdigit():
+            return Decimal(('-' if sign in 'bd' else '') + digits + self._exponent)
+        if nibbles.strip('0') == '' or nibbles.replace('40', '') == '' or nibbles.replace('20', '') == '':
+            return None
+        raise ValueError("'{}' is not a valid packed decimal.".format(nibbles))
+
+    def decode_many(self, values):
+        """
+        Unpacks a column of packed decimals with one hexlify call.
+        """
+        nibbles = binascii.hexlify(join_bytes(values)).decode('ascii')
+        size = self.length * 2
+        return [self._unpack(nibbles[pos:pos + size]) for pos in range(0, len(nibbles), size)]
+
+    def to_record(self, val):
+        if val is None:
+            val = 0
+        scaled = int(Decimal(str(val)).scaleb(self.decimals).to_integral_value())
+        sign = 'f' if not self.signed else 'd' if scaled < 0 else 'c'
+        nibbles = int_padding(self.length * 2 - 1, abs(scaled)) + sign
+        if len(nibbles) % 2:
+            nibbles = '0' + nibbles
+        return binascii.unhexlify(nibbles)
+
+
+class BinaryIntegerField(FixedWidthField):
+    """
+    COBOL COMP, COMP-4 and COMP-5 binary integers, big endian. Length is in
+    bytes. With decimals the value is scaled into a Decimal, like
+    PIC S9(5)V99 COMP.
+    """
+    binary = True
+    struct_formats = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}
+
+    def __init__(self, length, default=NOT_PROVIDED, decimals=0, signed=True):
+        self.decimals = decimals
+        self.signed = signed
+        code = self.struct_formats.get(length)
+        if code and not signed:
+            code = code.upper()
+        self.struct_code = code
+        super(BinaryIntegerField, self).__init__(length, default)
+
+    def to_python(self, val):
+        if val is None:
+            return val
+        if isinstance(val, (six.binary_type, six.text_type, bytearray, memoryview)):
+            return self._scale(self._unpack(to_bytes(val)))
+        if self.decimals:
+            return Decimal(str(val))
+        return int(val)
+
+    def _unpack(self, val):
+        if self.struct_code:
+            return struct.unpack('>' + self.struct_code, val)[0]
+        number = int(binascii.hexlify(val), 16) if val else 0
+        if self.signed and number >= 1 << (len(val) * 8 - 1):
+            number -= 1 << (len(val) * 8)
+        return number
+
+    def _scale(self, number):
+        if self.decimals:
+            return Decimal(number).scaleb(-self.decimals)
+        return number
+
+    def decode_many(self, values):
+        """
+        Unpacks a column of binary integers with one struct call when the
+        length is 1, 2, 4 or 8 bytes.
+        """
+        if not self.struct_code:
+            return [self.to_python(val) for val in values]
+        data = join_bytes(values)
+        numbers = struct.unpack('>{}{}'.format(len(data) // self.length, self.struct_code), data)
+        if self.decimals:
+            return [self._scale(number) for number in numbers]
+        return list(numbers)
+
+    def to_record(self, val):
+        if val is None:
+            val = 0
+        number = int(Decimal(str(val)).scaleb(self.decimals).to_integral_value())
+        limit = 1 << (self.length * 8 - (1 if self.signed else 0))
+        if not (-limit if self.signed else 0) <= number < limit:
+            err = "'{}' value {} doesn't fit in {} bytes.".format(self.attname, val, self.length)
+            raise FieldLengthError(err)
+        if number < 0:
+            number += 1 << (self.length * 8)
+        return binascii.unhexlify('{:0{fill}x}'.format(number, fill=self.length * 2))
+
+
+class DateTimeField(FixedWidthField):
+    # values already of this type need no to_python before to_record
+    python_type = datetime.datetime
+
+    def __init__(self, length, default=NOT_PROVIDED, format="%Y-%m-%d", cache_size=0):
+        """
+        Fixed width formats like %Y%m%d are parsed by slicing rather than
+        strptime. With a ``cache_size`` up to that many parsed strings are
+        remembered, which pays off on columns of repeated dates.
+        """
+        self.format = format
+        self.cache_size = cache_size
+        self._cache = {}
+        self._parse = compile_date_parser(format)
+        self._converters = {
             type(None): lambda v: None,
             str: self._format_string_date,
             six.text_type: self._format_string_date,
             datetime.datetime: lambda v: v,
             datetime.date: lambda v: datetime.datetime(v.year, v.month, v.day),
         }
-        return value_dict[type(val)](val)
+        super(DateTimeField, self).__init__(length, default)
+
+    def to_python(self, val):
+        converter = self._converters.get(type(val))
+        if converter is None:
+            converter = self._get_subclass_converter(val)
+        return converter(val)
+
+    def _get_subclass_converter(self, val):
+        """
+        Subclasses, like pandas' Timestamp, convert like the type they extend.
+        """
+        for base in (datetime.datetime, datetime.date, six.text_type, str):
+            if isinstance(val, base):
+                return self._converters[base]
+        raise KeyError(type(val))
 
     def to_record(self, val):  # noqa C901
         if not val:
@@ -296,11 +581,42 @@ class DateTimeField(FixedWidthField):
                 return self.get_default().strftime(self.format)
             raise
 
+    def encode_many(self, values):
+        """
+        Columns of dates repeat a lot, so each distinct date is only
+        formatted once.
+        """
+        to_python, to_record, python_type = self.to_python, self.to_record, self.python_type
+        formatted = {}
+        encoded = []
+        for val in values:
+            if type(val) is not python_type:
+                encoded.append(to_record(to_python(val)))
+            elif val in formatted:
+                encoded.append(formatted[val])
+            else:
+                encoded.append(formatted.setdefault(val, to_record(val)))
+        return encoded
+
     def _format_string_date(self, val):
-        return None if val.strip() == '' else datetime.datetime.strptime(val, self.format)
+        cache = self._cache
+        if val in cache:
+            return cache[val]
+        result = self._parse(val) if self._parse else None
+        if result is None and val.strip() != '':
+            result = datetime.datetime.strptime(val, self.format)
+        if self.cache_size:
+            self._remember(val, result)
+        return result
+
+    def _remember(self, val, result):
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[val] = result
 
 
 class DateField(DateTimeField):
+    python_type = datetime.date
 
     def to_python(self, val):
         result = super(DateField, self).to_python(val)
@@ -361,6 +677,99 @@ class FragmentField(FixedWidthField):
         return val.to_record()
 
 
+class RedefinesField(FixedWidthField):
+    """
+    Several layouts over the same span of a record, like COBOL's REDEFINES.
+    Decoding a record only keeps the span's raw string. The variant that
+    applies is decoded from it the first time the field is read.
+
+    parameters:
+      - records: the Record class of each variant, keyed by whatever
+        picks it. A list of Record classes is keyed by the classes.
+      - discriminator: name of another field on the record whose value
+        is the key of the variant to use
+      - selector: a function given the record that returns the key of
+        the variant to use, for anything a single field can't decide
+
+    Without either the first variant is used. When no variant matches the
+    field reads as the span's raw string. The span is as long as the
+    longest variant; shorter ones are padded with spaces.
+
+    class Policy(Record):
+      record_type = fields.StringField(length=1)
+      detail = fields.RedefinesField({'A': AutoDetail, 'H': HomeDetail}, discriminator='record_type')
+
+    """
+
+    def __init__(self, records, discriminator=None, selector=None, default=NOT_PROVIDED):
+        if discriminator and selector:
+            raise ValueError("RedefinesField takes a discriminator or a selector, not both.")
+        if not isinstance(records, dict):
+            records = OrderedDict((record, record) for record in records)
+        self.records = records
+        self.discriminator = discriminator
+        self.selector = selector
+        self._python_types = six.string_types + (dict, type(None)) + tuple(records.values())
+        super(RedefinesField, self).__init__(max(len(record) for record in records.values()), default)
+
+    def __get__(self, instance, txpe):
+        value = super(RedefinesField, self).__get__(instance, txpe)
+        if instance is None or not isinstance(value, six.string_types + (dict,)):
+            return value
+        record_class = self.get_record_class(instance)
+        if record_class is None:
+            return value
+        value = self._decode_variant(record_class, value)
+        setattr(instance, self.storage_key, value)
+        return value
+
+    def get_record_class(self, instance):
+        """
+        The Record class of the variant that applies to ``instance``, or
+        None when there isn't one.
+        """
+        if self.discriminator:
+            return self.records.get(getattr(instance, self.discriminator))
+        if self.selector:
+            return self.records.get(self.selector(instance))
+        return next(iter(self.records.values()))
+
+    def view(self, instance, key):
+        """
+        The span of ``instance`` read as the variant ``key``, whichever
+        variant the field itself uses.
+        """
+        value = super(RedefinesField, self).__get__(instance, type(instance))
+        if isinstance(value, dict):
+            value = self.__get__(instance, type(instance))
+        return self._decode_variant(self.records[key], self.to_record(value))
+
+    @staticmethod
+    def _decode_variant(record_class, value):
+        if isinstance(value, dict):
+            return record_class(**value)
+        return record_class.from_record(value[:len(record_class)])
+
+    def to_python(self, val):
+        """
+        Strings are kept raw until the field is read, and dicts until the
+        variant to build from them is known.
+        """
+        if isinstance(val, self._python_types):
+            return val
+        msg = "Redefines field must be a string, dict or an instance of one of its records."
+        raise TypeError(msg)
+
+    def to_record(self, val):
+        if val is None:
+            val = ''
+        elif isinstance(val, dict):
+            raise TypeError("'{}' can't pick a layout for a dict without its record.".format(self.attname))
+        elif not isinstance(val, six.string_types):
+            val = val.to_record()
+        return str_padding(self.length, val)
+
+
 class ListField(FixedWidthField):
     """
     ListField allows you to have a field made up of a number of
@@ -369,20 +778,30 @@ class ListField(FixedWidthField):
     parameters:
       - record: which Record the field is made up of
       - length: how many times that record occurs
+      - lazy: when True, a fixed width string becomes a LazyRecordList
+        that only parses an occurrence the first time it's accessed
+      - depending_on: name of an earlier field of the record holding how
+        many times the record occurs in each row, like OCCURS DEPENDING
+        ON. ``length`` is then the most it can occur. Only the occurrences
+        counted take up space, and the count is written from the length
+        of the list.
 
     """
 
-    def __init__(self, record, length=1):
+    def __init__(self, record, length=1, lazy=False, depending_on=None):
         self.record_class = record
+        self.record_length = len(record)
+        self.lazy = lazy
+        self.depending_on = depending_on
         super(ListField, self).__init__(length)
 
     def _get_records_from_string(self, val):
-        records = []
-        record_len = len(self.record_class)
-        for _ in range(self.length):
-            records.append(self.record_class.from_record(val[:record_len]))
-            val = val[record_len:]
-        return records
+        size = self.record_length
+        count = len(val) // size if self.depending_on else self.length
+        if self.lazy:
+            return LazyRecordList(self.record_class, val, count)
+        from_record = self.record_class.from_record
+        return [from_record(val[pos:pos + size]) for pos in range(0, size * count, size)]
 
     def to_python(self, val):
         value_dict = {
@@ -390,6 +809,7 @@ class ListField(FixedWidthField):
             six.text_type: self._get_records_from_string,
             list: self._sequence_to_python,
             tuple: self._sequence_to_python,
+            LazyRecordList: lambda v: v,
         }
         return value_dict.get(type(val))(val)
 
@@ -409,12 +829,14 @@ class ListField(FixedWidthField):
         We receive a list of Record classes and must make sure
         we have a complete record we're giving back.
         """
-        while len(val) < self.length:
+        while len(val) < self.length and not self.depending_on:
             val.append(self.record_class())
+        if isinstance(val, LazyRecordList):
+            return val.to_record()
         return ''.join([v.to_record() for v in val])
 
     def _check_record_length(self, record_val):
-        max_record_length = len(self.record_class)
+        max_record_length = self.record_length
         record_length = len(record_val)
         if record_length > (self.length * max_record_length):
             record_count = record_length // max_record_length
@@ -422,3 +844,58 @@ class ListField(FixedWidthField):
                 cnt=record_count, **self.__dict__
             )
             raise FieldLengthError(msg)
+
+
+class LazyRecordList(MutableSequence):
+    """
+    A list of records backed by the fixed width string of a ListField.
+    Occurrences that haven't been accessed are kept as offsets into that
+    string and are only parsed when first read. to_record writes untouched
+    occurrences straight from the original string.
+    """
+
+    def __init__(self, record_class, raw, count):
+        self.record_class = record_class
+        self.raw = raw
+        self.record_length = len(record_class)
+        self._items = list(range(0, self.record_length * count, self.record_length))
+
+    def _decode(self, index):
+        item = self._items[index]
+        if isinstance(item, six.integer_types):
+            item = self._items[index] = self.record_class.from_record(self.raw[item:item + self.record_length])
+        return item
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(len(self._items)))]
+        return self._decode(index)
+
+    def __setitem__(self, index, value):
+        self._items[index] = value
+
+    def __delitem__(self, index):
+        del self._items[index]
+
+    def __len__(self):
+        return len(self._items)
+
+    def insert(self, index, value):
+        self._items.insert(index, value)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "<LazyRecordList of {} {}>".format(len(self), self.record_class.__name__)
+
+    def to_record(self):
+        return ''.join([self._item_record(item) for item in self._items])
+
+    def _item_record(self, item):
+        if isinstance(item, six.integer_types):
+            return self.raw[item:item + self.record_length]
+        return item.to_record()
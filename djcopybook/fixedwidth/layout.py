@@ -0,0 +1,65 @@
+from collections import namedtuple
+
+from djcopybook.fixedwidth import fields
+
+
+class FieldLayout(namedtuple('FieldLayout', 'name offset length field')):
+    """
+    Where one field sits in a fixed width record: its name, the offset it
+    starts at, how many characters it takes up and the field itself.
+    """
+    __slots__ = ()
+
+    @property
+    def end(self):
+        return self.offset + self.length
+
+
+def get_field_length(f):
+    """
+    Normally field length is the length attribute of a FixedWidthField
+    class. However, on ListField classes the length attribute represents
+    how many times the record is repeated, so we need the total.
+    """
+    if isinstance(f, fields.ListField):
+        return f.length * len(f.record_class)
+    return f.length
+
+
+def build_layout(base_fields):
+    """
+    Works out the offset and length of every field in 'base_fields'.
+    """
+    layout = []
+    offset = 0
+    for name, field in base_fields.items():
+        length = get_field_length(field)
+        layout.append(FieldLayout(name, offset, length, field))
+        offset += length
+    return tuple(layout)
+
+
+def flatten_layout(layout, prefix='', offset=0):
+    """
+    Yields a FieldLayout, with an absolute offset, for every field that
+    holds a value, descending into fragments and each occurrence of a
+    list. Nested names are dotted, e.g. 'phones[1].area_code'.
+    """
+    for entry in layout:
+        name = prefix + entry.name
+        start = offset + entry.offset
+        for nested in _flatten_entry(entry, name, start):
+            yield nested
+
+
+def _flatten_entry(entry, name, start):
+    field = entry.field
+    if isinstance(field, fields.ListField):
+        size = field.record_length
+        occurrences = [('{}[{}].'.format(name, i), start + i * size) for i in range(field.length)]
+    elif isinstance(field, fields.FragmentField):
+        occurrences = [(name + '.', start)]
+    else:
+        return [FieldLayout(name, start, entry.length, field)]
+    nested_layout = field.record_class._layout
+    return [nested for prefix, offset in occurrences for nested in flatten_layout(nested_layout, prefix, offset)]
@@ -0,0 +1,86 @@
+import mmap
+import multiprocessing
+import os
+
+from djcopybook.fixedwidth import streams
+
+# Each worker process maps the file once and keeps it here.
+_worker_file = {}
+
+
+def parse_file_parallel(record_class, path, workers=None, func=None, ordered=True, newline=None,
+                        encoding=None, chunk_records=None):
+    """
+    Parses a fixed width file across a pool of worker processes.
+
+    Every record is ``len(record_class)`` bytes plus the same separator,
+    so the file is split into aligned ranges of records by arithmetic
+    alone. Each worker memory-maps the file and parses the ranges it is
+    handed.
+
+    ``func`` is called with every record inside the worker, and only its
+    results are sent back; results of None are dropped, so it can act as
+    a filter as well as a map. Without it the records themselves are sent
+    back. Both ``record_class`` and ``func`` must be importable at module
+    level so they can be pickled.
+
+    Results are yielded in file order, or as each range finishes when
+    ``ordered`` is False. Records are decoded with the class's own
+    ``encoding`` unless another one is given.
+    """
+    streams.check_fixed_length(record_class, 'parse_file_parallel')
+    record_length = len(record_class)
+    encoding = encoding or record_class.encoding
+    newline, count = _measure_file(path, record_length, newline, encoding)
+    if not count:
+        return
+
+    workers = workers or multiprocessing.cpu_count()
+    chunk_records = chunk_records or max(1, -(-count // (workers * 4)))
+    layout = (record_class, record_length, newline, encoding, func)
+    tasks = [(start, min(start + chunk_records, count)) for start in range(0, count, chunk_records)]
+
+    pool = multiprocessing.Pool(workers, initializer=_open_worker_file, initargs=(path, layout))
+    try:
+        imap = pool.imap if ordered else pool.imap_unordered
+        for results in imap(_parse_range, tasks):
+            for result in results:
+                yield result
+        pool.close()
+        pool.join()
+    finally:
+        pool.terminate()
+
+
+def _measure_file(path, record_length, newline, encoding):
+    with open(path, 'rb') as f:
+        head = f.read(record_length + 2)
+    return streams.count_records(os.path.getsize(path), head, record_length, newline, encoding)
+
+
+def _open_worker_file(path, layout):
+    with open(path, 'rb') as f:
+        _worker_file['mmap'] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    _worker_file['layout'] = layout
+
+
+def _parse_range(task):
+    record_class, record_length, newline, encoding, func = _worker_file['layout']
+    from_record = streams.get_decoder(record_class, encoding)
+    data = _worker_file['mmap']
+    separator = streams.encode_separator(newline, encoding)
+    stride = record_length + len(separator)
+
+    results = []
+    for index in range(*task):
+        pos = index * stride
+        raw = data[pos:pos + stride]
+        if separator and raw[record_length:] not in (separator, b''):
+            raise ValueError("Expected {!r} after the record ending at position {}.".format(
+                newline, pos + record_length
+            ))
+        record = from_record(raw[:record_length])
+        result = func(record) if func else record
+        if result is not None:
+            results.append(result)
+    return results
@@ -0,0 +1,514 @@
+import io
+import mmap
+import os
+import six
+
+from djcopybook.fixedwidth import fields
+from djcopybook.fixedwidth.codec import decode_bytes
+from djcopybook.fixedwidth.layout import flatten_layout
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_BATCH_SIZE = 1000
+LINE_BREAKS = ('\r\n', '\n', '\r')
+
+
+def iter_records(record_class, fileobj, newline=None, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None, errors=None):
+    """
+    Lazily yields ``record_class`` instances read from ``fileobj``.
+
+    Binary streams are decoded with ``encoding``, which defaults to the
+    record class's own. Single byte codepages like latin-1 or cp037 map
+    every byte to exactly one character so record lengths stay the same
+    as on disk.
+
+    With a ValidationReport as ``errors`` rows that can't be decoded,
+    including rows of the wrong length, are added to the report and
+    skipped instead of raising. Lazy records have every field checked.
+    """
+    if errors is not None:
+        return _iter_checked_records(record_class, fileobj, newline, chunk_size, encoding, errors)
+    return _iter_records(record_class, fileobj, newline, chunk_size, encoding)
+
+
+def _iter_records(record_class, fileobj, newline, chunk_size, encoding):
+    from_record = get_decoder(record_class, encoding)
+    encoding = encoding or record_class.encoding
+    measure = get_measure(record_class, encoding)
+    if measure is None:
+        raws = split_records(fileobj, len(record_class), newline, chunk_size, encoding)
+    else:
+        raws = split_variable_records(fileobj, measure, len(record_class), newline, chunk_size, encoding)
+    for raw in raws:
+        yield from_record(raw)
+
+
+def _iter_checked_records(record_class, fileobj, newline, chunk_size, encoding, report):
+    codec = record_class._codec
+    encoding = encoding or record_class.encoding
+    measure = get_measure(record_class, encoding)
+    for row, raw in enumerate(split_rows(fileobj, len(record_class), newline, chunk_size, measure, encoding)):
+        report.rows += 1
+        record, problems = _decode_row(codec, raw, encoding)
+        if problems:
+            report.add_row(row, problems)
+        else:
+            yield record
+
+
+def _decode_row(codec, raw, encoding):
+    """
+    Decodes one raw record, only working out what's wrong with it field by
+    field when that fails. Lazy records are checked up front because they
+    don't convert anything while decoding.
+    """
+    try:
+        raw = raw if isinstance(raw, six.text_type) else decode_bytes(raw, encoding)
+        problems = codec.find_errors(raw) if codec.lazy else None
+        return (None, problems) if problems else (codec.record_class.from_record(raw), None)
+    except Exception as e:
+        # find_errors only checks fields, so it can come back empty
+        problems = codec.find_errors(raw) if isinstance(raw, six.text_type) else None
+        return None, problems or [(None, raw, e)]
+
+
+def write_many(record_class, records, fileobj, newline=None, encoding=None, batch_size=DEFAULT_BATCH_SIZE,
+               errors=None):
+    """
+    Encodes ``records`` (instances or dicts of field values) into
+    ``fileobj``, joining ``batch_size`` records into a single write.
+    Returns how many records were written.
+
+    Records are followed by ``newline``, a line break by default, or by
+    nothing when the layout already ends in a NewLineField.
+
+    With a ValidationReport as ``errors`` records that can't be encoded
+    are added to the report and left out instead of raising.
+    """
+    newline = _get_newline(record_class, newline)
+    encode = _get_encoder(fileobj, encoding or record_class.encoding)
+    to_record = _get_record_encoder(record_class, errors)
+    count = 0
+    batch = []
+    for row, record in enumerate(records):
+        record_val = to_record(row, record)
+        if record_val is None:
+            continue
+        batch.append(record_val)
+        batch.append(newline)
+        count += 1
+        if count % batch_size == 0:
+            fileobj.write(encode(''.join(batch)))
+            batch = []
+    if batch:
+        fileobj.write(encode(''.join(batch)))
+    return count
+
+
+def _get_newline(record_class, newline):
+    """
+    The given newline, or the one to write after records by default: none
+    when their last field, fragments included, is already a NewLineField.
+    """
+    if newline is not None:
+        return newline
+    entries = list(flatten_layout(record_class._layout))
+    return '' if entries and isinstance(entries[-1].field, fields.NewLineField) else '\n'
+
+
+def _get_record_encoder(record_class, report):
+    if report is None:
+        return lambda row, record: _encode_record(record_class, record)
+
+    def to_record(row, record):
+        report.rows += 1
+        try:
+            return _encode_record(record_class, record)
+        except Exception as e:
+            report.add_row(row, record_class._codec.find_encode_errors(record) or [(None, record, e)])
+    return to_record
+
+
+def _encode_record(record_class, record):
+    if isinstance(record, dict):
+        record = record_class(**record)
+    return record.to_record()
+
+
+def split_records(fileobj, record_length, newline=None, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None):
+    """
+    Cuts the text or bytes read from ``fileobj`` into raw records of
+    ``record_length`` characters, reading ``chunk_size`` at a time.
+
+    ``newline`` is the separator written after each record, or '' when
+    records are packed back to back. When it's None the separator is
+    detected from whatever follows the first record. In bytes line breaks
+    are looked for as ``encoding`` writes them, ASCII by default, so
+    EBCDIC files written by write_many split on their own newline.
+    """
+    buf = _read_at_least(fileobj, fileobj.read(chunk_size), record_length + 2, chunk_size)
+    if newline is None:
+        newline = detect_newline(buf, record_length, encoding)
+    newline = _as_type(newline, buf, encoding)
+
+    stride = record_length + len(newline)
+    offset = 0
+    while len(buf) >= stride:
+        pos = 0
+        for pos in range(0, len(buf) - stride + 1, stride):
+            _check_separator(buf, pos + record_length, newline, offset)
+            yield buf[pos:pos + record_length]
+        pos += stride
+        offset += pos
+        buf = _read_at_least(fileobj, buf[pos:], stride, chunk_size)
+
+    if _remaining_record(buf, record_length, offset, encoding):
+        yield buf
+
+
+def split_variable_records(fileobj, measure, max_length, newline=None, chunk_size=DEFAULT_CHUNK_SIZE, encoding=None):
+    """
+    Like split_records, for streams whose records aren't all the same
+    length. ``measure(buf, pos)`` returns the length of the record starting
+    at ``pos``. Unless the stream has ended, the buffer always holds at
+    least ``max_length`` characters plus a separator from ``pos`` on.
+    """
+    buf = _read_at_least(fileobj, fileobj.read(chunk_size), max_length + 2, chunk_size)
+    if newline is None:
+        newline = detect_newline(buf, measure(buf, 0), encoding) if _has_record(buf, 0, encoding) else ''
+    newline = _as_type(newline, buf, encoding)
+
+    window = max_length + len(newline)
+    pos = offset = 0
+    while True:
+        if len(buf) - pos < window:
+            offset += pos
+            buf, pos = _read_at_least(fileobj, buf[pos:], window, chunk_size), 0
+        if not _has_record(buf, pos, encoding):
+            break
+        end = pos + measure(buf, pos)
+        _check_variable_record(buf, pos, end, newline, offset)
+        yield buf[pos:end]
+        pos = end + len(newline)
+
+
+def split_rows(fileobj, record_length, newline=None, chunk_size=DEFAULT_CHUNK_SIZE, measure=None, encoding=None):
+    """
+    Like split_records, but a row of the wrong length doesn't stop the
+    stream. Whenever the separator isn't right after ``record_length``
+    characters, everything up to the next separator is yielded as one row
+    and reading carries on from there. Leftovers at the end of the stream
+    come out as a last row too.
+
+    For records that vary in length ``measure`` works like it does for
+    split_variable_records and ``record_length`` is the longest a record
+    can be. A row that can't be measured also runs to the next separator.
+    """
+    buf = _read_at_least(fileobj, fileobj.read(chunk_size), record_length + 2, chunk_size)
+    detected = _detect_row_separator(buf, record_length, measure, encoding) if newline is None else newline
+    newline = _as_type(detected, buf, encoding)
+    window = record_length + len(newline)
+    pos = 0
+    while True:
+        if len(buf) - pos < window:
+            buf, pos = _read_at_least(fileobj, buf[pos:], window, chunk_size), 0
+        if not _has_record(buf, pos, encoding):
+            break
+        end = _row_end(measure, buf, pos, record_length)
+        if end is None or not _is_separated(buf, end, newline):
+            buf, end = _find_row_end(fileobj, buf, pos, newline, chunk_size)
+        yield buf[pos:end]
+        pos = end + len(newline)
+
+
+def _row_end(measure, buf, pos, record_length):
+    if measure is None:
+        return pos + record_length
+    try:
+        return pos + measure(buf, pos)
+    except Exception:
+        return None
+
+
+def count_records(size, head, record_length, newline=None, encoding=None):
+    """
+    Works out the separator and how many records a file of ``size`` bytes
+    holds from its first bytes, ``head``. The last record may or may not
+    be followed by a separator.
+    """
+    if not size:
+        return newline or '', 0
+    if newline is None:
+        newline = detect_newline(head, record_length, encoding)
+
+    stride = record_length + len(newline)
+    count = (size + len(newline)) // stride
+    if size not in (count * stride, count * stride - len(newline)):
+        raise ValueError("File is {} bytes long, which isn't a whole number of {} byte records.".format(size, stride))
+    return newline, count
+
+
+def detect_newline(buf, record_length, encoding=None):
+    """
+    Returns the line break found right after the first record in ``buf``,
+    or '' if the records aren't separated. Line breaks in bytes are
+    looked for as ``encoding`` writes them.
+    """
+    following = buf[record_length:record_length + 2]
+    for line_break in LINE_BREAKS:
+        if following.startswith(_as_type(line_break, buf, encoding)):
+            return line_break
+    return ''
+
+
+def get_decoder(record_class, encoding=None):
+    """
+    A function building ``record_class`` instances from raw text or bytes.
+    Bytes are handed straight to from_record, which decodes them with the
+    class's codepage, unless a different ``encoding`` is asked for.
+    """
+    if encoding is None or encoding == record_class.encoding:
+        return record_class.from_record
+
+    def from_record(raw):
+        if not isinstance(raw, six.text_type):
+            raw = decode_bytes(raw, encoding)
+        return record_class.from_record(raw)
+    return from_record
+
+
+def get_measure(record_class, encoding=None):
+    """
+    A function giving the length of the ``record_class`` record at a
+    position of a buffer, for split_variable_records, or None when every
+    record is the same length.
+    """
+    codec = record_class._codec
+    if not codec.variable:
+        return None
+    return lambda buf, pos: codec.measure(buf, pos, encoding)
+
+
+def check_fixed_length(record_class, reader):
+    """
+    Raises a ValueError for record classes that vary in length, which
+    ``reader`` can't find records of by arithmetic alone.
+    """
+    if record_class._codec.variable:
+        raise ValueError("{} needs records of one length, but {} has lists whose length depends on a field.".format(
+            reader, record_class.__name__
+        ))
+
+
+def _get_encoder(fileobj, encoding):
+    if isinstance(fileobj, io.TextIOBase):
+        return six.text_type
+    if isinstance(fileobj, (io.RawIOBase, io.BufferedIOBase)) or 'b' in getattr(fileobj, 'mode', ''):
+        return lambda val: val.encode(encoding)
+    return six.text_type
+
+
+def _read_at_least(fileobj, buf, size, chunk_size):
+    while len(buf) < size:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        buf += chunk
+    return buf
+
+
+def encode_separator(newline, encoding):
+    """
+    The bytes ``newline`` is written as in ``encoding``, e.g. 0x25 for
+    '\\n' in cp037.
+    """
+    return _as_type(newline, b'', encoding)
+
+
+def _as_type(text, buf, encoding=None):
+    """
+    A separator in the type of ``buf``, encoded the way ``encoding`` writes
+    it for bytes. Python 2 strs are taken as text, like Python 3 strs.
+    """
+    if isinstance(buf, six.text_type) or (isinstance(text, six.binary_type) and six.PY3):
+        return text
+    return text.encode(encoding or 'ascii')
+
+
+def _check_separator(buf, pos, newline, offset):
+    if newline and buf[pos:pos + len(newline)] != newline:
+        raise ValueError("Expected {!r} after the record ending at position {}.".format(newline, offset + pos))
+
+
+def _has_record(buf, pos, encoding=None):
+    """
+    True unless all that's left from ``pos`` is nothing or a stray line break.
+    """
+    if len(buf) - pos > 2:
+        return True
+    return bool(buf[pos:].strip(_as_type('\r\n', buf, encoding)))
+
+
+def _check_variable_record(buf, pos, end, newline, offset):
+    if end > len(buf):
+        raise ValueError("Trailing data at position {} is {} characters long but the record is {}.".format(
+            offset + pos, len(buf) - pos, end - pos
+        ))
+    if end < len(buf):
+        _check_separator(buf, end, newline, offset)
+
+
+def _detect_row_separator(buf, record_length, measure=None, encoding=None):
+    """
+    Like detect_newline, falling back on the first line break in ``buf``
+    in case the first row is too short or too long. A line break past the
+    first record only counts when the row after it is followed by one too,
+    so that bytes inside packed records aren't taken for separators.
+    """
+    first_end = _row_end(measure, buf, 0, record_length) or record_length
+    newline = detect_newline(buf, first_end, encoding)
+    if newline:
+        return newline
+    for pos, _, line_break in sorted(_find_line_breaks(buf, encoding)):
+        separator = _as_type(line_break, buf, encoding)
+        next_end = _row_end(measure, buf, pos + len(separator), record_length)
+        if pos <= first_end or _is_separated(buf, next_end, separator):
+            return line_break
+    return ''
+
+
+def _find_line_breaks(buf, encoding):
+    """
+    Where in ``buf`` each kind of line break first appears, with its place
+    in LINE_BREAKS so that '\\r\\n' comes before the '\\r' it starts with.
+    """
+    for rank, line_break in enumerate(LINE_BREAKS):
+        pos = buf.find(_as_type(line_break, buf, encoding))
+        if pos != -1:
+            yield pos, rank, line_break
+
+
+def _is_separated(buf, end, newline):
+    if end is None:
+        return False
+    if end >= len(buf):
+        return end == len(buf)
+    return buf[end:end + len(newline)] == newline
+
+
+def _find_row_end(fileobj, buf, pos, newline, chunk_size):
+    """
+    Reads on until the next separator after ``pos``, or the end of the
+    stream. Returns the buffer and where the row ends in it.
+    """
+    start = pos
+    while True:
+        end = buf.find(newline, start) if newline else -1
+        if end != -1:
+            return buf, end
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            return buf, len(buf)
+        start = max(pos, len(buf) - len(newline) + 1)
+        buf += chunk
+
+
+def _remaining_record(buf, record_length, offset, encoding=None):
+    """
+    Whatever is left at the end of the stream must be one last record
+    with no separator, or nothing more than a stray line break.
+    """
+    if len(buf) == record_length:
+        return True
+    if buf.strip(_as_type('\r\n', buf, encoding)):
+        raise ValueError("Trailing data at position {} is {} characters long but records are {}.".format(
+            offset, len(buf), record_length
+        ))
+    return False
+
+
+def _view_of(data):
+    """
+    Slices of a memoryview don't copy the mapped file. Python 2 can't make
+    one of an mmap, which slices to str instead.
+    """
+    if six.PY2:
+        return data
+    return memoryview(data)
+
+
+class RecordFile(object):
+    """
+    Random access to the records of a fixed width file through a memory
+    map. Record N starts at N times the record length plus separator, so
+    only the records asked for are ever decoded.
+
+        with RecordFile(Person, 'people.dat') as people:
+            people[123456]
+            people[-10:]
+            for person in reversed(people):
+                ...
+
+    ``fileobj`` can be a path or a file opened in binary mode.
+    """
+
+    def __init__(self, record_class, fileobj, newline=None, encoding=None):
+        check_fixed_length(record_class, 'RecordFile')
+        self.record_class = record_class
+        self.record_length = len(record_class)
+        self.encoding = encoding or record_class.encoding
+        self._from_record = get_decoder(record_class, encoding)
+        self._file = open(fileobj, 'rb') if isinstance(fileobj, six.string_types) else None
+        fileno = (self._file or fileobj).fileno()
+
+        size = os.fstat(fileno).st_size
+        self._map = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) if size else None
+        self._view = _view_of(self._map if size else b'')
+        try:
+            head = bytes(self._view[:self.record_length + 2])
+            self.newline, self._count = count_records(size, head, self.record_length, newline, self.encoding)
+        except ValueError:
+            self.close()
+            raise
+        self._separator = encode_separator(self.newline, self.encoding)
+        self._stride = self.record_length + len(self._separator)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._decode(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("RecordFile index out of range")
+        return self._decode(index)
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._decode(index)
+
+    def __reversed__(self):
+        for index in reversed(range(self._count)):
+            yield self._decode(index)
+
+    def _decode(self, index):
+        pos = index * self._stride
+        end = pos + self.record_length
+        if self._separator and index < self._count - 1:
+            _check_separator(self._view, end, self._separator, 0)
+        return self._from_record(self._view[pos:end])
+
+    def close(self):
+        if isinstance(self._view, memoryview):
+            self._view.release()
+        if self._map is not None:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
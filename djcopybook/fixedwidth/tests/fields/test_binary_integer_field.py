@@ -0,0 +1,52 @@
+from decimal import Decimal
+from unittest import TestCase
+from djcopybook.fixedwidth import fields
+
+
+class BinaryIntegerFieldTests(TestCase):
+
+    def test_is_binary_field(self):
+        self.assertTrue(fields.BinaryIntegerField(length=4).binary)
+
+    def test_to_python_unpacks_big_endian_signed_value(self):
+        f = fields.BinaryIntegerField(length=4)
+        self.assertEqual(258, f.to_python(b"\x00\x00\x01\x02"))
+        self.assertEqual(-2, f.to_python(b"\xff\xff\xff\xfe"))
+
+    def test_to_python_unpacks_unsigned_value(self):
+        f = fields.BinaryIntegerField(length=2, signed=False)
+        self.assertEqual(65534, f.to_python(b"\xff\xfe"))
+
+    def test_to_python_unpacks_odd_lengths(self):
+        f = fields.BinaryIntegerField(length=3)
+        self.assertEqual(-1, f.to_python(b"\xff\xff\xff"))
+        self.assertEqual(65536, f.to_python(u"\x01\x00\x00"))
+
+    def test_to_python_scales_by_decimals(self):
+        f = fields.BinaryIntegerField(length=4, decimals=2)
+        self.assertEqual(Decimal("-1.25"), f.to_python(b"\xff\xff\xff\x83"))
+
+    def test_to_python_converts_numbers(self):
+        self.assertEqual(5, fields.BinaryIntegerField(length=2).to_python(5.0))
+        self.assertEqual(Decimal("1.5"), fields.BinaryIntegerField(length=2, decimals=1).to_python(1.5))
+
+    def test_to_record_packs_value(self):
+        self.assertEqual(b"\xff\xfe", fields.BinaryIntegerField(length=2).to_record(-2))
+        self.assertEqual(b"\x00\x00\x7d", fields.BinaryIntegerField(length=3, decimals=1).to_record(Decimal("12.5")))
+
+    def test_to_record_of_none_is_zero(self):
+        self.assertEqual(b"\x00\x00", fields.BinaryIntegerField(length=2).to_record(None))
+
+    def test_to_record_raises_field_length_error_when_value_does_not_fit(self):
+        with self.assertRaises(fields.FieldLengthError):
+            fields.BinaryIntegerField(length=1).to_record(128)
+        with self.assertRaises(fields.FieldLengthError):
+            fields.BinaryIntegerField(length=1, signed=False).to_record(-1)
+
+    def test_decode_many_unpacks_column(self):
+        f = fields.BinaryIntegerField(length=2)
+        self.assertEqual([1, -1, 256], f.decode_many([b"\x00\x01", b"\xff\xff", b"\x01\x00"]))
+
+    def test_decode_many_scales_by_decimals_and_handles_odd_lengths(self):
+        self.assertEqual([Decimal("0.1")], fields.BinaryIntegerField(length=2, decimals=1).decode_many([b"\x00\x01"]))
+        self.assertEqual([-1], fields.BinaryIntegerField(length=3).decode_many([b"\xff\xff\xff"]))
@@ -80,3 +80,17 @@ class DateFieldTests(unittest.TestCase):
 
         c = TestRecord()
         self.assertEqual(date(2000, 1, 1), c.field_one)
+
+    def test_to_python_returns_date_from_fast_parser_and_cache(self):
+        field = fields.DateField(length=10, format="%m/%d/%Y", cache_size=10)
+        self.assertEqual(date(2016, 3, 4), field.to_python("03/04/2016"))
+        self.assertEqual(date(2016, 3, 4), field.to_python("03/04/2016"))
+        self.assertEqual(None, field.to_python("          "))
+
+    def test_to_python_returns_date_when_given_datetime_subclass(self):
+        class Timestamp(datetime):
+            pass
+        field = fields.DateField(length=8, format="%Y%m%d")
+        python_val = field.to_python(Timestamp(2011, 8, 31, 12))
+        self.assertEqual(date(2011, 8, 31), python_val)
+        self.assertIs(date, type(python_val))
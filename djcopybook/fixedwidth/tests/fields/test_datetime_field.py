@@ -38,6 +38,17 @@ class DateTimeFieldTests(unittest.TestCase):
     def test_to_python_returns_datetime_object_when_passed_a_datetime_object(self):
         self.assertEqual(datetime(2012, 1, 1, 1, 1, 1), self.sut.to_python(datetime(2012, 1, 1, 1, 1, 1)))
 
+    def test_to_python_accepts_datetime_subclasses(self):
+        class Timestamp(datetime):
+            pass
+        value = Timestamp(2012, 1, 1, 1, 1, 1)
+        self.assertEqual(datetime(2012, 1, 1, 1, 1, 1), self.sut.to_python(value))
+        self.assertEqual("20120101010101", self.sut.to_record(value))
+
+    def test_to_python_raises_key_error_for_unsupported_types(self):
+        with self.assertRaises(KeyError):
+            self.sut.to_python(20120101)
+
     def test_to_python_returns_none_when_empty_string(self):
         self.assertEqual(None, self.sut.to_python(""))
 
@@ -49,3 +60,39 @@ class DateTimeFieldTests(unittest.TestCase):
 
     def test_to_python_returns_datetime_object_when_unicode(self):
         self.assertEqual(datetime(2012, 1, 1, 1, 1, 1), self.sut.to_python(u"20120101010101"))
+
+    def test_to_python_parses_fixed_formats_without_strptime(self):
+        formats = [
+            ("%Y-%m-%d", "2016-03-04"), ("%Y%m%d", "20160304"), ("%m%d%Y", "03042016"),
+            ("%m/%d/%Y", "03/04/2016"), ("%Y-%m-%d %H:%M", "2016-03-04 00:00"),
+            ("%Y%m%d%H%M%S", "20160304000000"),
+        ]
+        for date_format, val in formats:
+            field = fields.DateTimeField(length=len(val), format=date_format)
+            self.assertEqual(datetime(2016, 3, 4), field._parse(val))
+            self.assertEqual(datetime(2016, 3, 4), field.to_python(val))
+
+    def test_to_python_falls_back_to_strptime_for_other_formats(self):
+        field = fields.DateTimeField(length=11, format="%b %d %Y")
+        self.assertIsNone(field._parse)
+        self.assertEqual(datetime(2016, 3, 4), field.to_python("Mar 04 2016"))
+
+    def test_to_python_falls_back_to_strptime_for_values_not_fitting_format(self):
+        field = fields.DateTimeField(length=10, format="%Y-%m-%d")
+        self.assertEqual(datetime(2016, 3, 4), field.to_python("2016-3-4"))
+        with self.assertRaises(ValueError):
+            field.to_python("2016/03/04")
+        with self.assertRaises(ValueError):
+            field.to_python("2016-13-04")
+
+    def test_to_python_remembers_parsed_strings_up_to_cache_size(self):
+        field = fields.DateTimeField(length=8, format="%Y%m%d", cache_size=2)
+        first = field.to_python("20160304")
+        self.assertIs(first, field.to_python("20160304"))
+        field.to_python("20160305")
+        field.to_python("20160306")
+        self.assertEqual(1, len(field._cache))
+
+    def test_to_python_does_not_cache_by_default(self):
+        self.sut.to_python("20120101010101")
+        self.assertEqual({}, self.sut._cache)
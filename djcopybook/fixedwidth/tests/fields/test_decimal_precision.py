@@ -0,0 +1,76 @@
+import random
+import unittest
+from decimal import Decimal, ROUND_HALF_EVEN
+
+from djcopybook.fixedwidth import fields
+
+SAMPLES = 500
+
+
+def random_decimals(seed, digits, decimals):
+    """Random Decimals with up to ``digits`` digits, ``decimals`` of them after the point."""
+    rand = random.Random(seed)
+    for _ in range(SAMPLES):
+        number = rand.randint(-10 ** digits + 1, 10 ** digits - 1)
+        yield Decimal(number).scaleb(-decimals)
+
+
+def parse_padded(text):
+    """Zero fill goes in front of the sign, as in '000-3.50'."""
+    return Decimal(text.lstrip('0') or '0')
+
+
+class DecimalPrecisionTests(unittest.TestCase):
+    """
+    Eighteen digit money amounts have to survive encoding and decoding
+    exactly, which floats can't do past 15 or 16 digits.
+    """
+
+    def test_implied_decimal_round_trips_eighteen_digits(self):
+        f = fields.ImpliedDecimalField(length=18, decimals=2)
+        for value in random_decimals(1, 18, 2):
+            value = abs(value)
+            self.assertEqual(value, f.to_python(f.to_record(value)))
+
+    def test_signed_implied_decimal_round_trips_eighteen_digits(self):
+        f = fields.SignedImpliedDecimalField(length=19, decimals=4)
+        for value in random_decimals(2, 18, 4):
+            self.assertEqual(value, f.to_python(f.to_record(value)))
+
+    def test_overpunch_decimal_round_trips_eighteen_digits(self):
+        f = fields.OverpunchDecimalField(length=18, decimals=2)
+        for value in random_decimals(3, 18, 2):
+            self.assertEqual(value, f.to_python(f.to_record(value)))
+
+    def test_float_padding_writes_every_digit_of_decimals(self):
+        for value in random_decimals(4, 18, 2):
+            self.assertEqual(value, parse_padded(fields.float_padding(20, value, 2)))
+
+    def test_padding_rounds_extra_digits_half_to_even(self):
+        for value in random_decimals(5, 12, 5):
+            expected = abs(value).quantize(Decimal("0.01"), ROUND_HALF_EVEN)
+            self.assertEqual(expected, Decimal(fields.implied_decimal_padding(13, abs(value), 2)).scaleb(-2))
+            expected = value.quantize(Decimal("0.01"), ROUND_HALF_EVEN)
+            self.assertEqual(expected, parse_padded(fields.float_padding(14, value, 2)))
+
+    def test_floats_are_padded_at_their_shortest_repr(self):
+        rand = random.Random(6)
+        for _ in range(SAMPLES):
+            value = round(rand.uniform(-1e6, 1e6), 2)
+            self.assertEqual(Decimal(repr(value)), parse_padded(fields.float_padding(12, value, 2)))
+            implied = fields.implied_decimal_padding(10, value, 2)
+            self.assertEqual(Decimal(repr(value)), parse_padded(implied).scaleb(-2))
+
+    def test_negative_values_keep_zero_fill_before_sign(self):
+        self.assertEqual("000-3.50", fields.float_padding(8, Decimal("-3.5"), 2))
+        self.assertEqual("00-350", fields.implied_decimal_padding(6, -3.5, 2))
+        self.assertEqual("0000.00", fields.float_padding(7, -0.001, 2))
+
+    def test_half_way_values_round_to_even(self):
+        self.assertEqual("002.68", fields.float_padding(6, Decimal("2.675"), 2))
+        self.assertEqual("002.62", fields.float_padding(6, Decimal("2.625"), 2))
+        self.assertEqual("00262", fields.implied_decimal_padding(5, 2.625, 2))
+
+    def test_decoded_values_keep_field_exponent(self):
+        self.assertEqual("1.50", str(fields.ImpliedDecimalField(length=5, decimals=2).to_python("00150")))
+        self.assertEqual("-1.5", str(fields.SignedImpliedDecimalField(length=5, decimals=1).to_python("0015-")))
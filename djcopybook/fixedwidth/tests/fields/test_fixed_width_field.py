@@ -6,10 +6,9 @@ from djcopybook.fixedwidth.tests.record_helper import RecordOne
 
 class FixedWidthFieldTests(unittest.TestCase):
 
-    def get_field(self, auto_truncate=False, **kwargs):
+    def get_field(self, **kwargs):
         f = fields.FixedWidthField(**kwargs)
         f.attname = "field_one"
-        f.auto_truncate = auto_truncate
         return f
 
     def test_raises_field_length_error_when_value_is_longer_than_allowed(self):
@@ -21,8 +20,8 @@ class FixedWidthFieldTests(unittest.TestCase):
         self.assertEqual(msg, str(e.exception))
 
     def test_truncates_field_length_when_has_auto_truncate_on(self):
-        f = self.get_field(auto_truncate=True, length=5)
-        val = f.get_record_value("This is too long")
+        f = self.get_field(length=5)
+        val = f.get_record_value("This is too long", auto_truncate=True)
         self.assertEqual("This ", val)
 
     def test_get_default_returns_none_when_no_default(self):
@@ -71,3 +70,13 @@ class FixedWidthFieldTests(unittest.TestCase):
                 field_name = item
         delattr(record, field_name)
         self.assertEqual('AA', record.field_one)
+
+    def test_set_attname_computes_storage_key_once(self):
+        field = fields.FixedWidthField(length=5)
+        field.set_attname("field_one")
+        self.assertEqual("field_one", field.attname)
+        self.assertEqual("field_one_{}".format(field.creation_counter), field.storage_key)
+
+    def test_record_stores_values_under_storage_key(self):
+        record = RecordOne(field_one="abc")
+        self.assertEqual("abc", getattr(record, RecordOne.base_fields['field_one'].storage_key))
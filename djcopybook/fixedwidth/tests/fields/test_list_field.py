@@ -123,3 +123,75 @@ class ListFieldTests(unittest.TestCase):
         self.assertEqual('3', record.threeve[1].frag.field_one)
         self.assertEqual(2, record.threeve[0].frag.field_two)
         self.assertEqual(4, record.threeve[1].frag.field_two)
+
+    def test_to_python_parses_each_occurrence_from_its_offset(self):
+        f = fields.ListField(record=record_helper.RecordOne, length=3)
+        records = f.to_python("AAAAA0000001BBBBB0000002CCCCC0000003")
+        self.assertEqual([1, 2, 3], [r.field_two for r in records])
+
+    def test_to_python_reads_as_many_occurrences_as_given_when_depending_on_count(self):
+        f = fields.ListField(record=record_helper.RecordOne, length=3, depending_on='count')
+        self.assertEqual([1, 2], [r.field_two for r in f.to_python("AAAAA0000001BBBBB0000002")])
+        self.assertEqual([], f.to_python(""))
+
+    def test_to_record_does_not_pad_when_depending_on_count(self):
+        f = fields.ListField(record=record_helper.RecordOne, length=3, depending_on='count')
+        self.assertEqual("AAAAA0000001", f.to_record([record_helper.RecordOne(field_one='AAAAA', field_two=1)]))
+
+
+class LazyListFieldTests(unittest.TestCase):
+
+    raw = "AAAAA0000001BBBBB0000002CCCCC0000003"
+
+    def get_list(self):
+        return fields.ListField(record=record_helper.RecordOne, length=3, lazy=True).to_python(self.raw)
+
+    def test_to_python_returns_lazy_record_list_when_given_string(self):
+        records = self.get_list()
+        self.assertIsInstance(records, fields.LazyRecordList)
+        self.assertEqual(3, len(records))
+
+    def test_parses_occurrence_only_when_accessed(self):
+        records = self.get_list()
+        self.assertEqual("BBBBB", records[1].field_one)
+        self.assertEqual([0, records[1], 24], records._items)
+
+    def test_returns_same_record_each_time_occurrence_is_accessed(self):
+        records = self.get_list()
+        self.assertIs(records[-1], records[2])
+
+    def test_supports_slices_and_iteration(self):
+        records = self.get_list()
+        self.assertEqual(["BBBBB", "CCCCC"], [r.field_one for r in records[1:]])
+        self.assertEqual([1, 2, 3], [r.field_two for r in records])
+
+    def test_to_record_uses_original_string_for_untouched_occurrences(self):
+        records = self.get_list()
+        records[0].field_two = 9
+        self.assertEqual("AAAAA0000009BBBBB0000002CCCCC0000003", records.to_record())
+        self.assertEqual(24, records._items[2])
+
+    def test_keeps_offsets_of_untouched_occurrences_when_items_removed(self):
+        records = self.get_list()
+        del records[0]
+        records.append(record_helper.RecordOne(field_one="DDDDD"))
+        self.assertEqual(["BBBBB", "CCCCC", "DDDDD"], [r.field_one for r in records])
+
+    def test_record_with_lazy_list_field_round_trips(self):
+
+        class TestRecord(fixedwidth.Record):
+            name = fields.StringField(length=2)
+            list_field = fields.ListField(record_helper.RecordOne, length=3, lazy=True)
+
+        r = TestRecord.from_record("XX" + self.raw)
+        self.assertEqual("CCCCC", r.list_field[2].field_one)
+        self.assertEqual("XX" + self.raw, r.to_record())
+
+    def test_record_pads_lazy_list_field_when_occurrences_removed(self):
+
+        class TestRecord(fixedwidth.Record):
+            list_field = fields.ListField(record_helper.RecordOne, length=3, lazy=True)
+
+        r = TestRecord.from_record(self.raw)
+        del r.list_field[1]
+        self.assertEqual("AAAAA0000001CCCCC0000003AA   0000000", r.to_record())
@@ -0,0 +1,75 @@
+from decimal import Decimal
+from unittest import TestCase
+from djcopybook.fixedwidth import fields
+
+
+class OverpunchDecimalFieldTests(TestCase):
+
+    def test_subclasses_implied_decimal_field(self):
+        self.assertTrue(issubclass(fields.OverpunchDecimalField, fields.ImpliedDecimalField))
+
+    def test_to_python_reads_positive_overpunch(self):
+        f = fields.OverpunchDecimalField(length=6, decimals=2)
+        self.assertEqual(Decimal("123.41"), f.to_python("01234A"))
+        self.assertEqual(Decimal("123.40"), f.to_python("01234{"))
+
+    def test_to_python_reads_negative_overpunch(self):
+        f = fields.OverpunchDecimalField(length=6, decimals=2)
+        self.assertEqual(Decimal("-123.49"), f.to_python("01234R"))
+        self.assertEqual(Decimal("-123.40"), f.to_python("01234}"))
+
+    def test_to_python_reads_plain_last_digit_as_positive(self):
+        f = fields.OverpunchDecimalField(length=4, decimals=0)
+        self.assertEqual(Decimal("1234"), f.to_python("1234"))
+
+    def test_to_python_returns_None_when_value_is_blank(self):
+        f = fields.OverpunchDecimalField(length=4)
+        self.assertEqual(None, f.to_python("    "))
+        self.assertEqual(None, f.to_python(None))
+
+    def test_to_python_returns_decimal_of_value_when_not_a_string(self):
+        f = fields.OverpunchDecimalField(length=6, decimals=2)
+        self.assertEqual(Decimal("-1.5"), f.to_python(-1.5))
+
+    def test_to_python_raises_value_error_for_invalid_characters(self):
+        f = fields.OverpunchDecimalField(length=4)
+        with self.assertRaises(ValueError):
+            f.to_python("12X4")
+
+    def test_to_record_punches_sign_over_last_digit(self):
+        f = fields.OverpunchDecimalField(length=6, decimals=2)
+        self.assertEqual("01234A", f.to_record(Decimal("123.41")))
+        self.assertEqual("01234R", f.to_record(Decimal("-123.49")))
+
+    def test_to_record_writes_zero_as_positive(self):
+        f = fields.OverpunchDecimalField(length=4)
+        self.assertEqual("000{", f.to_record(None))
+        self.assertEqual("000{", f.to_record(Decimal("-0")))
+
+    def test_round_trips_every_last_digit(self):
+        f = fields.OverpunchDecimalField(length=3, decimals=1)
+        for i in range(-99, 100):
+            value = Decimal(i) / 10
+            self.assertEqual(value, f.to_python(f.to_record(value)))
+
+    def test_decode_many_translates_column(self):
+        f = fields.OverpunchDecimalField(length=4, decimals=1)
+        values = ["012A", "012R", "    ", " 12}", "0123"]
+        self.assertEqual([Decimal("12.1"), Decimal("-12.9"), None, Decimal("-12.0"), Decimal("12.3")],
+                         f.decode_many(values))
+
+    def test_decode_many_handles_values_of_other_lengths(self):
+        f = fields.OverpunchDecimalField(length=4)
+        self.assertEqual([Decimal("-12"), None], f.decode_many(["1K", None]))
+
+    def test_decode_many_matches_to_python_for_malformed_values(self):
+        f = fields.OverpunchDecimalField(length=5, decimals=2)
+        for values in (["1A23{", "0012A"], ["0012A", "12J3}"], ["0012A", "0012Z"]):
+            with self.assertRaises(ValueError):
+                [f.to_python(val) for val in values]
+            with self.assertRaises(ValueError):
+                f.decode_many(values)
+
+    def test_decode_many_translates_single_digit_column(self):
+        f = fields.OverpunchDecimalField(length=1)
+        self.assertEqual([Decimal("1"), Decimal("-0"), Decimal("7")], f.decode_many(["A", "}", "7"]))
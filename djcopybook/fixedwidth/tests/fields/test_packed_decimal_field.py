@@ -0,0 +1,63 @@
+from decimal import Decimal
+from unittest import TestCase
+from djcopybook.fixedwidth import fields
+
+
+class PackedDecimalFieldTests(TestCase):
+
+    def test_is_binary_field(self):
+        self.assertTrue(fields.PackedDecimalField(length=3).binary)
+
+    def test_to_python_unpacks_positive_value(self):
+        f = fields.PackedDecimalField(length=3, decimals=2)
+        self.assertEqual(Decimal("123.45"), f.to_python(b"\x12\x34\x5c"))
+
+    def test_to_python_unpacks_negative_value(self):
+        f = fields.PackedDecimalField(length=3, decimals=2)
+        self.assertEqual(Decimal("-123.45"), f.to_python(b"\x12\x34\x5d"))
+
+    def test_to_python_accepts_unsigned_sign_nibble(self):
+        f = fields.PackedDecimalField(length=2)
+        self.assertEqual(Decimal("12"), f.to_python(b"\x01\x2f"))
+
+    def test_to_python_treats_text_as_latin_1_bytes(self):
+        f = fields.PackedDecimalField(length=2)
+        self.assertEqual(Decimal("12"), f.to_python(u"\x01\x2c"))
+
+    def test_to_python_returns_None_for_spaces_and_low_values(self):
+        f = fields.PackedDecimalField(length=3)
+        self.assertEqual([None, None, None], [f.to_python(v) for v in (b"\x40" * 3, b"   ", b"\x00" * 3)])
+
+    def test_to_python_raises_value_error_for_bad_digits(self):
+        f = fields.PackedDecimalField(length=2)
+        with self.assertRaises(ValueError):
+            f.to_python(b"\x1a\x2c")
+
+    def test_to_python_returns_decimal_of_numbers(self):
+        f = fields.PackedDecimalField(length=3, decimals=2)
+        self.assertEqual(Decimal("1.5"), f.to_python(1.5))
+        self.assertEqual(Decimal("2"), f.to_python(2))
+
+    def test_to_record_packs_value(self):
+        f = fields.PackedDecimalField(length=3, decimals=2)
+        self.assertEqual(b"\x12\x34\x5c", f.to_record(Decimal("123.45")))
+        self.assertEqual(b"\x00\x01\x0d", f.to_record(-0.1))
+
+    def test_to_record_uses_f_sign_when_unsigned(self):
+        f = fields.PackedDecimalField(length=2, signed=False)
+        self.assertEqual(b"\x01\x2f", f.to_record(12))
+
+    def test_to_record_of_none_is_zero(self):
+        f = fields.PackedDecimalField(length=2)
+        self.assertEqual(b"\x00\x0c", f.to_record(None))
+
+    def test_to_record_raises_field_length_error_when_too_many_digits(self):
+        f = fields.PackedDecimalField(length=2)
+        f.attname = 'amount'
+        with self.assertRaises(fields.FieldLengthError):
+            f.get_record_value(1234)
+
+    def test_decode_many_unpacks_column(self):
+        f = fields.PackedDecimalField(length=2, decimals=1)
+        values = [b"\x12\x3c", b"\x00\x1d", b"\x40\x40"]
+        self.assertEqual([Decimal("12.3"), Decimal("-0.1"), None], f.decode_many(values))
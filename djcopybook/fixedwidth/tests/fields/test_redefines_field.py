@@ -0,0 +1,117 @@
+import unittest
+
+from djcopybook import fixedwidth
+from djcopybook.fixedwidth import fields
+from djcopybook.fixedwidth.tests import record_helper
+from djcopybook.fixedwidth.tests.record_helper import AutoDetail, HomeDetail, PolicyDetailRecord
+
+
+class Counted(fixedwidth.Record):
+    decoded = 0
+    value = fields.StringField(length=3)
+
+    @classmethod
+    def from_record(cls, record):
+        Counted.decoded += 1
+        return super(Counted, cls).from_record(record)
+
+
+class SelectedRecord(fixedwidth.Record):
+    kind = fields.IntegerField(length=1)
+    span = fields.RedefinesField([Counted, record_helper.RecordOne],
+                                 selector=lambda r: Counted if r.kind < 5 else record_helper.RecordOne)
+
+
+class LazyPolicyDetailRecord(fixedwidth.Record):
+    lazy = True
+    record_type = fields.StringField(length=1)
+    detail = fields.RedefinesField({'A': AutoDetail, 'H': HomeDetail}, discriminator='record_type')
+
+
+class RedefinesFieldTests(unittest.TestCase):
+
+    def test_length_is_longest_variant(self):
+        self.assertEqual(10, PolicyDetailRecord.base_fields['detail'].length)
+        self.assertEqual(14, len(PolicyDetailRecord))
+
+    def test_decodes_variant_picked_by_discriminator(self):
+        auto = PolicyDetailRecord.from_record("AHONDA 2014123")
+        home = PolicyDetailRecord.from_record("H01800     045")
+        self.assertIsInstance(auto.detail, AutoDetail)
+        self.assertEqual(("HONDA", 2014, 123), (auto.detail.make, auto.detail.year, auto.premium))
+        self.assertIsInstance(home.detail, HomeDetail)
+        self.assertEqual((1800, 45), (home.detail.square_feet, home.premium))
+
+    def test_decoding_record_only_keeps_raw_span(self):
+        Counted.decoded = 0
+        record = SelectedRecord.from_record("1abcdefghijkl")
+        self.assertEqual(0, Counted.decoded)
+        self.assertEqual("abc", record.span.value)
+        self.assertEqual("abc", record.span.value)
+        self.assertEqual(1, Counted.decoded)
+
+    def test_decodes_variant_picked_by_selector(self):
+        record = SelectedRecord.from_record("9abcde0000012")
+        self.assertIsInstance(record.span, record_helper.RecordOne)
+        self.assertEqual(12, record.span.field_two)
+
+    def test_uses_first_variant_without_discriminator_or_selector(self):
+        field = fields.RedefinesField([HomeDetail, AutoDetail])
+        self.assertIs(HomeDetail, field.get_record_class(PolicyDetailRecord()))
+
+    def test_reads_raw_span_when_no_variant_matches(self):
+        record = PolicyDetailRecord.from_record("XHONDA 2014123")
+        self.assertEqual("HONDA 2014", record.detail)
+
+    def test_untouched_span_is_written_back_as_is(self):
+        record = PolicyDetailRecord.from_record("XHONDA 2014123")
+        self.assertEqual("XHONDA 2014123", record.to_record())
+
+    def test_unread_span_is_written_back_as_is_when_variant_matches(self):
+        for line in ["AHONDA   14123", "AHONDA XXXX123"]:
+            record = PolicyDetailRecord.from_record(line)
+            self.assertEqual(line, record.to_record())
+
+    def test_to_record_does_not_decode_unread_span(self):
+        Counted.decoded = 0
+        SelectedRecord.from_record("1abcdefghijkl").to_record()
+        self.assertEqual(0, Counted.decoded)
+
+    def test_writes_variant_padded_to_span(self):
+        record = PolicyDetailRecord(record_type='H', detail=HomeDetail(square_feet=950), premium=7)
+        self.assertEqual("H00950     007", record.to_record())
+
+    def test_builds_variant_from_dict_when_read(self):
+        record = PolicyDetailRecord(record_type='A', detail={'make': 'FORD', 'year': 1999})
+        self.assertIsInstance(record.detail, AutoDetail)
+        self.assertEqual("AFORD  1999000", record.to_record())
+
+    def test_changes_to_variant_are_written(self):
+        record = PolicyDetailRecord.from_record("AHONDA 2014123")
+        record.detail.year = 2015
+        self.assertEqual("AHONDA 2015123", record.to_record())
+
+    def test_view_reads_span_as_other_variant(self):
+        record = PolicyDetailRecord.from_record("A12345 2014123")
+        view = PolicyDetailRecord.base_fields['detail'].view(record, 'H')
+        self.assertEqual(12345, view.square_feet)
+        self.assertIsInstance(record.detail, AutoDetail)
+
+    def test_view_reads_changed_variant(self):
+        record = PolicyDetailRecord.from_record("A12345 2014123")
+        record.detail.make = '54321'
+        self.assertEqual(54321, PolicyDetailRecord.base_fields['detail'].view(record, 'H').square_feet)
+
+    def test_works_on_lazy_records(self):
+        record = LazyPolicyDetailRecord.from_record("H01800     ")
+        self.assertEqual(1800, LazyPolicyDetailRecord.base_fields['detail'].view(record, 'H').square_feet)
+        self.assertEqual(1800, record.detail.square_feet)
+        self.assertEqual("H01800     ", record.to_record())
+
+    def test_to_python_raises_type_error_for_other_values(self):
+        with self.assertRaises(TypeError):
+            PolicyDetailRecord.base_fields['detail'].to_python(12)
+
+    def test_takes_discriminator_or_selector_not_both(self):
+        with self.assertRaises(ValueError):
+            fields.RedefinesField([HomeDetail], discriminator='a', selector=lambda r: HomeDetail)
@@ -35,3 +35,64 @@ class RecordSix(fixedwidth.Record):
     first = fields.BooleanField()
     second = fields.BooleanField()
     third = fields.BooleanField()
+
+
+class CompactRecord(fixedwidth.Record):
+    compact = True
+
+    field_one = fields.StringField(length=5, default="AA")
+    field_two = fields.IntegerField(length=7)
+    frag = fields.FragmentField(record=RecordOne)
+
+
+class LazyRecord(fixedwidth.Record):
+    lazy = True
+
+    name = fields.StringField(length=5)
+    count = fields.IntegerField(length=3)
+    born = fields.DateField(length=10)
+
+
+class CompactLazyRecord(fixedwidth.Record):
+    compact = True
+    lazy = True
+
+    name = fields.StringField(length=5)
+    extra = fields.StringField(length=2)
+
+
+class EbcdicRecord(fixedwidth.Record):
+    encoding = 'cp037'
+
+    name = fields.StringField(length=5)
+    amount = fields.IntegerField(length=4)
+
+
+class PackedRecord(fixedwidth.Record):
+    encoding = 'cp037'
+
+    name = fields.StringField(length=4)
+    amount = fields.PackedDecimalField(length=3, decimals=2)
+    count = fields.BinaryIntegerField(length=2)
+
+
+class AutoDetail(fixedwidth.Record):
+    make = fields.StringField(length=6)
+    year = fields.IntegerField(length=4)
+
+
+class HomeDetail(fixedwidth.Record):
+    square_feet = fields.IntegerField(length=5)
+
+
+class PolicyDetailRecord(fixedwidth.Record):
+    record_type = fields.StringField(length=1)
+    detail = fields.RedefinesField({'A': AutoDetail, 'H': HomeDetail}, discriminator='record_type')
+    premium = fields.IntegerField(length=3)
+
+
+class ClaimsRecord(fixedwidth.Record):
+    policy = fields.StringField(length=4)
+    claim_count = fields.IntegerField(length=2)
+    claims = fields.ListField(record=RecordOne, length=10, depending_on='claim_count')
+    status = fields.StringField(length=1)
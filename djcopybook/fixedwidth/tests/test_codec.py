@@ -0,0 +1,78 @@
+import unittest
+
+from djcopybook import fixedwidth
+from djcopybook.fixedwidth import fields
+from djcopybook.fixedwidth.tests import record_helper
+
+
+class CountingField(fields.StringField):
+
+    def __init__(self, *args, **kwargs):
+        self.calls = 0
+        super(CountingField, self).__init__(*args, **kwargs)
+
+    def to_python(self, val):
+        self.calls += 1
+        return super(CountingField, self).to_python(val)
+
+
+class RecordCodecTests(unittest.TestCase):
+
+    def test_record_class_gets_codec_with_total_length(self):
+        self.assertEqual(12, record_helper.RecordOne._codec.length)
+        self.assertEqual(len(record_helper.RecordFive), record_helper.RecordFive._codec.length)
+
+    def test_precomputes_field_offsets(self):
+        offsets = [(start, end) for _, start, end, _ in record_helper.RecordThree._codec.decoders]
+        self.assertEqual([(0, 12), (12, 15)], offsets)
+
+    def test_decode_converts_each_field_once(self):
+
+        class CountingRecord(fixedwidth.Record):
+            counted = CountingField(length=3)
+
+        CountingRecord.base_fields['counted'].calls = 0
+        r = CountingRecord._codec.decode("abc")
+        self.assertEqual("abc", r.counted)
+        self.assertEqual(1, CountingRecord.base_fields['counted'].calls)
+
+    def test_converts_immutable_defaults_once_for_the_record_class(self):
+        self.assertEqual({'AA', None}, set(record_helper.RecordOne._codec.static_defaults.values()))
+        self.assertEqual([], record_helper.RecordOne._codec.dynamic_defaults)
+
+    def test_initialize_builds_mutable_defaults_for_each_instance(self):
+        self.assertIsNot(record_helper.RecordThree().frag, record_helper.RecordThree().frag)
+        self.assertIsNot(record_helper.RecordFive().threeve, record_helper.RecordFive().threeve)
+
+    def test_initialize_calls_callable_defaults_for_each_instance(self):
+        counter = iter(range(10))
+
+        class CallableDefault(fixedwidth.Record):
+            field = fields.IntegerField(length=2, default=lambda: next(counter))
+
+        self.assertEqual([0, 1], [CallableDefault().field, CallableDefault().field])
+
+    def test_decode_returns_record_instance(self):
+        r = record_helper.RecordOne._codec.decode("test 0000500")
+        self.assertIsInstance(r, record_helper.RecordOne)
+        self.assertEqual("test", r.field_one)
+        self.assertEqual(500, r.field_two)
+
+    def test_decode_raises_value_error_when_record_wrong_length(self):
+        with self.assertRaises(ValueError) as e:
+            record_helper.RecordOne._codec.decode("test")
+        self.assertEqual("Fixed width record length is 4 but should be 12.", str(e.exception))
+
+    def test_encode_matches_field_by_field_record_values(self):
+        r = record_helper.RecordFive.from_record('abc  0000100\nEEE\nAA   0000000BBBAA   0000000BBB')
+        expected = ''.join(r.get_record_value(name) for name in r.fields)
+        self.assertEqual(expected, record_helper.RecordFive._codec.encode(r))
+
+    def test_encode_truncates_when_record_has_auto_truncate(self):
+        r = record_helper.RecordTwo(field_one="too long")
+        self.assertEqual("too l", record_helper.RecordTwo._codec.encode(r)[:5])
+
+    def test_encode_raises_field_length_error_when_value_too_long(self):
+        r = record_helper.RecordOne(field_one="too long")
+        with self.assertRaises(fields.FieldLengthError):
+            record_helper.RecordOne._codec.encode(r)
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+import datetime
+import unittest
+from decimal import Decimal
+
+from djcopybook import fixedwidth
+from djcopybook.fixedwidth import columnar
+from djcopybook.fixedwidth import fields
+from djcopybook.fixedwidth.tests import record_helper
+
+
+class ColumnRecord(fixedwidth.Record):
+    name = fields.StringField(length=4)
+    count = fields.IntegerField(length=4)
+    rate = fields.DecimalField(length=6)
+    premium = fields.ImpliedDecimalField(length=5, decimals=2)
+    effective = fields.DateField(length=8, format="%m%d%Y")
+    expires = fields.DateField(length=10)
+    credit = fields.SignedImpliedDecimalField(length=5, decimals=1)
+
+
+class ShortDateRecord(fixedwidth.Record):
+    born = fields.DateField(length=6, format="%y%m%d")
+
+
+LINES = [
+    "ab  0012 12.500125003042016" + "2016-03-04" + "0012-",
+    "cd      -00.5      " + " " * 18 + "0012+",
+]
+
+
+class FromRecordsColumnarTests(unittest.TestCase):
+
+    def test_returns_column_of_python_values_per_field(self):
+        columns = ColumnRecord.from_records_columnar(LINES)
+        self.assertEqual(list(ColumnRecord.base_fields), list(columns))
+        self.assertEqual(["ab", "cd"], columns['name'])
+        self.assertEqual([12, None], columns['count'])
+        self.assertEqual([12.5, -0.5], columns['rate'])
+        self.assertEqual([Decimal("12.50"), None], columns['premium'])
+        self.assertEqual([datetime.date(2016, 3, 4), None], columns['effective'])
+        self.assertEqual([Decimal("-1.2"), Decimal("1.2")], columns['credit'])
+
+    def test_matches_from_record(self):
+        columns = ColumnRecord.from_records_columnar(LINES)
+        for row, line in enumerate(LINES):
+            record = ColumnRecord.from_record(line)
+            self.assertEqual([getattr(record, name) for name in columns], [c[row] for c in columns.values()])
+
+    def test_flattens_fragments_and_lists_into_columns(self):
+        line = "abc  0000100\nEEE\nAA   0000000BBBXY   0000007BBB"
+        columns = record_helper.RecordFive.from_records_columnar([line])
+        self.assertNotIn('new_line', columns)
+        self.assertEqual([100], columns['garf.frag.field_two'])
+        self.assertEqual(["XY"], columns['threeve[1].frag.field_one'])
+        self.assertEqual([7], columns['threeve[1].frag.field_two'])
+
+    def test_splits_a_single_buffer_of_records(self):
+        columns = record_helper.RecordOne.from_records_columnar(b"aaaaa0000001\r\nbbbbb0000002\r\n")
+        self.assertEqual([1, 2], columns['field_two'])
+        columns = record_helper.RecordOne.from_records_columnar(u"aaaaa0000001bbbbb0000002", newline='')
+        self.assertEqual(["aaaaa", "bbbbb"], columns['field_one'])
+
+    def test_decodes_bytes_with_class_encoding_and_binary_fields(self):
+        raw = u"abc ".encode('cp037') + b"\x12\x34\x5d\x01\x02"
+        columns = record_helper.PackedRecord.from_records_columnar([raw, raw])
+        self.assertEqual(["abc", "abc"], columns['name'])
+        self.assertEqual([Decimal("-123.45")] * 2, columns['amount'])
+        self.assertEqual([258, 258], columns['count'])
+
+    def test_raises_value_error_for_record_of_wrong_length(self):
+        with self.assertRaises(ValueError):
+            ColumnRecord.from_records_columnar(LINES + ["short"])
+
+
+class EncodeColumnsTests(unittest.TestCase):
+
+    def assert_matches_to_record(self, record_class, columns):
+        rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+        expected = [record_class(**row).to_record() for row in rows]
+        self.assertEqual(expected, record_class.encode_columns(columns))
+
+    def test_matches_to_record_for_each_row(self):
+        self.assert_matches_to_record(ColumnRecord, {
+            'name': ["ab", u"cd  ", None, 12],
+            'count': [12, None, "7", True],
+            'rate': [12.5, -0.5, None, Decimal("3.333")],
+            'premium': [Decimal("12.5"), None, 3, "00125"],
+            'effective': [datetime.date(2016, 3, 4), None, datetime.datetime(2016, 1, 2, 3), "03042016"],
+            'credit': [Decimal("-1.2"), 1.2, None, 0],
+        })
+
+    def test_matches_to_record_for_booleans_and_binary_fields(self):
+        self.assert_matches_to_record(record_helper.RecordSix, {
+            'first': [True, False, " "], 'second': ["Y", "N", False],
+        })
+        self.assert_matches_to_record(record_helper.PackedRecord, {
+            'name': [u"é", "x"], 'amount': [Decimal("-1.25"), None], 'count': [258, -1],
+        })
+
+    def test_encodes_decoded_columns_like_decoded_records(self):
+        expected = [ColumnRecord.from_record(line).to_record() for line in LINES]
+        self.assertEqual(expected, ColumnRecord.encode_columns(ColumnRecord.from_records_columnar(LINES)))
+
+    def test_uses_defaults_for_missing_columns(self):
+        self.assertEqual(["AA   0000003"] * 2, record_helper.RecordOne.encode_columns({'field_two': [3, 3]}))
+
+    def test_encodes_nested_fields_from_flat_columns(self):
+        line = "abc  0000100\nEEE\nAA   0000000BBBXY   0000007BBB"
+        columns = record_helper.RecordFive.from_records_columnar([line, line])
+        self.assertEqual([line, line], record_helper.RecordFive.encode_columns(columns))
+
+    def test_encodes_fragment_columns_of_records(self):
+        frags = [record_helper.RecordOne(field_one="x"), {'field_two': 5}]
+        self.assert_matches_to_record(record_helper.RecordThree, {'frag': frags, 'other_field': ["a", "b"]})
+
+    def test_truncates_for_auto_truncate_records(self):
+        self.assert_matches_to_record(record_helper.RecordTwo, {'field_one': ["toolongvalue"], 'field_three': [1.5]})
+
+    def test_raises_field_length_error_when_value_too_long(self):
+        with self.assertRaises(fields.FieldLengthError):
+            record_helper.RecordOne.encode_columns({'field_one': ["ok", "too long"]})
+
+    def test_raises_value_error_when_columns_differ_in_length(self):
+        with self.assertRaises(ValueError):
+            record_helper.RecordOne.encode_columns({'field_one': ["a"], 'field_two': [1, 2]})
+
+
+@unittest.skipIf(columnar.numpy is None, "NumPy is not installed")
+class FromRecordsColumnarArrayTests(unittest.TestCase):
+
+    def setUp(self):
+        self.columns = ColumnRecord.from_records_columnar(LINES, numpy=True)
+
+    def test_integer_columns_are_int64_without_blanks(self):
+        columns = record_helper.RecordOne.from_records_columnar(["aaaaa0000001", "bbbbb-000002"], numpy=True)
+        self.assertEqual('int64', columns['field_two'].dtype.name)
+        self.assertEqual([1, -2], columns['field_two'].tolist())
+
+    def test_integers_too_big_for_int64_stay_exact(self):
+        big = type(str('BigRecord'), (fixedwidth.Record,), {'number': fields.IntegerField(length=19)})
+        columns = big.from_records_columnar(["9999999999999999999", "0000000000000000001"], numpy=True)
+        self.assertEqual([9999999999999999999, 1], columns['number'].tolist())
+
+    def test_implied_decimals_too_big_for_int64_are_float64(self):
+        big = type(str('BigRecord'), (fixedwidth.Record,), {
+            'amount': fields.ImpliedDecimalField(length=20, decimals=2)})
+        columns = big.from_records_columnar(["99999999999999999900"], numpy=True)
+        self.assertEqual('float64', columns['amount'].dtype.name)
+        self.assertEqual([1e18], columns['amount'].tolist())
+
+    def test_blank_numbers_are_nan(self):
+        self.assertEqual('float64', self.columns['count'].dtype.name)
+        self.assertEqual(12, self.columns['count'][0])
+        self.assertTrue(columnar.numpy.isnan(self.columns['count'][1]))
+
+    def test_decimal_columns_are_float64(self):
+        self.assertEqual([12.5, -0.5], self.columns['rate'].tolist())
+        self.assertEqual(12.5, self.columns['premium'][0])
+        self.assertEqual([-1.2, 1.2], self.columns['credit'].tolist())
+
+    def test_date_columns_are_datetime64(self):
+        for name in ('effective', 'expires'):
+            self.assertEqual('datetime64[D]', self.columns[name].dtype.name)
+            self.assertEqual(datetime.date(2016, 3, 4), self.columns[name][0].astype(datetime.date))
+            self.assertTrue(columnar.numpy.isnat(self.columns[name][1]))
+
+    def test_other_columns_stay_lists(self):
+        self.assertEqual(["ab", "cd"], self.columns['name'])
+
+    def test_dates_in_other_formats_are_converted_from_python_values(self):
+        columns = ShortDateRecord.from_records_columnar(["160304", "160304", "      "], numpy=True)
+        self.assertEqual('datetime64[D]', columns['born'].dtype.name)
+        self.assertEqual([datetime.date(2016, 3, 4)] * 2 + [None], columns['born'].astype(datetime.date).tolist())
+
+    def test_encode_columns_accepts_arrays_with_nan_and_nat(self):
+        numpy = columnar.numpy
+        columns = ColumnRecord.encode_columns({
+            'count': numpy.array([12.0, numpy.nan]),
+            'expires': numpy.array(['2016-03-04', 'NaT'], dtype='datetime64[D]'),
+            'rate': numpy.array([12.5, -0.5]),
+        })
+        expected = [
+            ColumnRecord(count=12, expires=datetime.date(2016, 3, 4), rate=12.5).to_record(),
+            ColumnRecord(rate=-0.5).to_record(),
+        ]
+        self.assertEqual(expected, columns)
+
+    def test_encode_columns_accepts_nanosecond_datetime_arrays(self):
+        numpy = columnar.numpy
+        columns = ColumnRecord.encode_columns({
+            'effective': numpy.array(['2016-03-04T10:30', 'NaT'], dtype='datetime64[ns]'),
+            'expires': numpy.array(['NaT', '2016-03-05'], dtype='datetime64[ns]'),
+        })
+        expected = [
+            ColumnRecord(effective=datetime.date(2016, 3, 4)).to_record(),
+            ColumnRecord(expires=datetime.date(2016, 3, 5)).to_record(),
+        ]
+        self.assertEqual(expected, columns)
+
+    def test_encodes_columns_decoded_as_arrays(self):
+        columns = ColumnRecord.from_records_columnar(LINES, numpy=True)
+        expected = [ColumnRecord.from_record(line).to_record() for line in LINES]
+        self.assertEqual(expected, ColumnRecord.encode_columns(columns))
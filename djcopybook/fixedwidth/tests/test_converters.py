@@ -0,0 +1,82 @@
+import os
+import unittest
+from decimal import Decimal
+
+try:
+    from importlib.machinery import SourceFileLoader
+    from importlib.util import module_from_spec, spec_from_loader
+except ImportError:  # Python 2
+    import imp
+    SourceFileLoader = None
+
+from djcopybook.fixedwidth import codec, converters, fields
+
+# Every converter is called with each of these arguments, compiled and pure.
+CORPUS = [
+    ('str_padding', [(6, "ALM"), (6, 5), (3, "ABCDE"), (4, u"\xe9"), (2, "")]),
+    ('int_padding', [(6, 10), (6, "10"), (6, 11, "<"), (3, -5), (2, 12345)]),
+    ('to_scaled_integer', [(12, 2), (0.1, 2), (Decimal("2.675"), 2), ("-3.5", 0), (-0.005, 2), (Decimal("1E+3"), 1)]),
+    ('float_padding', [(8, Decimal("-3.5"), 2), (7, -0.001, 2), (6, 2.625, 2), (5, 7, 0), (3, 123456, 1)]),
+    ('implied_decimal_padding', [(6, -3.5, 2), (5, 2.625, 2), (10, Decimal("12345.678"), 3), (4, 0, 0)]),
+    ('is_blank_string', [("",), ("   ",), (" x ",), (None,), (0,), (u"\t",)]),
+    ('to_string', [(None,), ("abc  ",), (u"  ab ",), (12,)]),
+    ('to_integer', [(None,), ("   ",), ("00042",), ("-7",), (3.9,), ("4x",)]),
+    ('to_float', [(None,), ("",), ("001.50",), ("-2",), (3,), ("x",)]),
+    ('to_implied_decimal', [(None, 5, 2), ("00150", 5, 2), ("0015099", 5, 2), ("     ", 5, 2), (1.5, 5, 2),
+                            (Decimal("1.5"), 5, 2), ("-0150", 5, 2), ("abcde", 5, 2)]),
+    ('to_signed_implied_decimal', [(None, 6, 2), ("00150-", 6, 2), ("00150+", 6, 2), ("     +", 6, 2),
+                                   (2.5, 6, 2), ("0015x+", 6, 2)]),
+    ('to_overpunch_decimal', [(None, 'E-2'), ("0012}", 'E-2'), ("0012A", 'E-2'), ("00123", 'E-0'),
+                              (u"  12J", 'E-2'), ("     ", 'E-2'), (b"0012R", 'E-2'), (1.25, 'E-2'), ("12Z", 'E-2')]),
+]
+
+
+def load_pure_converters():
+    """
+    The converters module from its Python source, even when the compiled
+    extension is what normally gets imported.
+    """
+    name = 'djcopybook.fixedwidth._pure_converters'
+    path = os.path.join(os.path.dirname(fields.__file__), 'converters.py')
+    if SourceFileLoader is None:
+        return imp.load_source(name, path)
+    loader = SourceFileLoader(name, path)
+    module = module_from_spec(spec_from_loader(name, loader))
+    loader.exec_module(module)
+    return module
+
+
+def call(func, args):
+    try:
+        return 'value', func(*args)
+    except Exception as e:
+        return type(e), str(e)
+
+
+class ConvertersTests(unittest.TestCase):
+
+    def setUp(self):
+        self.pure = load_pure_converters()
+
+    def test_loads_pure_python_source(self):
+        self.assertFalse(self.pure.COMPILED)
+
+    def test_imported_converters_give_same_results_as_pure_python(self):
+        for name, calls in CORPUS:
+            for args in calls:
+                expected = call(getattr(self.pure, name), args)
+                actual = call(getattr(converters, name), args)
+                self.assertEqual(expected, actual, "{}{!r}".format(name, args))
+                self.assertIs(type(expected[1]), type(actual[1]), "{}{!r}".format(name, args))
+
+    def test_corpus_covers_every_converter(self):
+        public = set(name for name, value in vars(self.pure).items() if callable(value) and not name.startswith('_'))
+        self.assertEqual(public - set(['Decimal']), set(name for name, _ in CORPUS))
+
+    def test_fields_use_imported_converters(self):
+        self.assertIs(converters.str_padding, fields.str_padding)
+        self.assertEqual(Decimal('-0.12'), fields.OverpunchDecimalField(length=3, decimals=2).to_python(u'01K'))
+
+    def test_codec_and_fields_are_compiled_with_converters(self):
+        for module in (codec, fields):
+            self.assertEqual(converters.COMPILED, not module.__file__.endswith(('.py', '.pyc')), module.__name__)
@@ -0,0 +1,246 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from decimal import Decimal
+
+import six
+
+from djcopybook.fixedwidth import copybook
+from djcopybook.fixedwidth import fields
+
+POLICY = """
+000100 01  POLICY-RECORD.                                               POL00010
+000200*    A comment with a PIC X(5). in it
+000300     05  POLICY-NUMBER           PIC X(10).                       POL00020
+000400     05  EFFECTIVE-DATE          PIC 9(8).
+000500     05  PREMIUM                 PIC S9(7)V99 COMP-3.
+000600     05  TERM-MONTHS             PIC S9(4) COMP.
+000700     05  BALANCE                 PIC S9(5)V99.
+000800     05  ADJUSTMENT              PIC S9(3)V9 TRAILING SEPARATE.
+000900     05  RATE                    PIC 9V9(4).
+001000     05  STATUS-CODE             PIC X VALUE 'A. B'.
+001100         88  IS-ACTIVE           VALUE 'A'.
+001200     05  FILLER                  PIC X(2).
+001300     05  INSURED OCCURS 2 TIMES INDEXED BY INS-IDX.
+001400         10  NAME                PIC X(20).
+001500         10  AGE                 PIC 999.
+001600     05  AMOUNTS COMP-3.
+001700         10  AMOUNT              PIC S9(5) OCCURS 3.
+001800     05  ALT-NUMBER REDEFINES POLICY-NUMBER PIC 9(10).
+001900     05  FILLER                  PIC X(3).
+"""
+
+
+def layout_of(record_class):
+    return [(entry.name, entry.length, type(entry.field).__name__) for entry in record_class.flat_layout()]
+
+
+class ParseCopybookTests(unittest.TestCase):
+
+    def setUp(self):
+        self.record_class = copybook.load_copybook(POLICY, encoding='cp037')['PolicyRecord']
+
+    def test_maps_pictures_and_usages_to_fields(self):
+        self.assertEqual([
+            ('policy_number', 10, 'RedefinesField'),
+            ('effective_date', 8, 'IntegerField'),
+            ('premium', 5, 'PackedDecimalField'),
+            ('term_months', 2, 'BinaryIntegerField'),
+            ('balance', 7, 'OverpunchDecimalField'),
+            ('adjustment', 5, 'SignedImpliedDecimalField'),
+            ('rate', 5, 'ImpliedDecimalField'),
+            ('status_code', 1, 'StringField'),
+            ('filler', 2, 'StringField'),
+            ('insured[0].name', 20, 'StringField'),
+            ('insured[0].age', 3, 'IntegerField'),
+            ('insured[1].name', 20, 'StringField'),
+            ('insured[1].age', 3, 'IntegerField'),
+            ('amounts.amount[0].amount', 3, 'PackedDecimalField'),
+            ('amounts.amount[1].amount', 3, 'PackedDecimalField'),
+            ('amounts.amount[2].amount', 3, 'PackedDecimalField'),
+            ('filler_2', 3, 'StringField'),
+        ], layout_of(self.record_class))
+        self.assertEqual(103, len(self.record_class))
+
+    def test_sets_decimals_and_signs(self):
+        premium = self.record_class.base_fields['premium']
+        self.assertEqual((2, True), (premium.decimals, premium.signed))
+        self.assertEqual(4, self.record_class.base_fields['rate'].decimals)
+
+    def test_groups_are_nested_record_classes(self):
+        insured = self.record_class.base_fields['insured']
+        self.assertIsInstance(insured, fields.ListField)
+        self.assertIs(self.record_class.Insured, insured.record_class)
+        self.assertEqual('PolicyRecord.Insured', self.record_class.Insured.__qualname__)
+
+    def test_sets_options_on_every_class(self):
+        self.assertEqual('cp037', self.record_class.encoding)
+        self.assertEqual('cp037', self.record_class.Insured.encoding)
+
+    def test_records_round_trip(self):
+        record = self.record_class(policy_number={'policy_number': 'P123'}, premium=Decimal('-1234.56'), term_months=12,
+                                   balance=Decimal('-42.10'), rate=Decimal('0.0525'))
+        decoded = self.record_class.from_record(record.to_bytes())
+        self.assertEqual(u'P123', decoded.policy_number.policy_number)
+        self.assertEqual((Decimal('-1234.56'), 12, Decimal('-42.10'), Decimal('0.0525')),
+                         (decoded.premium, decoded.term_months, decoded.balance, decoded.rate))
+
+    def test_builds_one_record_per_01_level(self):
+        records = copybook.load_copybook("""
+            01 HEADER.
+               05 RECORD-TYPE PIC X.
+               05 RUN-DATE PIC 9(8).
+            01 DETAIL REDEFINES HEADER.
+               05 RECORD-TYPE PIC X.
+               05 AMOUNT PIC 9(6)V99.
+        """)
+        self.assertEqual(['Header', 'Detail'], list(records))
+        self.assertEqual(['record_type', 'amount'], list(records['Detail'].base_fields))
+
+    def test_gathers_items_outside_01_levels_into_one_record(self):
+        records = copybook.load_copybook("05 NAME PIC X(5). 05 AGE PIC 99.", name='PERSON-DATA')
+        self.assertEqual([('name', 5, 'StringField'), ('age', 2, 'IntegerField')],
+                         layout_of(records['PersonData']))
+
+    def test_makes_cobol_names_into_attribute_names(self):
+        record_class = copybook.load_copybook("""
+            01 REC.
+               05 2ND-NAME PIC X.
+               05 CLASS PIC X.
+               05 LAYOUT PIC X.
+               05 ENCODING PIC X.
+               05 PIC X.
+        """)['Rec']
+        self.assertEqual(['f_2nd_name', 'class_', 'layout', 'encoding_', 'filler'], list(record_class.base_fields))
+
+    def test_redefined_groups_become_redefines_fields(self):
+        record_class = copybook.load_copybook("""
+            01 REC.
+               05 REC-TYPE PIC X.
+               05 AUTO-DETAIL.
+                  10 MAKE PIC X(6).
+                  10 MODEL-YEAR PIC 9(4).
+               05 HOME-DETAIL REDEFINES AUTO-DETAIL.
+                  10 SQUARE-FEET PIC 9(5).
+               05 RAW-DETAIL REDEFINES AUTO-DETAIL PIC X(10).
+               05 PREMIUM PIC 9(3).
+        """)['Rec']
+        field = record_class.base_fields['auto_detail']
+        self.assertIsInstance(field, fields.RedefinesField)
+        self.assertEqual(['auto_detail', 'home_detail', 'raw_detail'], list(field.records))
+        self.assertEqual(['rec_type', 'auto_detail', 'premium'], list(record_class.base_fields))
+        self.assertEqual(14, len(record_class))
+
+        record = record_class.from_record("H01800     045")
+        self.assertEqual(u'01800', record.auto_detail.make)
+        field.selector = lambda r: 'home_detail' if r.rec_type == 'H' else 'auto_detail'
+        record = record_class.from_record("H01800     045")
+        self.assertEqual((1800, 45), (record.auto_detail.square_feet, record.premium))
+        self.assertEqual(u'01800', field.view(record, 'raw_detail').raw_detail[:5])
+
+    def test_redefined_elementary_items_become_redefines_fields(self):
+        field = self.record_class.base_fields['policy_number']
+        self.assertIsInstance(field, fields.RedefinesField)
+        self.assertEqual(['policy_number', 'alt_number'], list(field.records))
+
+        record = self.record_class(policy_number=field.records['alt_number'](alt_number=42))
+        decoded = self.record_class.from_record(record.to_bytes())
+        self.assertEqual(u'0000000042', decoded.policy_number.policy_number)
+        self.assertEqual(42, field.view(decoded, 'alt_number').alt_number)
+
+    def test_reads_binary_sizes_from_digits(self):
+        record_class = copybook.load_copybook("""
+            01 REC.
+               05 A PIC 9(4) BINARY.
+               05 B PIC S9(9) USAGE IS COMP-5.
+               05 C PIC S9(18) COMPUTATIONAL.
+               05 D PIC 9(4) PACKED-DECIMAL.
+        """)['Rec']
+        self.assertEqual([2, 4, 8, 3], [f.length for f in record_class.base_fields.values()])
+        self.assertFalse(record_class.base_fields['a'].signed)
+
+    def test_occurs_depending_on_reads_occurrences_from_count(self):
+        record_class = copybook.load_copybook("""
+            01 REC.
+               05 N PIC 9.
+               05 ITEM PIC X(2) OCCURS 1 TO 5 TIMES DEPENDING ON N.
+               05 FLAG PIC X.
+        """)['Rec']
+        self.assertEqual('n', record_class.base_fields['item'].depending_on)
+        self.assertEqual(12, len(record_class))
+        record = record_class.from_record("2aabbY")
+        self.assertEqual(([u'aa', u'bb'], u'Y'), ([i.item for i in record.item], record.flag))
+        self.assertEqual("2aabbY", record.to_record())
+
+    def test_occurs_depending_on_needs_an_earlier_count(self):
+        with self.assertRaises(copybook.CopybookError):
+            copybook.load_copybook("01 REC. 05 ITEM PIC X OCCURS 1 TO 5 DEPENDING ON N. 05 N PIC 9.")
+
+    def test_edited_pictures_are_strings(self):
+        record_class = copybook.load_copybook("01 REC. 05 AMOUNT PIC ZZ,ZZ9.99-. 05 WHEN PIC 99/99/99.")['Rec']
+        self.assertEqual([('amount', 10, 'StringField'), ('when', 8, 'StringField')], layout_of(record_class))
+
+    def test_raises_for_unsupported_items(self):
+        for source in ("01 REC. 05 A PIC S9(5) SIGN LEADING.", "01 REC. 05 A COMP-1.", "01 REC. 05 A PIC X COMP-3.",
+                       "01 REC. 05 A PIC 9(3)PP.", "01 REC. 05 A.", "01 REC. 05 A PIC X", "REC PIC X."):
+            with self.assertRaises(copybook.CopybookError):
+                copybook.parse_copybook(source)
+
+
+class CopybookCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(copybook._layouts.clear)
+        copybook._layouts.clear()
+
+    def cache_files(self):
+        return [name for name in os.listdir(self.directory) if name.endswith('.json')]
+
+    def test_writes_layout_as_json(self):
+        copybook.load_copybook(POLICY, cache_dir=self.directory)
+        files = self.cache_files()
+        self.assertEqual(1, len(files))
+        with open(os.path.join(self.directory, files[0])) as f:
+            self.assertEqual(copybook.parse_copybook(POLICY), json.load(f))
+
+    def test_reads_layout_from_cache_instead_of_parsing(self):
+        copybook.load_copybook(POLICY, cache_dir=self.directory)
+        copybook._layouts.clear()
+        path = os.path.join(self.directory, self.cache_files()[0])
+        with open(path, 'w') as f:
+            json.dump([{'name': 'CACHED', 'fields': [{'name': 'X', 'field': 'StringField', 'args': {'length': 4}}]}], f)
+        self.assertEqual(['Cached'], list(copybook.load_copybook(POLICY, cache_dir=self.directory)))
+
+    def test_parses_again_when_cache_is_unreadable(self):
+        copybook.load_copybook(POLICY, cache_dir=self.directory)
+        copybook._layouts.clear()
+        with open(os.path.join(self.directory, self.cache_files()[0]), 'w') as f:
+            f.write('{not json')
+        self.assertEqual(['PolicyRecord'], list(copybook.load_copybook(POLICY, cache_dir=self.directory)))
+
+    def test_only_builds_known_fields_from_layout(self):
+        layout = [{'name': 'REC', 'fields': [{'name': 'X', 'field': 'FixedWidthField', 'args': {'length': 4}}]}]
+        with self.assertRaises(copybook.CopybookError):
+            copybook.build_records(layout)
+
+    def test_read_copybook_names_loose_items_after_the_file(self):
+        path = os.path.join(self.directory, 'person.cpy')
+        with open(path, 'w') as f:
+            f.write("       05 NAME PIC X(5).\n       05 AGE PIC 99.\n")
+        self.assertEqual(['Person'], list(copybook.read_copybook(path)))
+
+
+globals().update(copybook.load_copybook(POLICY, module=__name__))
+
+
+class CopybookPickleTests(unittest.TestCase):
+
+    @unittest.skipIf(six.PY2, "Python 2 pickles classes by __name__, so it can't find nested classes")
+    def test_records_pickle_when_given_their_module(self):
+        record = PolicyRecord(policy_number={'policy_number': 'P1'}, insured=[{'name': 'Ann', 'age': 30}])  # noqa F821
+        self.assertEqual(record.to_record(), pickle.loads(pickle.dumps(record)).to_record())
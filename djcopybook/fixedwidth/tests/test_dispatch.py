@@ -0,0 +1,88 @@
+import io
+import unittest
+
+from djcopybook import fixedwidth
+from djcopybook.fixedwidth import fields
+from djcopybook.fixedwidth.dispatch import RecordDispatcher
+
+
+class Header(fixedwidth.Record):
+    record_type = fields.StringField(length=2, default='HD')
+    batch = fields.IntegerField(length=4)
+
+
+class Detail(fixedwidth.Record):
+    record_type = fields.StringField(length=2, default='DT')
+    name = fields.StringField(length=6)
+    amount = fields.IntegerField(length=5)
+
+
+class Trailer(fixedwidth.Record):
+    record_type = fields.StringField(length=2, default='TR')
+    count = fields.IntegerField(length=3)
+
+
+class RecordDispatcherTests(unittest.TestCase):
+
+    lines = [u"HD0042", u"DTalice 00010", u"DTbob   00020", u"TR002"]
+
+    def get_dispatcher(self, **kwargs):
+        return RecordDispatcher(0, 2, {'HD': Header, 'DT': Detail, 'TR': Trailer}, **kwargs)
+
+    def assert_records(self, records):
+        records = list(records)
+        self.assertEqual([Header, Detail, Detail, Trailer], [type(r) for r in records])
+        self.assertEqual(42, records[0].batch)
+        self.assertEqual("bob", records[2].name)
+        self.assertEqual(2, records[3].count)
+
+    def test_get_record_class_looks_up_type_code(self):
+        self.assertIs(Detail, self.get_dispatcher().get_record_class("DTalice 00010"))
+
+    def test_get_record_class_uses_type_code_at_offset(self):
+        dispatcher = RecordDispatcher(2, 1, {'A': Header})
+        self.assertIs(Header, dispatcher.get_record_class("XXA"))
+
+    def test_from_record_returns_record_of_matching_class(self):
+        record = self.get_dispatcher().from_record("TR002")
+        self.assertIsInstance(record, Trailer)
+        self.assertEqual(2, record.count)
+
+    def test_from_record_reads_type_code_of_bytes(self):
+        for raw in (b"TR002", bytearray(b"TR002"), memoryview(b"TR002")):
+            record = self.get_dispatcher().from_record(raw)
+            self.assertIsInstance(record, Trailer)
+            self.assertEqual(2, record.count)
+
+    def test_raises_value_error_for_unknown_type_code(self):
+        with self.assertRaises(ValueError) as e:
+            self.get_dispatcher().from_record("ZZ123")
+        self.assertEqual("No record class for type code 'ZZ'.", str(e.exception))
+
+    def test_uses_default_record_class_for_unknown_type_code(self):
+        record = self.get_dispatcher(default=Trailer).from_record("ZZ123")
+        self.assertIsInstance(record, Trailer)
+
+    def test_iter_records_reads_mixed_records_separated_by_new_lines(self):
+        f = io.StringIO(u"\n".join(self.lines) + u"\n")
+        self.assert_records(self.get_dispatcher().iter_records(f))
+
+    def test_iter_records_reads_mixed_records_without_separators(self):
+        f = io.StringIO(u"".join(self.lines))
+        self.assert_records(self.get_dispatcher().iter_records(f, chunk_size=4))
+
+    def test_iter_records_reads_binary_streams(self):
+        f = io.BytesIO(u"\r\n".join(self.lines).encode('cp037'))
+        self.assert_records(self.get_dispatcher().iter_records(f, encoding='cp037'))
+
+    def test_iter_records_raises_value_error_when_record_is_cut_short(self):
+        f = io.StringIO(u"HD0042DTali")
+        with self.assertRaises(ValueError) as e:
+            list(self.get_dispatcher().iter_records(f))
+        self.assertEqual("Trailing data at position 6 is 5 characters long but the record is 13.", str(e.exception))
+
+    def test_iter_records_raises_value_error_when_separator_missing(self):
+        f = io.StringIO(u"HD0042\nDTalice 000100\nTR001\n")
+        with self.assertRaises(ValueError) as e:
+            list(self.get_dispatcher().iter_records(f))
+        self.assertEqual("Expected '\\n' after the record ending at position 20.", str(e.exception))
@@ -0,0 +1,78 @@
+import unittest
+
+from djcopybook import fixedwidth
+from djcopybook.fixedwidth import fields, layout
+from djcopybook.fixedwidth.tests import record_helper
+
+
+class LayoutTests(unittest.TestCase):
+
+    def test_record_class_has_layout_with_offset_and_length_of_each_field(self):
+        self.assertEqual(
+            [('field_one', 0, 5), ('field_two', 5, 7)],
+            [(entry.name, entry.offset, entry.length) for entry in record_helper.RecordOne.get_layout()],
+        )
+
+    def test_layout_holds_the_field_itself(self):
+        entry = record_helper.RecordOne.get_layout()[1]
+        self.assertIs(record_helper.RecordOne.base_fields['field_two'], entry.field)
+        self.assertEqual(12, entry.end)
+
+    def test_layout_uses_total_length_of_nested_fields(self):
+        self.assertEqual(
+            [('garf', 0, 16), ('new_line', 16, 1), ('threeve', 17, 30)],
+            [(entry.name, entry.offset, entry.length) for entry in record_helper.RecordFive.get_layout()],
+        )
+
+    def test_record_length_is_computed_once_for_the_class(self):
+        self.assertEqual(47, record_helper.RecordFive._length)
+        self.assertEqual(47, len(record_helper.RecordFive))
+
+    def test_fields_can_be_named_layout(self):
+
+        class Shelf(fixedwidth.Record):
+            layout = fields.StringField(length=4)
+            count = fields.IntegerField(length=2)
+
+        record = Shelf.from_record("GRID07")
+        self.assertEqual(("GRID", 7), (record.layout, record.count))
+        self.assertEqual("GRID07", record.to_record())
+        self.assertEqual(['layout', 'count'], [entry.name for entry in Shelf.get_layout()])
+
+    def test_raises_value_error_for_fields_named_after_record_options(self):
+        for name in ('encoding', 'lazy', 'compact', 'auto_truncate'):
+            with self.assertRaises(ValueError) as e:
+                type('Options', (fixedwidth.Record,), {name: fields.StringField(length=1)})
+            self.assertEqual("Options can't have a field named '{}', which is a record option.".format(name),
+                             str(e.exception))
+
+    def test_flat_layout_descends_into_fragments_and_lists(self):
+        flat = [(entry.name, entry.offset, entry.length) for entry in record_helper.RecordFive.flat_layout()]
+        self.assertEqual([
+            ('garf.frag.field_one', 0, 5),
+            ('garf.frag.field_two', 5, 7),
+            ('garf.new_line', 12, 1),
+            ('garf.other_field', 13, 3),
+            ('new_line', 16, 1),
+            ('threeve[0].frag.field_one', 17, 5),
+            ('threeve[0].frag.field_two', 22, 7),
+            ('threeve[0].other_field', 29, 3),
+            ('threeve[1].frag.field_one', 32, 5),
+            ('threeve[1].frag.field_two', 37, 7),
+            ('threeve[1].other_field', 44, 3),
+        ], flat)
+
+    def test_flat_layout_slices_match_record_values(self):
+        line = 'abc  0000100\nEEE\nAA   0000000BBBxy   0000001ZZZ'
+        entries = dict((entry.name, entry) for entry in record_helper.RecordFive.flat_layout())
+        entry = entries['threeve[1].frag.field_one']
+        self.assertEqual('xy   ', line[entry.offset:entry.end])
+
+
+class GetFieldLengthTests(unittest.TestCase):
+
+    def test_returns_length_of_regular_field(self):
+        self.assertEqual(5, layout.get_field_length(fields.StringField(length=5)))
+
+    def test_returns_total_length_of_list_field(self):
+        self.assertEqual(36, layout.get_field_length(fields.ListField(record_helper.RecordOne, length=3)))
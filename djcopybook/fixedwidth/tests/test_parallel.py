@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from djcopybook.fixedwidth import parallel
+from djcopybook.fixedwidth.tests import record_helper
+
+
+def field_two(record):
+    return record.field_two
+
+
+def odd_field_two(record):
+    if record.field_two % 2:
+        return record.field_two
+
+
+class ParseFileParallelTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def write_file(self, data):
+        path = os.path.join(self.tmp_dir, 'records.dat')
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def get_lines(self, count=10):
+        return [record_helper.RecordOne(field_two=i).to_record().encode('latin-1') for i in range(count)]
+
+    def parse(self, path, **kwargs):
+        return list(parallel.parse_file_parallel(record_helper.RecordOne, path, workers=2, chunk_records=3, **kwargs))
+
+    def test_parses_records_in_file_order(self):
+        path = self.write_file(b'\n'.join(self.get_lines()) + b'\n')
+        records = list(record_helper.RecordOne.parse_file_parallel(path, workers=2))
+        self.assertEqual(list(range(10)), [r.field_two for r in records])
+        self.assertEqual("AA", records[0].field_one)
+
+    def test_parses_records_split_into_several_ranges(self):
+        path = self.write_file(b'\r\n'.join(self.get_lines()))
+        self.assertEqual(list(range(10)), self.parse(path, func=field_two))
+
+    def test_parses_records_without_separators(self):
+        path = self.write_file(b''.join(self.get_lines()))
+        self.assertEqual(list(range(10)), self.parse(path, func=field_two))
+
+    def test_parses_ebcdic_files_written_by_write_many(self):
+        path = os.path.join(self.tmp_dir, 'ebcdic.dat')
+        with open(path, 'wb') as f:
+            record_helper.EbcdicRecord.write_many(({'amount': i} for i in range(10)), f)
+        records = parallel.parse_file_parallel(record_helper.EbcdicRecord, path, workers=2, chunk_records=3)
+        self.assertEqual(list(range(10)), [r.amount for r in records])
+
+    def test_returns_all_results_when_unordered(self):
+        path = self.write_file(b'\n'.join(self.get_lines()))
+        self.assertEqual(list(range(10)), sorted(self.parse(path, func=field_two, ordered=False)))
+
+    def test_leaves_out_none_results_of_func(self):
+        path = self.write_file(b'\n'.join(self.get_lines()))
+        self.assertEqual([1, 3, 5, 7, 9], self.parse(path, func=odd_field_two))
+
+    def test_returns_nothing_for_empty_file(self):
+        self.assertEqual([], self.parse(self.write_file(b'')))
+
+    def test_raises_value_error_when_file_is_not_whole_records(self):
+        path = self.write_file(b'\n'.join(self.get_lines(3)) + b'\nAA')
+        with self.assertRaises(ValueError) as e:
+            self.parse(path)
+        self.assertEqual("File is 41 bytes long, which isn't a whole number of 13 byte records.", str(e.exception))
+
+    def test_raises_value_error_when_separator_missing(self):
+        path = self.write_file(b'AA   0000001\nAA   00000022AA   0000003\n')
+        with self.assertRaises(ValueError) as e:
+            self.parse(path)
+        self.assertEqual("Expected '\\n' after the record ending at position 25.", str(e.exception))
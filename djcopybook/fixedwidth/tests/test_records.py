@@ -1,4 +1,8 @@
+# -*- coding: utf-8 -*-
+import datetime
 import unittest
+import warnings
+from decimal import Decimal
 
 from djcopybook import fixedwidth
 from djcopybook.fixedwidth import fields
@@ -12,19 +16,17 @@ class RecordTests(unittest.TestCase):
         self.assertEqual(['field_one', 'field_two'], list(r.fields.keys()))
         self.assertEqual(['field_one', 'field_two'], list(r.base_fields.keys()))
 
-    def test_sets_auto_truncate_field_on_fields_when_instantiated(self):
+    def test_shares_fields_with_record_class(self):
         r = record_helper.RecordOne()
+        self.assertIs(record_helper.RecordOne.base_fields, r.fields)
 
-        self.assertEqual(2, len(r.fields))
-        for field in r.fields.values():
-            self.assertEqual(False, field.auto_truncate)
+    def test_get_record_value_returns_fixed_width_value_of_field(self):
+        r = record_helper.RecordOne(field_two=12)
+        self.assertEqual("0000012", r.get_record_value('field_two'))
 
-    def test_sets_auto_truncate_field_on_fields_when_turned_on(self):
-        r = record_helper.RecordTwo()
-
-        self.assertEqual(4, len(r.fields))
-        for field in r.fields.values():
-            self.assertEqual(True, field.auto_truncate)
+    def test_get_record_value_truncates_when_auto_truncate_turned_on(self):
+        r = record_helper.RecordTwo(field_one="Too long")
+        self.assertEqual("Too l", r.get_record_value('field_one'))
 
     def test_record_inheritance_maintains_order(self):
         r = record_helper.RecordTwo()
@@ -124,3 +126,180 @@ class RecordTests(unittest.TestCase):
         r = TruncRecord(char="Too long", integer=12345)
         record = r.to_record()
         self.assertEqual("To123", record)
+
+
+class RecordHookTests(unittest.TestCase):
+
+    def test_from_record_calls_overridden_init(self):
+
+        class InitRecord(record_helper.RecordOne):
+            def __init__(self, **kwargs):
+                super(InitRecord, self).__init__(**kwargs)
+                self.source = "file"
+
+        r = InitRecord.from_record("abcde0000012")
+        self.assertEqual("file", r.source)
+        self.assertEqual(("abcde", 12), (r.field_one, r.field_two))
+
+    def test_to_record_calls_overridden_get_record_value(self):
+
+        class UpperRecord(record_helper.RecordOne):
+            def get_record_value(self, fieldname):
+                return super(UpperRecord, self).get_record_value(fieldname).upper()
+
+        r = UpperRecord(field_one="abc", field_two=7)
+        self.assertEqual("ABC  0000007", r.to_record())
+        self.assertEqual(b"ABC  0000007", r.to_bytes())
+
+    def test_init_calls_overridden_get_default_value_with_deprecation_warning(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+
+            class DefaultRecord(record_helper.RecordOne):
+                def get_default_value(self, field, kwargs):
+                    if field.attname == 'field_two':
+                        return kwargs.pop('field_two', 99)
+                    return super(DefaultRecord, self).get_default_value(field, kwargs)
+
+        self.assertEqual([DeprecationWarning], [w.category for w in caught])
+        self.assertEqual("AA   0000099", DefaultRecord().to_record())
+        self.assertEqual("xy   0000003", DefaultRecord(field_one="xy", field_two=3).to_record())
+
+    def test_records_without_overrides_have_no_hooks(self):
+        self.assertEqual(frozenset(), record_helper.RecordOne._hooks)
+
+
+class CompactRecordTests(unittest.TestCase):
+
+    def test_compact_record_stores_values_in_slots(self):
+        r = record_helper.CompactRecord(field_one="abc", field_two=5)
+        self.assertFalse(hasattr(r, '__dict__'))
+        self.assertEqual("abc", r.field_one)
+        self.assertEqual(5, r.field_two)
+
+    def test_compact_record_converts_to_and_from_record(self):
+        r = record_helper.CompactRecord.from_record("abc  0000005xyz  0000009")
+        self.assertEqual("xyz", r.frag.field_one)
+        r.field_two = 6
+        self.assertEqual("abc  0000006xyz  0000009", r.to_record())
+
+    def test_compact_record_returns_default_when_value_removed(self):
+        r = record_helper.CompactRecord(field_one="abc")
+        slot = record_helper.CompactRecord.base_fields['field_one'].storage_key
+        delattr(r, slot)
+        self.assertEqual("AA", r.field_one)
+
+    def test_compact_record_subclass_adds_slots_for_its_own_fields(self):
+
+        class CompactChild(record_helper.CompactRecord):
+            field_three = fields.StringField(length=2)
+
+        r = CompactChild(field_one="abc", field_three="zz")
+        self.assertFalse(hasattr(r, '__dict__'))
+        self.assertEqual(("abc", "zz"), (r.field_one, r.field_three))
+        self.assertEqual((CompactChild.base_fields['field_three'].storage_key,), CompactChild.__slots__)
+
+    def test_compact_record_can_extend_regular_record(self):
+
+        class CompactChild(record_helper.RecordOne):
+            compact = True
+            field_three = fields.StringField(length=2)
+
+        r = CompactChild.from_record("abc  0000001zz")
+        self.assertEqual(("abc", 1, "zz"), (r.field_one, r.field_two, r.field_three))
+
+    def test_regular_records_keep_instance_dict(self):
+        self.assertTrue(hasattr(record_helper.RecordOne(), '__dict__'))
+
+
+class LazyRecordTests(unittest.TestCase):
+
+    def test_from_record_keeps_raw_string_without_decoding_fields(self):
+        r = record_helper.LazyRecord.from_record("abc  0012016-03-04")
+        self.assertEqual("abc  0012016-03-04", r._raw)
+        self.assertFalse(hasattr(r, record_helper.LazyRecord.base_fields['born'].storage_key))
+
+    def test_decodes_field_on_first_access_and_keeps_value(self):
+        r = record_helper.LazyRecord.from_record("abc  0012016-03-04")
+        born_key = record_helper.LazyRecord.base_fields['born'].storage_key
+        self.assertEqual(datetime.date(2016, 3, 4), r.born)
+        self.assertEqual(datetime.date(2016, 3, 4), getattr(r, born_key))
+        self.assertEqual(1, r.count)
+
+    def test_to_record_reuses_raw_slices_of_untouched_fields(self):
+        r = record_helper.LazyRecord.from_record("abc  0012016-3-4  ")
+        r.count = 7
+        self.assertEqual("abc  0072016-3-4  ", r.to_record())
+
+    def test_to_record_copies_fields_that_were_only_read(self):
+        r = record_helper.LazyRecord.from_record("abc   122016-03-04")
+        self.assertEqual(12, r.count)
+        self.assertEqual("abc", r.name)
+        self.assertEqual("abc   122016-03-04", r.to_record())
+
+    def test_to_record_encodes_fields_set_to_a_new_value_after_reading(self):
+        r = record_helper.LazyRecord.from_record("abc   122016-03-04")
+        r.count = r.count + 1
+        self.assertEqual("abc  0132016-03-04", r.to_record())
+
+    def test_from_record_still_checks_length(self):
+        with self.assertRaises(ValueError):
+            record_helper.LazyRecord.from_record("abc")
+
+    def test_lazy_record_built_from_values_behaves_normally(self):
+        r = record_helper.LazyRecord(name="abc", born=datetime.date(2016, 3, 4))
+        self.assertEqual("abc", r.name)
+        self.assertEqual("abc  0002016-03-04", r.to_record())
+
+    def test_compact_lazy_record_keeps_raw_string_in_slot(self):
+        r = record_helper.CompactLazyRecord.from_record("abc  zz")
+        self.assertFalse(hasattr(r, '__dict__'))
+        self.assertEqual(("abc", "zz"), (r.name, r.extra))
+        r.extra = "yy"
+        self.assertEqual("abc  yy", r.to_record())
+        self.assertIsNone(getattr(record_helper.CompactLazyRecord(), '_raw', None))
+
+
+class BytesRecordTests(unittest.TestCase):
+
+    def test_from_record_decodes_bytes_with_class_encoding(self):
+        r = record_helper.EbcdicRecord.from_record(u"élan 0420".encode('cp037'))
+        self.assertEqual((u"élan", 420), (r.name, r.amount))
+
+    def test_from_record_accepts_bytearray_and_memoryview(self):
+        raw = u"abcde0042".encode('cp037')
+        for value in (bytearray(raw), memoryview(raw)):
+            r = record_helper.EbcdicRecord.from_record(value)
+            self.assertEqual(("abcde", 42), (r.name, r.amount))
+
+    def test_from_record_decodes_non_ascii_bytearray_and_memoryview(self):
+        raw = u"\xe9t\xe9  0042".encode('cp037')
+        for value in (bytearray(raw), memoryview(raw)):
+            r = record_helper.EbcdicRecord.from_record(value)
+            self.assertEqual((u"\xe9t\xe9", 42), (r.name, r.amount))
+            self.assertEqual(raw, r.to_bytes())
+
+    def test_to_bytes_encodes_with_class_encoding(self):
+        r = record_helper.EbcdicRecord(name=u"élan", amount=7)
+        self.assertEqual(u"élan 0007".encode('cp037'), r.to_bytes())
+
+    def test_default_encoding_is_latin_1(self):
+        r = record_helper.RecordOne.from_record(b"\xe9    0000003")
+        self.assertEqual((u"\xe9", 3), (r.field_one, r.field_two))
+        self.assertEqual(b"\xe9    0000003", r.to_bytes())
+
+    def test_binary_fields_get_their_raw_bytes(self):
+        raw = u"abc ".encode('cp037') + b"\x12\x34\x5d\x01\x02"
+        r = record_helper.PackedRecord.from_record(raw)
+        self.assertEqual(("abc", Decimal("-123.45"), 258), (r.name, r.amount, r.count))
+        self.assertEqual(raw, r.to_bytes())
+
+    def test_binary_fields_round_trip_through_text(self):
+        r = record_helper.PackedRecord(name="x", amount=Decimal("1.5"), count=-1)
+        self.assertEqual(r.to_bytes(), record_helper.PackedRecord.from_record(r.to_record()).to_bytes())
+        self.assertEqual(u"x   ".encode('cp037') + b"\x00\x15\x0c\xff\xff", r.to_bytes())
+
+    def test_lazy_records_decode_bytes_once(self):
+        r = record_helper.LazyRecord.from_record(b"abc  0012016-03-04")
+        self.assertEqual(u"abc  0012016-03-04", r._raw)
+        self.assertEqual(1, r.count)
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+from djcopybook import fixedwidth
+from djcopybook.fixedwidth import fields
+from djcopybook.fixedwidth import streams
+from djcopybook.fixedwidth.tests import record_helper
+
+
+class CountingReader(object):
+
+    def __init__(self, data):
+        self.stream = io.StringIO(data)
+        self.reads = 0
+
+    def read(self, size):
+        self.reads += 1
+        return self.stream.read(size)
+
+
+class IterRecordsTests(unittest.TestCase):
+
+    def assert_records(self, records, *expected):
+        self.assertEqual(list(expected), [(r.field_one, r.field_two) for r in records])
+
+    def test_reads_records_separated_by_new_lines(self):
+        f = io.StringIO(u"aaaaa0000001\nbbbbb0000002\n")
+        self.assert_records(record_helper.RecordOne.iter_records(f), ("aaaaa", 1), ("bbbbb", 2))
+
+    def test_reads_records_separated_by_carriage_return_line_feeds(self):
+        f = io.StringIO(u"aaaaa0000001\r\nbbbbb0000002\r\n", newline='')
+        self.assert_records(record_helper.RecordOne.iter_records(f), ("aaaaa", 1), ("bbbbb", 2))
+
+    def test_reads_records_with_no_separator(self):
+        f = io.StringIO(u"aaaaa0000001bbbbb0000002ccccc0000003")
+        records = record_helper.RecordOne.iter_records(f)
+        self.assert_records(records, ("aaaaa", 1), ("bbbbb", 2), ("ccccc", 3))
+
+    def test_reads_last_record_without_trailing_new_line(self):
+        f = io.StringIO(u"aaaaa0000001\nbbbbb0000002")
+        self.assert_records(record_helper.RecordOne.iter_records(f), ("aaaaa", 1), ("bbbbb", 2))
+
+    def test_reads_records_across_chunk_boundaries(self):
+        f = io.StringIO(u"aaaaa0000001\nbbbbb0000002\nccccc0000003\n")
+        records = record_helper.RecordOne.iter_records(f, chunk_size=5)
+        self.assert_records(records, ("aaaaa", 1), ("bbbbb", 2), ("ccccc", 3))
+
+    def test_reads_binary_streams(self):
+        f = io.BytesIO(b"aaaaa0000001\r\nbbbbb0000002\r\n")
+        records = list(record_helper.RecordOne.iter_records(f))
+        self.assert_records(records, (u"aaaaa", 1), (u"bbbbb", 2))
+
+    def test_decodes_binary_streams_with_given_encoding(self):
+        f = io.BytesIO(u"éaaaa0000001".encode('cp037'))
+        records = record_helper.RecordOne.iter_records(f, encoding='cp037')
+        self.assert_records(records, (u"éaaaa", 1))
+
+    def test_decodes_binary_streams_with_class_encoding_by_default(self):
+        f = io.BytesIO(u"élan 0001abcde0002".encode('cp037'))
+        records = [(r.name, r.amount) for r in record_helper.EbcdicRecord.iter_records(f, newline='')]
+        self.assertEqual([(u"élan", 1), (u"abcde", 2)], records)
+
+    def test_uses_explicit_newline(self):
+        f = io.StringIO(u"aaaaa0000001|bbbbb0000002|")
+        records = record_helper.RecordOne.iter_records(f, newline='|')
+        self.assert_records(records, ("aaaaa", 1), ("bbbbb", 2))
+
+    def test_keeps_new_line_fields_inside_records(self):
+        line = u"abc  0000100\nEEE\nAA   0000000BBBAA   0000000BBB"
+        f = io.StringIO(line + u"\n" + line + u"\n")
+        records = list(record_helper.RecordFive.iter_records(f))
+        self.assertEqual([line, line], [r.to_record() for r in records])
+
+    def test_yields_records_lazily(self):
+        f = CountingReader(u"aaaaa0000001\n" * 100)
+        records = record_helper.RecordOne.iter_records(f, chunk_size=26)
+        next(records)
+        self.assertEqual(1, f.reads)
+
+    def test_yields_nothing_for_empty_stream(self):
+        self.assertEqual([], list(record_helper.RecordOne.iter_records(io.StringIO(u""))))
+
+    def test_raises_value_error_when_separator_missing(self):
+        f = io.StringIO(u"aaaaa0000001\nbbbbb000002\nccccc0000003\n")
+        with self.assertRaises(ValueError) as e:
+            list(record_helper.RecordOne.iter_records(f))
+        self.assertEqual("Expected '\\n' after the record ending at position 25.", str(e.exception))
+
+    def test_raises_value_error_when_trailing_data_is_not_a_record(self):
+        f = io.StringIO(u"aaaaa0000001bbbbb")
+        with self.assertRaises(ValueError) as e:
+            list(record_helper.RecordOne.iter_records(f, newline=''))
+        self.assertEqual("Trailing data at position 12 is 5 characters long but records are 12.", str(e.exception))
+
+
+class DetectNewlineTests(unittest.TestCase):
+
+    def test_detects_line_break_after_first_record(self):
+        self.assertEqual('\r\n', streams.detect_newline(u"abc\r\ndef", 3))
+        self.assertEqual('\n', streams.detect_newline(b"abc\ndef", 3))
+        self.assertEqual('', streams.detect_newline(u"abcdef", 3))
+
+
+class CountingWriter(object):
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, val):
+        self.writes.append(val)
+
+
+class LineRecord(fixedwidth.Record):
+    name = fields.StringField(length=3)
+    new_line = fields.NewLineField()
+
+
+class WriteManyTests(unittest.TestCase):
+
+    def test_writes_each_record_followed_by_new_line(self):
+        f = io.StringIO()
+        records = [record_helper.RecordOne(field_one="aaaaa", field_two=1), record_helper.RecordOne(field_two=2)]
+        record_helper.RecordOne.write_many(records, f)
+        self.assertEqual(u"aaaaa0000001\nAA   0000002\n", f.getvalue())
+
+    def test_writes_records_given_as_dicts(self):
+        f = io.StringIO()
+        record_helper.RecordOne.write_many([{'field_one': 'bbbbb', 'field_two': 5}], f)
+        self.assertEqual(u"bbbbb0000005\n", f.getvalue())
+
+    def test_does_not_add_newline_when_layout_ends_in_new_line_field(self):
+        f = io.StringIO()
+        LineRecord.write_many([{'name': 'x'}, {'name': 'y'}], f)
+        self.assertEqual(u"x  \ny  \n", f.getvalue())
+        f.seek(0)
+        self.assertEqual(['x', 'y'], [r.name for r in LineRecord.iter_records(f, newline='')])
+
+    def test_adds_given_newline_when_layout_ends_in_new_line_field(self):
+        f = io.StringIO()
+        LineRecord.write_many([{'name': 'x'}], f, newline='\r\n')
+        self.assertEqual(u"x  \n\r\n", f.getvalue())
+
+    def test_writes_records_with_given_newline(self):
+        f = io.StringIO()
+        record_helper.RecordOne.write_many([{}, {}], f, newline='')
+        self.assertEqual(u"AA   0000000AA   0000000", f.getvalue())
+
+    def test_writes_encoded_bytes_to_binary_streams(self):
+        f = io.BytesIO()
+        record_helper.RecordOne.write_many([{'field_one': u'é'}], f, newline='\r\n', encoding='cp037')
+        self.assertEqual(u"é    0000000\r\n".encode('cp037'), f.getvalue())
+
+    def test_encodes_with_class_encoding_by_default(self):
+        f = io.BytesIO()
+        record_helper.EbcdicRecord.write_many([{'name': u'é'}], f, newline='')
+        self.assertEqual(u"é    0000".encode('cp037'), f.getvalue())
+
+    def test_accepts_generators_and_returns_count(self):
+        f = io.StringIO()
+        count = record_helper.RecordOne.write_many(({'field_two': i} for i in range(3)), f)
+        self.assertEqual(3, count)
+        self.assertEqual(3, len(f.getvalue().splitlines()))
+
+    def test_writes_in_batches(self):
+        f = CountingWriter()
+        record_helper.RecordOne.write_many(({'field_two': i} for i in range(5)), f, batch_size=2)
+        self.assertEqual([26, 26, 13], [len(w) for w in f.writes])
+
+    def test_round_trips_ebcdic_with_iter_records(self):
+        records = [{'name': u'\xe9t\xe9', 'amount': 1}, {'name': u'ab', 'amount': 2}, {'amount': 3}]
+        for newline in (None, '\n', '\r\n'):
+            f = io.BytesIO()
+            record_helper.EbcdicRecord.write_many(records, f, newline=newline)
+            f.seek(0)
+            read = [(r.name, r.amount) for r in record_helper.EbcdicRecord.iter_records(f)]
+            self.assertEqual([(u'\xe9t\xe9', 1), (u'ab', 2), (u'', 3)], read)
+
+    def test_round_trips_with_iter_records(self):
+        f = io.BytesIO()
+        line = "abc  0000100\nEEE\nAA   0000000BBBAA   0000000BBB"
+        records = [record_helper.RecordFive.from_record(line)] * 3
+        record_helper.RecordFive.write_many(records, f)
+        f.seek(0)
+        self.assertEqual([line] * 3, [r.to_record() for r in record_helper.RecordFive.iter_records(f)])
+
+
+class RecordFileTests(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def open_file(self, data, **kwargs):
+        path = os.path.join(self.tmp_dir, 'records.dat')
+        with open(path, 'wb') as f:
+            f.write(data)
+        return streams.RecordFile(record_helper.RecordOne, path, **kwargs)
+
+    def get_data(self, separator=b'\n', count=5):
+        return separator.join(u"AA   {:07d}".format(i).encode('latin-1') for i in range(count)) + separator
+
+    def test_reads_ebcdic_files_written_by_write_many(self):
+        path = os.path.join(self.tmp_dir, 'ebcdic.dat')
+        with open(path, 'wb') as f:
+            record_helper.EbcdicRecord.write_many(({'amount': i} for i in range(3)), f)
+        with streams.RecordFile(record_helper.EbcdicRecord, path) as records:
+            self.assertEqual('\n', records.newline)
+            self.assertEqual([0, 1, 2], [r.amount for r in records])
+
+    def test_len_is_number_of_records_in_file(self):
+        with self.open_file(self.get_data()) as records:
+            self.assertEqual(5, len(records))
+
+    def test_returns_record_at_index(self):
+        with self.open_file(self.get_data(b'\r\n')) as records:
+            self.assertEqual(3, records[3].field_two)
+            self.assertEqual(4, records[-1].field_two)
+            self.assertEqual('\r\n', records.newline)
+
+    def test_raises_index_error_when_index_out_of_range(self):
+        with self.open_file(self.get_data()) as records:
+            with self.assertRaises(IndexError):
+                records[5]
+            with self.assertRaises(IndexError):
+                records[-6]
+
+    def test_returns_list_of_records_for_slice(self):
+        with self.open_file(self.get_data(b'')) as records:
+            self.assertEqual([1, 3], [r.field_two for r in records[1:5:2]])
+
+    def test_iterates_forwards_and_in_reverse(self):
+        with self.open_file(self.get_data()[:-1]) as records:
+            self.assertEqual([0, 1, 2, 3, 4], [r.field_two for r in records])
+            self.assertEqual([4, 3, 2, 1, 0], [r.field_two for r in reversed(records)])
+
+    def test_accepts_open_binary_file(self):
+        path = os.path.join(self.tmp_dir, 'records.dat')
+        with open(path, 'wb') as f:
+            f.write(self.get_data())
+        with open(path, 'rb') as f:
+            with streams.RecordFile(record_helper.RecordOne, f) as records:
+                self.assertEqual(2, records[2].field_two)
+
+    def test_empty_file_has_no_records(self):
+        with self.open_file(b'') as records:
+            self.assertEqual(0, len(records))
+            self.assertEqual([], list(records))
+
+    def test_raises_value_error_when_file_is_not_whole_records(self):
+        with self.assertRaises(ValueError):
+            self.open_file(self.get_data() + b'AA')
+
+    def test_raises_value_error_when_separator_missing(self):
+        with self.open_file(b'AA   0000001\nAA   00000022AA   0000003\n') as records:
+            with self.assertRaises(ValueError):
+                records[1]
+
+    def test_decodes_with_class_encoding_by_default(self):
+        path = os.path.join(self.tmp_dir, 'ebcdic.dat')
+        with open(path, 'wb') as f:
+            f.write(u"élan 0001abcde0002".encode('cp037'))
+        with streams.RecordFile(record_helper.EbcdicRecord, path, newline='') as records:
+            self.assertEqual((u"élan", 1), (records[0].name, records[0].amount))
+            self.assertEqual('cp037', records.encoding)
@@ -0,0 +1,172 @@
+import io
+import unittest
+
+from djcopybook.fixedwidth import streams
+from djcopybook.fixedwidth.tests import record_helper
+from djcopybook.fixedwidth.validation import RecordError, ValidationReport
+
+
+class ValidatedIterRecordsTests(unittest.TestCase):
+
+    def iter_records(self, data, **kwargs):
+        report = ValidationReport(**kwargs.pop('report', {}))
+        records = list(record_helper.RecordOne.iter_records(data, errors=report, **kwargs))
+        return [(r.field_one, r.field_two) for r in records], report
+
+    def test_yields_every_record_of_a_good_file(self):
+        records, report = self.iter_records(io.StringIO(u"aaaaa0000001\nbbbbb0000002\n"))
+        self.assertEqual([("aaaaa", 1), ("bbbbb", 2)], records)
+        self.assertEqual((2, 0, 0, []), (report.rows, report.bad_rows, len(report), report.errors))
+        self.assertFalse(report)
+
+    def test_skips_rows_with_fields_that_wont_convert(self):
+        records, report = self.iter_records(io.StringIO(u"aaaaa0000001\nbbbbb00000x2\nccccc0000003\n"))
+        self.assertEqual([("aaaaa", 1), ("ccccc", 3)], records)
+        self.assertEqual(1, report.bad_rows)
+        error = report.errors[0]
+        self.assertEqual((1, 'field_two', u'00000x2'), error[:3])
+        self.assertIn('invalid literal', error.message)
+
+    def test_carries_on_after_a_short_row(self):
+        records, report = self.iter_records(io.StringIO(u"aaaaa0000001\nbbb0002\nccccc0000003\n"))
+        self.assertEqual([("aaaaa", 1), ("ccccc", 3)], records)
+        self.assertEqual([RecordError(1, None, u"bbb0002", "Fixed width record length is 7 but should be 12.")],
+                         report.errors)
+
+    def test_carries_on_after_a_long_row(self):
+        records, report = self.iter_records(io.StringIO(u"aaaaa0000001\nbbbbbbb0000002\nccccc0000003"))
+        self.assertEqual([("aaaaa", 1), ("ccccc", 3)], records)
+        self.assertEqual([(1, None, u"bbbbbbb0000002")], [e[:3] for e in report.errors])
+
+    def test_finds_the_separator_when_the_first_row_is_short(self):
+        records, report = self.iter_records(io.StringIO(u"aaa1\r\nbbbbb0000002\r\n", newline=''))
+        self.assertEqual([("bbbbb", 2)], records)
+        self.assertEqual([(0, None, u"aaa1")], [e[:3] for e in report.errors])
+
+    def test_finds_the_separator_when_the_first_row_is_long(self):
+        records, report = self.iter_records(io.StringIO(u"AA   00000012345\nAA   0000002\nAA   0000003\n"))
+        self.assertEqual([("AA", 2), ("AA", 3)], records)
+        self.assertEqual([(0, None, u"AA   00000012345")], [e[:3] for e in report.errors])
+
+    def test_does_not_take_line_breaks_inside_packed_records_for_separators(self):
+        records, report = self.iter_records(io.StringIO(u"aaaaa0000001b\nbbb0000002ccccc0000003"))
+        self.assertEqual([("aaaaa", 1), ("b\nbbb", 2), ("ccccc", 3)], records)
+        self.assertFalse(report)
+
+    def test_reports_rows_that_fail_outside_their_fields(self):
+
+        class FailingRecord(record_helper.RecordOne):
+            @classmethod
+            def from_record(cls, record):
+                if record.startswith('b'):
+                    raise ValueError("no b's")
+                return super(FailingRecord, cls).from_record(record)
+
+        report = ValidationReport()
+        records = list(FailingRecord.iter_records(io.StringIO(u"aaaaa0000001\nbbbbb0000002\n"), errors=report))
+        self.assertEqual(["aaaaa"], [r.field_one for r in records])
+        self.assertEqual([(1, None, u"bbbbb0000002")], [e[:3] for e in report.errors])
+        self.assertEqual("no b's", report.errors[0].message)
+
+    def test_reports_leftovers_at_the_end_of_the_stream(self):
+        records, report = self.iter_records(io.StringIO(u"aaaaa0000001bbbbb0000002ccc"), newline='')
+        self.assertEqual([("aaaaa", 1), ("bbbbb", 2)], records)
+        self.assertEqual([(2, None, u"ccc")], [e[:3] for e in report.errors])
+
+    def test_carries_on_across_chunk_boundaries(self):
+        data = io.StringIO(u"aaaaa0000001\n" + u"x" * 30 + u"\nccccc0000003\n")
+        records, report = self.iter_records(data, chunk_size=5)
+        self.assertEqual([("aaaaa", 1), ("ccccc", 3)], records)
+        self.assertEqual([(1, None, u"x" * 30)], [e[:3] for e in report.errors])
+
+    def test_checks_binary_streams(self):
+        records, report = self.iter_records(io.BytesIO(b"aaaaa0000001\r\nbbbbb000000x\r\n"))
+        self.assertEqual([(u"aaaaa", 1)], records)
+        self.assertEqual([(1, 'field_two', u"000000x")], [e[:3] for e in report.errors])
+
+    def test_keeps_errors_up_to_max_errors_but_counts_them_all(self):
+        data = io.StringIO(u"aaaaa000000x\n" * 5)
+        records, report = self.iter_records(data, report={'max_errors': 2})
+        self.assertEqual([], records)
+        self.assertEqual([0, 1], [e.row for e in report.errors])
+        self.assertEqual((5, 5, 5), (report.rows, report.bad_rows, len(report)))
+        self.assertTrue(report.truncated)
+
+    def test_keeps_every_error_without_max_errors(self):
+        records, report = self.iter_records(io.StringIO(u"aaaaa000000x\n" * 150), report={'max_errors': None})
+        self.assertEqual(150, len(report.errors))
+        self.assertFalse(report.truncated)
+
+    def test_names_fields_inside_fragments(self):
+        report = ValidationReport()
+        data = io.StringIO(u"aaaaa000000xBBB\nbbbbb0000002BBB\n")
+        records = list(record_helper.RecordThree.iter_records(data, errors=report))
+        self.assertEqual([u"bbbbb"], [r.frag.field_one for r in records])
+        self.assertEqual([(0, 'frag.field_two', u"000000x")], [e[:3] for e in report.errors])
+
+    def test_checks_every_field_of_lazy_records(self):
+        report = ValidationReport()
+        data = io.StringIO(u"abcde1002016-01-01\nabcdexxx2016-13-01\n")
+        records = list(record_helper.LazyRecord.iter_records(data, errors=report))
+        self.assertEqual([u"abcde"], [r.name for r in records])
+        self.assertEqual([(1, 'count', u"xxx"), (1, 'born', u"2016-13-01")], [e[:3] for e in report.errors])
+
+    def test_raises_on_first_bad_row_without_a_report(self):
+        data = io.StringIO(u"aaaaa0000001\nbbbbb00000x2\n")
+        with self.assertRaises(ValueError):
+            list(record_helper.RecordOne.iter_records(data))
+
+
+class ValidateTests(unittest.TestCase):
+
+    def test_returns_report_of_whole_file(self):
+        data = io.StringIO(u"aaaaa0000001\nbbbbb00000x2\nccc\n")
+        report = record_helper.RecordOne.validate(data, max_errors=1)
+        self.assertEqual((3, 2, 2), (report.rows, report.bad_rows, len(report)))
+        self.assertEqual([(1, 'field_two')], [e[:2] for e in report.errors])
+
+    def test_report_reads_as_summary(self):
+        report = record_helper.RecordOne.validate(io.StringIO(u"aaaaa00000x1\nbbb\n"), max_errors=1)
+        lines = str(report).splitlines()
+        self.assertEqual("2 of 2 rows had 2 errors.", lines[0])
+        self.assertTrue(lines[1].startswith("  row 0 field_two: "))
+        self.assertEqual("  ... and 1 more.", lines[2])
+
+
+class ValidatedWriteManyTests(unittest.TestCase):
+
+    def test_leaves_out_records_that_wont_encode(self):
+        report = ValidationReport()
+        records = [{'field_one': 'a', 'field_two': 1}, {'field_one': 'a', 'field_two': 'x'},
+                   {'field_one': 'abcdefg', 'field_two': 3}, {'field_one': 'd', 'field_two': 4}]
+        f = io.StringIO()
+        count = record_helper.RecordOne.write_many(records, f, errors=report)
+        self.assertEqual(2, count)
+        self.assertEqual(u"a    0000001\nd    0000004\n", f.getvalue())
+        self.assertEqual([(1, 'field_two', 'x'), (2, 'field_one', 'abcdefg')], [e[:3] for e in report.errors])
+        self.assertEqual((4, 2), (report.rows, report.bad_rows))
+
+    def test_checks_record_instances(self):
+        report = ValidationReport()
+        record = record_helper.RecordOne(field_two=1)
+        record.field_two = 123456789
+        f = io.StringIO()
+        count = streams.write_many(record_helper.RecordOne, [record], f, errors=report)
+        self.assertEqual((0, u""), (count, f.getvalue()))
+        self.assertEqual([(0, 'field_two', 123456789)], [e[:3] for e in report.errors])
+
+    def test_truncates_values_of_auto_truncate_records(self):
+        report = ValidationReport()
+        f = io.StringIO()
+        record_helper.RecordTwo.write_many([{'field_one': 'abcdefgh'}], f, errors=report)
+        self.assertFalse(report)
+
+
+class FindErrorsTests(unittest.TestCase):
+
+    def test_finds_nothing_wrong_with_good_record(self):
+        self.assertEqual([], record_helper.RecordOne._codec.find_errors(u"aaaaa0000001"))
+
+    def test_finds_every_bad_field(self):
+        errors = record_helper.RecordTwo._codec.find_errors(u"aaaaa00000x1123.4567xyz")
+        self.assertEqual(['field_two', 'field_three', 'field_four'], [name for name, _, _ in errors])
@@ -0,0 +1,143 @@
+import io
+import os
+import tempfile
+import unittest
+
+from djcopybook import fixedwidth
+from djcopybook.fixedwidth import columnar
+from djcopybook.fixedwidth import fields
+from djcopybook.fixedwidth import streams
+from djcopybook.fixedwidth.dispatch import RecordDispatcher
+from djcopybook.fixedwidth.tests.record_helper import ClaimsRecord, RecordOne
+from djcopybook.fixedwidth.validation import ValidationReport
+
+TWO_CLAIMS = u"P00102aaaaa0000001bbbbb0000002A"
+NO_CLAIMS = u"P00200X"
+
+
+class VariableRecordTests(unittest.TestCase):
+
+    def test_class_length_is_longest_record(self):
+        self.assertEqual(127, len(ClaimsRecord))
+
+    def test_decodes_as_many_occurrences_as_count_says(self):
+        record = ClaimsRecord.from_record(TWO_CLAIMS)
+        self.assertEqual(2, record.claim_count)
+        self.assertEqual([u"aaaaa", u"bbbbb"], [claim.field_one for claim in record.claims])
+        self.assertEqual(u"A", record.status)
+
+    def test_decodes_record_without_occurrences(self):
+        record = ClaimsRecord.from_record(NO_CLAIMS)
+        self.assertEqual(([], u"X"), (record.claims, record.status))
+
+    def test_decodes_bytes(self):
+        self.assertEqual(u"A", ClaimsRecord.from_record(TWO_CLAIMS.encode('latin-1')).status)
+
+    def test_writes_count_from_length_of_list(self):
+        record = ClaimsRecord(policy='P001', claim_count=7, status='A', claims=[
+            RecordOne(field_one='aaaaa', field_two=1), RecordOne(field_one='bbbbb', field_two=2)])
+        self.assertEqual(TWO_CLAIMS, record.to_record())
+        self.assertEqual(31, len(record))
+
+    def test_round_trips(self):
+        self.assertEqual(NO_CLAIMS, ClaimsRecord.from_record(NO_CLAIMS).to_record())
+        self.assertEqual(TWO_CLAIMS, ClaimsRecord.from_record(TWO_CLAIMS).to_record())
+
+    def test_raises_when_record_is_not_as_long_as_count_says(self):
+        with self.assertRaises(ValueError) as cm:
+            ClaimsRecord.from_record(TWO_CLAIMS + u" ")
+        self.assertEqual("Fixed width record length is 32 but should be 31.", str(cm.exception))
+
+    def test_raises_when_count_is_out_of_range(self):
+        with self.assertRaises(ValueError) as cm:
+            ClaimsRecord.from_record(u"P00111" + u"aaaaa0000001" * 11 + u"A")
+        self.assertIn("'claims' occurs 11 times", str(cm.exception))
+
+    def test_raises_when_writing_too_many_occurrences(self):
+        record = ClaimsRecord(claims=[RecordOne()] * 11)
+        with self.assertRaises(fields.FieldLengthError):
+            record.to_record()
+
+    def test_measure_reads_length_from_count(self):
+        codec = ClaimsRecord._codec
+        self.assertEqual(31, codec.measure(TWO_CLAIMS))
+        self.assertEqual(7, codec.measure(TWO_CLAIMS.encode('latin-1') + NO_CLAIMS.encode('latin-1'), 31))
+        self.assertEqual(12, RecordOne._codec.measure(u""))
+
+    def test_finds_errors_at_offsets_count_gives(self):
+        errors = ClaimsRecord._codec.find_errors(u"P00102aaaaa0000001bbbbb00000x2A")
+        self.assertEqual([('claims', u"aaaaa0000001bbbbb00000x2")], [e[:2] for e in errors])
+
+
+class SharedCountRecord(fixedwidth.Record):
+    count = fields.IntegerField(length=1)
+    names = fields.ListField(record=RecordOne, length=3, depending_on='count')
+    ages = fields.ListField(record=RecordOne, length=3, depending_on='count')
+
+
+class VariableRecordDeclarationTests(unittest.TestCase):
+
+    def test_lists_sharing_a_count_must_be_the_same_length(self):
+        with self.assertRaises(ValueError):
+            SharedCountRecord(names=[RecordOne()], ages=[]).to_record()
+
+    def test_count_must_be_an_earlier_field(self):
+        with self.assertRaises(ValueError):
+            type('LaterCount', (fixedwidth.Record,), {
+                'items': fields.ListField(record=RecordOne, length=2, depending_on='count'),
+                'count': fields.IntegerField(length=1),
+            })
+
+    def test_cant_be_lazy(self):
+        with self.assertRaises(ValueError):
+            type('LazyClaims', (fixedwidth.Record,), {
+                'lazy': True,
+                'count': fields.IntegerField(length=1),
+                'items': fields.ListField(record=RecordOne, length=2, depending_on='count'),
+            })
+
+    def test_cant_be_nested(self):
+        with self.assertRaises(ValueError):
+            type('NestedClaims', (fixedwidth.Record,), {'claims': fields.FragmentField(record=ClaimsRecord)})
+
+
+class VariableStreamTests(unittest.TestCase):
+
+    def policies(self, records):
+        return [(r.policy, len(r.claims), r.status) for r in records]
+
+    def test_iter_records_reads_records_of_different_lengths(self):
+        for newline in ('\n', '\r\n', ''):
+            data = io.StringIO(newline.join([TWO_CLAIMS, NO_CLAIMS, TWO_CLAIMS]) + newline, newline='')
+            records = ClaimsRecord.iter_records(data, chunk_size=5)
+            self.assertEqual([(u"P001", 2, u"A"), (u"P002", 0, u"X"), (u"P001", 2, u"A")], self.policies(records))
+
+    def test_iter_records_reads_binary_streams(self):
+        data = io.BytesIO(u"\n".join([NO_CLAIMS, TWO_CLAIMS]).encode('latin-1'))
+        self.assertEqual([(u"P002", 0, u"X"), (u"P001", 2, u"A")], self.policies(ClaimsRecord.iter_records(data)))
+
+    def test_write_many_writes_each_record_at_its_length(self):
+        f = io.StringIO()
+        ClaimsRecord.write_many([ClaimsRecord.from_record(NO_CLAIMS), ClaimsRecord.from_record(TWO_CLAIMS)], f)
+        self.assertEqual(NO_CLAIMS + u"\n" + TWO_CLAIMS + u"\n", f.getvalue())
+
+    def test_validation_carries_on_after_bad_rows(self):
+        report = ValidationReport()
+        data = io.StringIO(u"\n".join([TWO_CLAIMS, u"P003xxA", TWO_CLAIMS[:-3], NO_CLAIMS]))
+        records = ClaimsRecord.iter_records(data, errors=report)
+        self.assertEqual([(u"P001", 2, u"A"), (u"P002", 0, u"X")], self.policies(records))
+        self.assertEqual([(1, None), (2, None)], [e[:2] for e in report.errors])
+
+    def test_dispatcher_measures_each_record_by_its_count(self):
+        dispatcher = RecordDispatcher(0, 1, {'P': ClaimsRecord, 'a': RecordOne})
+        data = io.StringIO(TWO_CLAIMS + NO_CLAIMS + u"aaaaa0000009")
+        records = list(dispatcher.iter_records(data, newline=''))
+        self.assertEqual([ClaimsRecord, ClaimsRecord, RecordOne], [type(r) for r in records])
+
+    def test_readers_needing_one_record_length_raise(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        for read in (lambda: streams.RecordFile(ClaimsRecord, path), lambda: columnar.decode_columns(ClaimsRecord, [])):
+            with self.assertRaises(ValueError):
+                read()
@@ -0,0 +1,74 @@
+from collections import namedtuple
+
+import six
+
+DEFAULT_MAX_ERRORS = 100
+
+
+class RecordError(namedtuple('RecordError', 'row field value message')):
+    """
+    One problem found with a row: its index in the stream, the name of the
+    field (None when it's the whole row, like a wrong length), the value
+    that failed and why.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        where = 'row {}'.format(self.row) if self.field is None else 'row {} {}'.format(self.row, self.field)
+        return '{}: {!r} {}'.format(where, self.value, self.message)
+
+
+class ValidationReport(object):
+    """
+    Collects what's wrong with the rows of a stream instead of stopping at
+    the first bad one. Pass one as ``errors`` to iter_records or write_many
+    and bad rows are recorded here and skipped, while every good row is
+    processed as usual.
+
+        report = ValidationReport(max_errors=50)
+        for policy in Policy.iter_records(f, errors=report):
+            ...
+        if report:
+            log.warning(report)
+
+    Only the first ``max_errors`` errors are kept (all of them when None),
+    but every row and error is counted.
+    """
+
+    def __init__(self, max_errors=DEFAULT_MAX_ERRORS):
+        self.max_errors = max_errors
+        self.errors = []
+        self.rows = 0
+        self.bad_rows = 0
+        self.error_count = 0
+
+    def add_row(self, row, problems):
+        """
+        Records the (field name, value, exception) problems found with one
+        bad row.
+        """
+        self.bad_rows += 1
+        self.error_count += len(problems)
+        if self.max_errors is not None:
+            problems = problems[:max(self.max_errors - len(self.errors), 0)]
+        self.errors.extend(RecordError(row, field, value, six.text_type(e)) for field, value, e in problems)
+
+    @property
+    def truncated(self):
+        """
+        True when there were more errors than the report could keep.
+        """
+        return self.error_count > len(self.errors)
+
+    def __len__(self):
+        return self.error_count
+
+    def __iter__(self):
+        return iter(self.errors)
+
+    def __str__(self):
+        lines = ['{} of {} rows had {} errors.'.format(self.bad_rows, self.rows, self.error_count)]
+        lines.extend('  {}'.format(error) for error in self.errors)
+        if self.truncated:
+            lines.append('  ... and {} more.'.format(self.error_count - len(self.errors)))
+        return '\n'.join(lines)
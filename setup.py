@@ -1,15 +1,67 @@
+import os
+import sys
+
 from setuptools import setup, find_packages
+from setuptools.command.build_ext import build_ext
+
+try:
+    from setuptools.errors import BaseError as DistutilsError, CCompilerError
+except ImportError:  # older setuptools, on Pythons that still ship distutils
+    from distutils.errors import CCompilerError, DistutilsError
+
+# The codec's decode and encode loops, the fields and their converters,
+# compiled with Cython when it's installed. Set DJCOPYBOOK_PURE_PYTHON=1
+# to install without them.
+COMPILED_MODULES = [
+    'djcopybook/fixedwidth/codec.py',
+    'djcopybook/fixedwidth/converters.py',
+    'djcopybook/fixedwidth/fields.py',
+]
+
+
+class optional_build_ext(build_ext):
+    """
+    Leaves out extensions that fail to build; their pure Python modules
+    are used instead.
+    """
+
+    def run(self):
+        try:
+            build_ext.run(self)
+        except (CCompilerError, DistutilsError, OSError) as e:
+            self.warn("Not compiling the speedups: {}".format(e))
+
+    def build_extension(self, ext):
+        try:
+            build_ext.build_extension(self, ext)
+        except (CCompilerError, DistutilsError, OSError) as e:
+            self.warn("Not compiling {}: {}".format(ext.name, e))
+
+
+def get_ext_modules():
+    if os.environ.get('DJCOPYBOOK_PURE_PYTHON'):
+        return []
+    try:
+        from Cython.Build import cythonize
+    except ImportError:
+        return []
+    directives = {'language_level': sys.version_info[0], 'binding': True}
+    return cythonize(COMPILED_MODULES, compiler_directives=directives, quiet=True)
+
 
 setup(
     name="django-copybook",
-    version='1.3.0',
+    version='1.4.0',
     author="imtapps",
     author_email="webadmin@imtapps.com",
     description="Convert Objects and Django models to/from fixed format records.",
     url="https://github.com/imtapps/django-copybook",
     long_description=open('README.txt', 'r').read(),
     packages=find_packages(),
+    ext_modules=get_ext_modules(),
+    cmdclass={'build_ext': optional_build_ext},
     install_requires=['six'],
+    extras_require={'numpy': ['numpy'], 'speedups': ['Cython']},
     zip_safe=False,
     classifiers=[
         "Development Status :: 4 - Beta",